@@ -4,18 +4,37 @@ from __future__ import annotations
 import logging
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
+from homeassistant.core import (
+    Event,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
 import voluptuous as vol
 
 from .const import (
+    ARCHIVE_SEARCH_LIMIT,
+    ARCHIVE_SEARCH_MAX_LIMIT,
+    BULK_ADD_MAX_ENTRIES,
     DOMAIN,
+    SERVICE_ADD_HIDE_RULE,
     SERVICE_ADD_MANUAL_TRACKING_NUMBER,
+    SERVICE_BULK_ADD_TRACKING_NUMBERS,
+    SERVICE_HIDE_TRACKING_NUMBERS,
+    SERVICE_REMOVE_HIDE_RULE,
     SERVICE_REMOVE_TRACKING_NUMBER,
+    SERVICE_SEARCH,
+    SERVICE_UNHIDE_TRACKING_NUMBERS,
 )
+from .bulk import prepare_entries
 from .coordinator import TrackingNumbersCoordinator
+from .records import normalize_datetime
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -47,6 +66,52 @@ SERVICE_REMOVE_TRACKING_SCHEMA = vol.Schema({
     vol.Required("entity_id"): str,
 })
 
+SERVICE_BULK_ADD_SCHEMA = vol.All(
+    vol.Schema({
+        vol.Required("entity_id"): str,
+        vol.Optional("tracking_numbers"): vol.All(
+            cv.ensure_list, [vol.Any(dict, vol.Coerce(str))]
+        ),
+        vol.Optional("csv"): cv.string,
+    }),
+    cv.has_at_least_one_key("tracking_numbers", "csv"),
+)
+
+SERVICE_HIDE_NUMBERS_SCHEMA = vol.Schema({
+    vol.Required("entity_id"): str,
+    vol.Required("tracking_numbers"): vol.All(cv.ensure_list, [vol.Coerce(str)]),
+})
+
+SERVICE_ADD_HIDE_RULE_SCHEMA = vol.All(
+    vol.Schema({
+        vol.Required("entity_id"): str,
+        vol.Optional("retailer_code"): vol.Coerce(str),
+        vol.Optional("carrier_code"): vol.Coerce(str),
+        vol.Optional("pattern"): cv.string,
+        vol.Optional("older_than_days"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }),
+    cv.has_at_least_one_key("retailer_code", "carrier_code", "pattern", "older_than_days"),
+)
+
+SERVICE_REMOVE_HIDE_RULE_SCHEMA = vol.Schema({
+    vol.Required("entity_id"): str,
+    vol.Required("rule_id"): vol.Coerce(str),
+})
+
+SERVICE_SEARCH_SCHEMA = vol.Schema({
+    vol.Optional("entity_id"): str,
+    vol.Optional("tracking_number"): vol.Coerce(str),
+    vol.Optional("carrier"): vol.Coerce(str),
+    vol.Optional("retailer"): vol.Coerce(str),
+    vol.Optional("delivery_status"): vol.Coerce(str),
+    vol.Optional("since"): cv.datetime,
+    vol.Optional("until"): cv.datetime,
+    vol.Optional("delivered"): cv.boolean,
+    vol.Optional("limit", default=ARCHIVE_SEARCH_LIMIT): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=ARCHIVE_SEARCH_MAX_LIMIT)
+    ),
+})
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Tracking Numbers from a config entry."""
@@ -60,6 +125,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         entry.options,
     )
 
+    # Load stored state once; it stays in memory for the entry's lifetime
+    await coordinator.async_load_state()
+
     # Fetch initial data
     await coordinator.async_config_entry_first_refresh()
 
@@ -72,6 +140,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Register options update listener
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
+    # Write pending state before Home Assistant stops
+    async def _flush_on_stop(event: Event) -> None:
+        await coordinator.async_flush()
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _flush_on_stop)
+    )
+
     # Register services (only once)
     if not hass.services.has_service(DOMAIN, SERVICE_ADD_MANUAL_TRACKING_NUMBER):
         await async_setup_services(hass)
@@ -82,7 +158,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_flush()
+        await coordinator.async_close_archive()
 
     return unload_ok
 
@@ -165,6 +243,94 @@ async def async_setup_services(hass: HomeAssistant) -> None:
                 await coord.async_request_refresh()
                 _LOGGER.info("Forced refresh for tracking numbers")
 
+    async def bulk_add_tracking_numbers(call: ServiceCall) -> ServiceResponse:
+        """Service to add many manual tracking numbers at once."""
+        coordinator = _resolve_coordinator(call.data.get("entity_id"))
+        if not coordinator:
+            raise HomeAssistantError("No coordinator found to add tracking numbers")
+
+        entries = prepare_entries(call.data.get("tracking_numbers", []), call.data.get("csv"))
+        if len(entries) > BULK_ADD_MAX_ENTRIES:
+            raise HomeAssistantError(
+                f"At most {BULK_ADD_MAX_ENTRIES} tracking numbers per call, got {len(entries)}"
+            )
+
+        results = await coordinator.async_add_manual_packages(entries)
+        counts: dict[str, int] = {}
+        for result in results:
+            counts[result["result"]] = counts.get(result["result"], 0) + 1
+        _LOGGER.info("Bulk added tracking numbers: %s", counts)
+        return {"results": results, "counts": counts}
+
+    async def hide_tracking_numbers(call: ServiceCall) -> ServiceResponse:
+        """Service to hide many tracking numbers at once."""
+        coordinator = _resolve_coordinator(call.data.get("entity_id"))
+        if not coordinator:
+            raise HomeAssistantError("No coordinator found to hide tracking numbers")
+
+        result = await coordinator.async_hide_tracking_numbers(call.data["tracking_numbers"])
+        _LOGGER.info("Hid %d tracking numbers", len(result["hidden"]))
+        return result
+
+    async def unhide_tracking_numbers(call: ServiceCall) -> ServiceResponse:
+        """Service to unhide many tracking numbers at once."""
+        coordinator = _resolve_coordinator(call.data.get("entity_id"))
+        if not coordinator:
+            raise HomeAssistantError("No coordinator found to unhide tracking numbers")
+
+        result = await coordinator.async_unhide_tracking_numbers(call.data["tracking_numbers"])
+        _LOGGER.info("Unhid %d tracking numbers", len(result["unhidden"]))
+        return result
+
+    async def add_hide_rule(call: ServiceCall) -> ServiceResponse:
+        """Service to add a rule hiding matching packages."""
+        coordinator = _resolve_coordinator(call.data.get("entity_id"))
+        if not coordinator:
+            raise HomeAssistantError("No coordinator found to add a hide rule")
+
+        fields = {key: value for key, value in call.data.items() if key != "entity_id"}
+        try:
+            result = await coordinator.async_add_hide_rule(**fields)
+        except ValueError as err:
+            raise HomeAssistantError(str(err)) from err
+        _LOGGER.info("Added hide rule %s, hiding %d packages", result["rule"], len(result["hid"]))
+        return {**result, "rules": coordinator.hide_rules()}
+
+    async def remove_hide_rule(call: ServiceCall) -> ServiceResponse:
+        """Service to remove a hide rule."""
+        coordinator = _resolve_coordinator(call.data.get("entity_id"))
+        if not coordinator:
+            raise HomeAssistantError("No coordinator found to remove a hide rule")
+
+        try:
+            result = await coordinator.async_remove_hide_rule(call.data["rule_id"])
+        except ValueError as err:
+            raise HomeAssistantError(str(err)) from err
+        _LOGGER.info("Removed hide rule %s", result["rule"])
+        return {**result, "rules": coordinator.hide_rules()}
+
+    async def search(call: ServiceCall) -> ServiceResponse:
+        """Service to search the package history archive."""
+        coordinator = _resolve_coordinator(call.data.get("entity_id"))
+        if not coordinator:
+            raise HomeAssistantError("No coordinator found to search")
+
+        filters = {
+            key: call.data[key]
+            for key in ("tracking_number", "carrier", "retailer", "delivery_status", "delivered", "limit")
+            if key in call.data
+        }
+        # Archived timestamps are naive UTC; times without a zone are local.
+        for key in ("since", "until"):
+            if key in call.data:
+                filters[key] = normalize_datetime(dt_util.as_utc(call.data[key])).isoformat()
+
+        try:
+            packages = await coordinator.async_search_archive(**filters)
+        except ValueError as err:
+            raise HomeAssistantError(str(err)) from err
+        return {"packages": packages}
+
     hass.services.async_register(
         DOMAIN,
         SERVICE_ADD_MANUAL_TRACKING_NUMBER,
@@ -185,3 +351,51 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         refresh,
         schema=vol.Schema({vol.Optional("entity_id"): str}),
     )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SEARCH,
+        search,
+        schema=SERVICE_SEARCH_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BULK_ADD_TRACKING_NUMBERS,
+        bulk_add_tracking_numbers,
+        schema=SERVICE_BULK_ADD_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_HIDE_TRACKING_NUMBERS,
+        hide_tracking_numbers,
+        schema=SERVICE_HIDE_NUMBERS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_UNHIDE_TRACKING_NUMBERS,
+        unhide_tracking_numbers,
+        schema=SERVICE_HIDE_NUMBERS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_ADD_HIDE_RULE,
+        add_hide_rule,
+        schema=SERVICE_ADD_HIDE_RULE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REMOVE_HIDE_RULE,
+        remove_hide_rule,
+        schema=SERVICE_REMOVE_HIDE_RULE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
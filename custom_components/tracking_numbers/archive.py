@@ -0,0 +1,256 @@
+"""SQLite package history for Tracking Numbers.
+
+The store only keeps the packages listed on the sensor, capped at
+``max_packages``, so anything older falls out of it for good, and raising
+the cap makes both the store and the sensor state bigger. When the archive
+option is on, :class:`PackageArchive` records every package the integration
+has seen in a local SQLite database next to the store files: its carrier,
+retailer, ``first_seen``, the last refresh that saw it, its latest status
+and when it was delivered. Each change of ``delivery_status`` is logged in
+``status_changes`` by a trigger. The live state stays small, and
+:meth:`PackageArchive.search` answers historical queries from indexes
+rather than by scanning.
+
+Every method blocks; the coordinator calls them in the executor. Writes and
+reads share one connection behind a lock, since executor jobs can overlap.
+"""
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+from typing import Any, Iterable
+
+_LOGGER = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS packages (
+    tracking_number TEXT PRIMARY KEY,
+    carrier TEXT,
+    carrier_code TEXT,
+    retailer TEXT,
+    retailer_code TEXT,
+    origin TEXT,
+    link TEXT,
+    first_seen TEXT,
+    last_seen TEXT NOT NULL,
+    status TEXT,
+    delivery_status TEXT,
+    status_updated TEXT,
+    delivered_at TEXT,
+    manual INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS packages_carrier ON packages (carrier_code);
+CREATE INDEX IF NOT EXISTS packages_retailer_code ON packages (retailer_code);
+CREATE INDEX IF NOT EXISTS packages_retailer ON packages (retailer COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS packages_status ON packages (delivery_status);
+CREATE INDEX IF NOT EXISTS packages_first_seen ON packages (first_seen);
+CREATE INDEX IF NOT EXISTS packages_delivered_at ON packages (delivered_at);
+
+CREATE TABLE IF NOT EXISTS status_changes (
+    tracking_number TEXT NOT NULL,
+    delivery_status TEXT,
+    status TEXT,
+    changed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS status_changes_number
+    ON status_changes (tracking_number, changed_at);
+
+CREATE TRIGGER IF NOT EXISTS packages_status_inserted
+AFTER INSERT ON packages WHEN NEW.delivery_status IS NOT NULL
+BEGIN
+    INSERT INTO status_changes VALUES (
+        NEW.tracking_number, NEW.delivery_status, NEW.status,
+        COALESCE(NEW.status_updated, NEW.last_seen)
+    );
+END;
+CREATE TRIGGER IF NOT EXISTS packages_status_changed
+AFTER UPDATE OF delivery_status ON packages
+WHEN NEW.delivery_status IS NOT OLD.delivery_status
+BEGIN
+    INSERT INTO status_changes VALUES (
+        NEW.tracking_number, NEW.delivery_status, NEW.status,
+        COALESCE(NEW.status_updated, NEW.last_seen)
+    );
+END;
+"""
+
+# A package keeps its earliest first_seen and its first delivery time; a
+# refresh without a status (provider off, lookup skipped) keeps the last one.
+_UPSERT = """
+INSERT INTO packages (
+    tracking_number, carrier, carrier_code, retailer, retailer_code, origin,
+    link, first_seen, last_seen, status, delivery_status, status_updated,
+    delivered_at, manual
+) VALUES (
+    :tracking_number, :carrier, :carrier_code, :retailer, :retailer_code,
+    :origin, :link, :first_seen, :last_seen, :status, :delivery_status,
+    :status_updated, :delivered_at, :manual
+)
+ON CONFLICT (tracking_number) DO UPDATE SET
+    carrier = excluded.carrier,
+    carrier_code = excluded.carrier_code,
+    retailer = excluded.retailer,
+    retailer_code = excluded.retailer_code,
+    origin = excluded.origin,
+    link = excluded.link,
+    first_seen = COALESCE(
+        MIN(packages.first_seen, excluded.first_seen),
+        packages.first_seen,
+        excluded.first_seen
+    ),
+    last_seen = excluded.last_seen,
+    status = COALESCE(excluded.status, packages.status),
+    delivery_status = COALESCE(excluded.delivery_status, packages.delivery_status),
+    status_updated = COALESCE(excluded.status_updated, packages.status_updated),
+    delivered_at = COALESCE(packages.delivered_at, excluded.delivered_at),
+    manual = excluded.manual
+"""
+
+
+def _row(pkg: dict[str, Any], now: str) -> dict[str, Any]:
+    """Archive row of a package dict, seen at `now`."""
+    delivered = pkg.get('delivery_status') == 'delivered'
+    return {
+        'tracking_number': pkg['tracking_number'],
+        'carrier': pkg.get('carrier'),
+        'carrier_code': pkg.get('carrier_code'),
+        'retailer': pkg.get('retailer'),
+        'retailer_code': pkg.get('retailer_code'),
+        'origin': pkg.get('origin'),
+        'link': pkg.get('link'),
+        'first_seen': pkg.get('first_seen'),
+        'last_seen': now,
+        'status': pkg.get('status'),
+        'delivery_status': pkg.get('delivery_status'),
+        'status_updated': pkg.get('status_updated'),
+        'delivered_at': (pkg.get('status_updated') or now) if delivered else None,
+        'manual': int(pkg.get('source') == 'manual'),
+    }
+
+
+class PackageArchive:
+    """Every package seen, with its status history, in one SQLite file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            if version > SCHEMA_VERSION:
+                conn.close()
+                raise sqlite3.DatabaseError(
+                    f"Archive {self.path} has schema {version}, newer than {SCHEMA_VERSION}"
+                )
+            with conn:
+                conn.executescript(_SCHEMA)
+                conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+            self._conn = conn
+            _LOGGER.debug("Opened package archive %s", self.path)
+        return self._conn
+
+    def record(self, packages: Iterable[dict[str, Any]], now: str) -> int:
+        """Upsert `packages` as seen at the ISO timestamp `now`.
+
+        Returns how many were written. Nothing is counted here: this runs on
+        every refresh, and a COUNT(*) scans a table that only grows.
+        """
+        rows = [_row(pkg, now) for pkg in packages if pkg.get('tracking_number')]
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(_UPSERT, rows)
+        return len(rows)
+
+    def stats(self) -> dict[str, int]:
+        """Archived packages and status changes, counted now (diagnostics)."""
+        with self._lock:
+            conn = self._connect()
+            return {
+                'packages': conn.execute('SELECT COUNT(*) FROM packages').fetchone()[0],
+                'status_changes': conn.execute('SELECT COUNT(*) FROM status_changes').fetchone()[0],
+            }
+
+    def search(
+        self,
+        *,
+        tracking_number: str | None = None,
+        carrier: str | None = None,
+        retailer: str | None = None,
+        delivery_status: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        delivered: bool | None = None,
+        limit: int = 50,
+    ) -> list[dict[str, Any]]:
+        """Archived packages matching every given filter, newest first.
+
+        `carrier` matches ``carrier_code``; `retailer` matches
+        ``retailer_code`` or the retailer name (any case). `since` and
+        `until` bound ``first_seen``. Each result carries its
+        ``status_history``, oldest change first.
+        """
+        clauses: list[str] = []
+        params: list[Any] = []
+        if tracking_number:
+            clauses.append('tracking_number = ?')
+            params.append(tracking_number)
+        if carrier:
+            clauses.append('carrier_code = ?')
+            params.append(carrier.strip().lower().replace(' ', '_'))
+        if retailer:
+            clauses.append('(retailer_code = ? OR retailer = ? COLLATE NOCASE)')
+            params.extend((retailer, retailer))
+        if delivery_status:
+            clauses.append('delivery_status = ?')
+            params.append(delivery_status)
+        if since:
+            clauses.append('first_seen >= ?')
+            params.append(since)
+        if until:
+            clauses.append('first_seen < ?')
+            params.append(until)
+        if delivered is not None:
+            clauses.append('delivered_at IS NOT NULL' if delivered else 'delivered_at IS NULL')
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                f"SELECT * FROM packages {where} ORDER BY first_seen DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+            results = {row['tracking_number']: dict(row) for row in rows}
+            for result in results.values():
+                result['manual'] = bool(result['manual'])
+                result['status_history'] = []
+            if results:
+                marks = ', '.join('?' * len(results))
+                for change in conn.execute(
+                    "SELECT * FROM status_changes"
+                    f" WHERE tracking_number IN ({marks}) ORDER BY changed_at",
+                    list(results),
+                ):
+                    results[change['tracking_number']]['status_history'].append(
+                        {
+                            'delivery_status': change['delivery_status'],
+                            'status': change['status'],
+                            'changed_at': change['changed_at'],
+                        }
+                    )
+        return list(results.values())
+
+    def close(self) -> None:
+        """Close the connection; the next call opens it again."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
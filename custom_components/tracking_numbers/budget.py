@@ -0,0 +1,125 @@
+"""Per-parser wall-time budget and sender quarantine.
+
+Parsers run synchronously inside one executor job, so a parser that goes
+superlinear on a large or adversarial email stalls the whole poll. Python
+can't safely interrupt a running function, so the budget is enforced after
+the fact: the dispatcher times every parser run, results of a run that blew
+the budget are thrown away, and a parser that keeps overrunning on mail from
+the same sender domain is quarantined for that sender and skipped until the
+cooldown ends. The body size cap in the ingest stage and the bounded parser
+regexes keep any single run from growing without limit.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import logging
+import re
+import time
+from typing import Any, Callable
+
+from .const import (
+    EMAIL_DOMAIN_REGEX,
+    PARSER_BUDGET_STRIKES,
+    PARSER_QUARANTINE_SECONDS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_SENDER_DOMAIN_RE = re.compile(EMAIL_DOMAIN_REGEX)
+
+
+def sender_key(email_from: str) -> str:
+    """Sender domain used to scope quarantines (whole From value as fallback)."""
+    match = _SENDER_DOMAIN_RE.search(email_from or '')
+    return (match.group(1) if match else email_from or '').lower()
+
+
+@dataclass
+class Quarantine:
+    """A parser skipped for one sender until `until` (monotonic seconds)."""
+
+    attr: str
+    sender: str
+    until: float
+    since: str
+    last_elapsed_ms: int
+
+
+class ParserBudget:
+    """Tracks overruns per (parser, sender) and decides on quarantines."""
+
+    def __init__(
+        self,
+        budget_ms: float,
+        strikes: int = PARSER_BUDGET_STRIKES,
+        quarantine_seconds: float = PARSER_QUARANTINE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.budget = max(0.0, budget_ms) / 1000
+        self.strikes = max(1, strikes)
+        self.quarantine_seconds = quarantine_seconds
+        self._clock = clock
+        self._strikes: dict[tuple[str, str], int] = {}
+        self._quarantines: dict[tuple[str, str], Quarantine] = {}
+
+    def is_quarantined(self, attr: str, sender: str) -> bool:
+        """Whether `attr` must be skipped for mail from `sender` right now."""
+        quarantine = self._quarantines.get((attr, sender))
+        if quarantine is None:
+            return False
+        if self._clock() >= quarantine.until:
+            _LOGGER.info("Parser %s released from quarantine for %s", attr, sender)
+            del self._quarantines[(attr, sender)]
+            return False
+        return True
+
+    def record(self, attr: str, sender: str, elapsed: float) -> bool:
+        """Account one run; return False when its results must be discarded."""
+        key = (attr, sender)
+        if not self.budget or elapsed <= self.budget:
+            self._strikes.pop(key, None)
+            return True
+
+        strikes = self._strikes.get(key, 0) + 1
+        self._strikes[key] = strikes
+        elapsed_ms = int(elapsed * 1000)
+        _LOGGER.warning(
+            "Parser %s took %d ms on mail from %s (budget %d ms); result discarded",
+            attr,
+            elapsed_ms,
+            sender,
+            int(self.budget * 1000),
+        )
+        if strikes >= self.strikes:
+            self._strikes.pop(key, None)
+            self._quarantines[key] = Quarantine(
+                attr=attr,
+                sender=sender,
+                until=self._clock() + self.quarantine_seconds,
+                since=datetime.now(timezone.utc).isoformat(),
+                last_elapsed_ms=elapsed_ms,
+            )
+            _LOGGER.warning(
+                "Parser %s quarantined for %s for %d s after %d overruns",
+                attr,
+                sender,
+                self.quarantine_seconds,
+                strikes,
+            )
+        return False
+
+    def quarantines(self) -> list[dict[str, Any]]:
+        """Active quarantines, for diagnostics."""
+        now = self._clock()
+        return [
+            {
+                'parser': quarantine.attr,
+                'sender': quarantine.sender,
+                'since': quarantine.since,
+                'remaining_seconds': int(quarantine.until - now),
+                'last_elapsed_ms': quarantine.last_elapsed_ms,
+            }
+            for quarantine in self._quarantines.values()
+            if quarantine.until > now
+        ]
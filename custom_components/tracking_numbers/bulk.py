@@ -0,0 +1,85 @@
+"""Bulk manual import for Tracking Numbers.
+
+``add_manual_tracking_number`` takes one number, and each call writes the
+manual shard and publishes a new sensor state, so importing a few hundred
+numbers from a spreadsheet meant a few hundred rounds of both.
+:func:`prepare_entries` turns a list of numbers (or entry dicts) and/or CSV
+text into validated entries in one pass; the coordinator then adds them all
+with one save and one state update.
+
+Entries without a carrier get the one the classifier (classifier.py) finds
+for their number, when it's sure enough to spend status lookups on it.
+Invalid entries are kept in place with an ``error``, so the per-item results
+line up with the input.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import re
+from typing import Any, Iterable
+
+from .classifier import classify
+from .const import MIN_ENRICH_CONFIDENCE
+
+# Columns of header-less CSV rows, in order; any may be left off the end.
+CSV_COLUMNS = ('tracking_number', 'carrier', 'origin', 'link', 'status')
+_ENTRY_FIELDS = frozenset(CSV_COLUMNS)
+_VALID_NUMBER = re.compile(r'[A-Za-z0-9-]{4,64}')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def entries_from_csv(text: str) -> list[dict[str, str]]:
+    """Rows of `text` as entry dicts.
+
+    A first row naming a ``tracking_number`` column is a header; otherwise
+    columns are read as CSV_COLUMNS. Blank rows are skipped.
+    """
+    rows = [row for row in csv.reader(io.StringIO(text.strip())) if any(cell.strip() for cell in row)]
+    if not rows:
+        return []
+    columns: Iterable[str] = CSV_COLUMNS
+    header = [cell.strip().lower().replace(' ', '_') for cell in rows[0]]
+    if 'tracking_number' in header:
+        columns, rows = header, rows[1:]
+    columns = list(columns)
+    return [
+        {column: cell for column, cell in zip(columns, row) if column in _ENTRY_FIELDS}
+        for row in rows
+    ]
+
+
+def _entry(item: Any) -> dict[str, Any]:
+    """One validated entry, or ``{'tracking_number', 'error'}``."""
+    fields = item if isinstance(item, dict) else {'tracking_number': item}
+    raw = str(fields.get('tracking_number') or '')
+    # Numbers are often copied in groups ("9400 1000 0000 ...").
+    number = _WHITESPACE.sub('', raw)
+    if not number:
+        return {'tracking_number': raw, 'error': "Tracking number is required"}
+    if not _VALID_NUMBER.fullmatch(number):
+        return {
+            'tracking_number': raw,
+            'error': "Tracking number must be 4-64 letters, digits or hyphens",
+        }
+
+    entry = {'tracking_number': number}
+    for key in ('carrier', 'origin', 'link', 'status'):
+        value = str(fields.get(key) or '').strip()
+        if value:
+            entry[key] = value
+    if 'carrier' not in entry:
+        guess = classify(number.upper())
+        if guess.carrier and guess.confidence >= MIN_ENRICH_CONFIDENCE:
+            entry['carrier'] = guess.carrier
+    return entry
+
+
+def prepare_entries(
+    items: Iterable[Any] = (), csv_text: str | None = None
+) -> list[dict[str, Any]]:
+    """Validated entries for `items` (numbers or entry dicts), then `csv_text` rows."""
+    rows = list(items)
+    if csv_text:
+        rows.extend(entries_from_csv(csv_text))
+    return [_entry(row) for row in rows]
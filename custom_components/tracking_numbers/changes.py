@@ -0,0 +1,105 @@
+"""Change detection for the packages Tracking Numbers publishes.
+
+Every refresh used to publish a brand new package list, so Home Assistant
+serialized the whole attribute payload again and the recorder wrote a new
+state row, and the packages shard was written, even when no package had
+changed. Part of that is unavoidable noise: every refresh stamps
+``last_updated`` on each mail-derived package and ``status_updated`` on each
+one it looked up, so the lists never compare equal.
+
+:class:`ChangeTracker` keeps a fingerprint per published package that leaves
+those stamps out (``VOLATILE_FIELDS``) and diffs each new list against it:
+packages added, removed, whose status changed, or that changed otherwise.
+An empty :class:`PackageDelta` means the published state would be the same
+apart from the stamps.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import json
+from typing import Any, Iterable
+
+# Rewritten on every refresh whether or not anything changed.
+VOLATILE_FIELDS = frozenset({'last_updated', 'status_updated'})
+# A change in any of these is reported as a status change.
+STATUS_FIELDS = ('delivery_status', 'status')
+
+
+def fingerprint(pkg: dict[str, Any]) -> int:
+    """Hash of a package's content, without VOLATILE_FIELDS."""
+    content = {key: value for key, value in pkg.items() if key not in VOLATILE_FIELDS}
+    return hash(json.dumps(content, sort_keys=True, default=str))
+
+
+@dataclass(frozen=True)
+class PackageDelta:
+    """What changed between two published package lists."""
+
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    # {'tracking_number', 'from', 'to', 'status'}: delivery_status before
+    # and after, and the new status label.
+    status_changed: list[dict[str, Any]] = field(default_factory=list)
+    # Numbers whose other fields changed (carrier, link, first_seen...).
+    changed: list[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.status_changed or self.changed)
+
+    def as_dict(self) -> dict[str, Any]:
+        """The delta as event data."""
+        return {
+            'added': self.added,
+            'removed': self.removed,
+            'status_changed': self.status_changed,
+            'changed': self.changed,
+        }
+
+
+class ChangeTracker:
+    """Fingerprints of the last published packages, to diff the next against."""
+
+    def __init__(self) -> None:
+        # tracking number -> (fingerprint, (delivery_status, status))
+        self._published: dict[str, tuple[int, tuple[Any, ...]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._published)
+
+    @property
+    def digest(self) -> int:
+        """Hash of everything published, independent of list order."""
+        return hash(frozenset((number, entry[0]) for number, entry in self._published.items()))
+
+    def diff(self, packages: Iterable[dict[str, Any]]) -> PackageDelta:
+        """Diff `packages` against the last published list, then remember them."""
+        published: dict[str, tuple[int, tuple[Any, ...]]] = {}
+        for pkg in packages:
+            number = pkg.get('tracking_number')
+            if number:
+                published[number] = (
+                    fingerprint(pkg),
+                    tuple(pkg.get(key) for key in STATUS_FIELDS),
+                )
+
+        delta = PackageDelta(
+            removed=[number for number in self._published if number not in published]
+        )
+        for number, (content, status) in published.items():
+            previous = self._published.get(number)
+            if previous is None:
+                delta.added.append(number)
+            elif previous[0] == content:
+                continue
+            elif previous[1] != status:
+                delta.status_changed.append({
+                    'tracking_number': number,
+                    'from': previous[1][0],
+                    'to': status[0],
+                    'status': status[1],
+                })
+            else:
+                delta.changed.append(number)
+
+        self._published = published
+        return delta
@@ -0,0 +1,93 @@
+"""Retention for Tracking Numbers' provider caches and hidden list.
+
+The TrackingMore registry and the carrier-status cache gain an entry for
+every number ever looked up, and the hidden list one for every number ever
+hidden. None of them matters once the number has left the scanned mailbox
+window, so without a retention pass the store grows for as long as the
+integration runs.
+
+Every refresh stamps the numbers it saw (found in mail, hidden but still in
+mail, or added by hand) in the ``last_seen`` shard, one date per number.
+:func:`compact` drops cache entries and hidden numbers not seen for the
+retention period, and delivered entries not seen for a shorter grace
+period. Numbers stored before stamping existed start their clock on the
+first pass. The package history is rebuilt from mail on every refresh and
+manual entries belong to the user, so neither is compacted here.
+"""
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Any, Iterable
+
+from .const import (
+    STORE_KEY_CARRIER_STATUS,
+    STORE_KEY_HIDDEN_TRACKING_NUMBERS,
+    STORE_KEY_LAST_SEEN,
+    STORE_KEY_TRACKINGMORE,
+)
+
+
+def stamp_seen(last_seen: dict[str, str], numbers: Iterable[str], today: date) -> bool:
+    """Record `numbers` as seen `today`; True when `last_seen` changed."""
+    stamp = today.isoformat()
+    changed = False
+    for number in numbers:
+        if last_seen.get(number) != stamp:
+            last_seen[number] = stamp
+            changed = True
+    return changed
+
+
+def _delivered(key: str, entry: Any) -> bool:
+    """Whether a cache entry records a delivered package."""
+    if not isinstance(entry, dict):
+        return False
+    if key == STORE_KEY_TRACKINGMORE:
+        entry = entry.get('last_status') or {}
+    return entry.get('delivery_status') == 'delivered'
+
+
+def compact(
+    data: dict[str, Any],
+    today: date,
+    retention_days: int,
+    delivered_grace_days: int,
+) -> dict[str, int]:
+    """Drop stale entries from `data` in place; return the count removed per key.
+
+    Dates in ``last_seen`` are ISO dates, so cutoffs compare as strings.
+    """
+    stamp = today.isoformat()
+    cutoff = (today - timedelta(days=retention_days)).isoformat()
+    delivered_cutoff = (today - timedelta(days=delivered_grace_days)).isoformat()
+    last_seen: dict[str, str] = data.setdefault(STORE_KEY_LAST_SEEN, {})
+
+    def seen(number: str) -> str:
+        value = last_seen.get(number)
+        if not isinstance(value, str) or len(value) != len(stamp):
+            value = last_seen[number] = stamp
+        return value
+
+    removed: dict[str, int] = {}
+    for key in (STORE_KEY_TRACKINGMORE, STORE_KEY_CARRIER_STATUS):
+        cache = data.get(key) or {}
+        stale = [
+            number
+            for number, entry in cache.items()
+            if seen(number) < (delivered_cutoff if _delivered(key, entry) else cutoff)
+        ]
+        for number in stale:
+            del cache[number]
+        removed[key] = len(stale)
+
+    hidden = data.get(STORE_KEY_HIDDEN_TRACKING_NUMBERS) or []
+    kept = [number for number in hidden if seen(number) >= cutoff]
+    removed[STORE_KEY_HIDDEN_TRACKING_NUMBERS] = len(hidden) - len(kept)
+    if removed[STORE_KEY_HIDDEN_TRACKING_NUMBERS]:
+        data[STORE_KEY_HIDDEN_TRACKING_NUMBERS] = kept
+
+    expired = [number for number, value in last_seen.items() if value < cutoff]
+    for number in expired:
+        del last_seen[number]
+    removed[STORE_KEY_LAST_SEEN] = len(expired)
+    return removed
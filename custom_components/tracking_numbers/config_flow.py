@@ -33,8 +33,12 @@ from .const import (
     CONF_DAYS_OLD,
     CONF_SCAN_INTERVAL,
     CONF_MAX_PACKAGES,
+    CONF_PARSER_BUDGET_MS,
+    CONF_RETENTION_DAYS,
+    CONF_ARCHIVE,
     CONF_TRACKINGMORE_API_KEY,
     CONF_STATUS_PROVIDER,
+    CONF_RESOLVE_LINKS,
     STATUS_PROVIDER_NONE,
     STATUS_PROVIDER_TRACKINGMORE,
     STATUS_PROVIDER_CARRIERS,
@@ -53,6 +57,10 @@ from .const import (
     DEFAULT_DAYS_OLD,
     DEFAULT_SCAN_INTERVAL,
     DEFAULT_MAX_PACKAGES,
+    DEFAULT_PARSER_BUDGET_MS,
+    DEFAULT_RESOLVE_LINKS,
+    DEFAULT_RETENTION_DAYS,
+    DEFAULT_ARCHIVE,
     IMAP_CONNECTION_TIMEOUT,
 )
 
@@ -238,6 +246,18 @@ class TrackingNumbersOptionsFlowHandler(config_entries.OptionsFlow):
                     CONF_MAX_PACKAGES,
                     default=current.get(CONF_MAX_PACKAGES, DEFAULT_MAX_PACKAGES),
                 ): vol.All(cv.positive_int, vol.Range(min=10, max=500)),
+                vol.Optional(
+                    CONF_PARSER_BUDGET_MS,
+                    default=current.get(CONF_PARSER_BUDGET_MS, DEFAULT_PARSER_BUDGET_MS),
+                ): vol.All(cv.positive_int, vol.Range(min=50, max=10000)),
+                vol.Optional(
+                    CONF_RETENTION_DAYS,
+                    default=current.get(CONF_RETENTION_DAYS, DEFAULT_RETENTION_DAYS),
+                ): vol.All(cv.positive_int, vol.Range(min=7, max=3650)),
+                vol.Optional(
+                    CONF_ARCHIVE,
+                    default=current.get(CONF_ARCHIVE, DEFAULT_ARCHIVE),
+                ): cv.boolean,
             }
         )
         return self.async_show_form(step_id="email_settings", data_schema=data_schema)
@@ -269,6 +289,10 @@ class TrackingNumbersOptionsFlowHandler(config_entries.OptionsFlow):
                     CONF_TRACKINGMORE_API_KEY,
                     default=current.get(CONF_TRACKINGMORE_API_KEY, ""),
                 ): _password_selector(),
+                vol.Optional(
+                    CONF_RESOLVE_LINKS,
+                    default=current.get(CONF_RESOLVE_LINKS, DEFAULT_RESOLVE_LINKS),
+                ): cv.boolean,
             }
         )
         return self.async_show_form(step_id="status_provider", data_schema=data_schema)
@@ -6,6 +6,20 @@ DOMAIN = "tracking_numbers"
 # Services
 SERVICE_ADD_MANUAL_TRACKING_NUMBER = "add_manual_tracking_number"
 SERVICE_REMOVE_TRACKING_NUMBER = "remove_tracking_number"
+SERVICE_SEARCH = "search"
+SERVICE_BULK_ADD_TRACKING_NUMBERS = "bulk_add_tracking_numbers"
+# Entries accepted by one bulk_add_tracking_numbers call (list and CSV rows).
+BULK_ADD_MAX_ENTRIES = 500
+SERVICE_HIDE_TRACKING_NUMBERS = "hide_tracking_numbers"
+SERVICE_UNHIDE_TRACKING_NUMBERS = "unhide_tracking_numbers"
+SERVICE_ADD_HIDE_RULE = "add_hide_rule"
+SERVICE_REMOVE_HIDE_RULE = "remove_hide_rule"
+
+# Events
+# Fired when a refresh or service call changes the published packages, with
+# the entry_id and the delta (changes.py): added, removed, status_changed and
+# changed.
+EVENT_PACKAGES_CHANGED = f"{DOMAIN}_packages_changed"
 
 # Configuration keys
 CONF_EMAIL = 'email'
@@ -18,6 +32,8 @@ CONF_USE_SSL = 'use_ssl'  # New name for consistency
 CONF_DAYS_OLD = 'days_old'
 CONF_SCAN_INTERVAL = 'scan_interval'
 CONF_MAX_PACKAGES = 'max_packages'
+# Wall-clock milliseconds a single parser may spend on a single email.
+CONF_PARSER_BUDGET_MS = 'parser_budget_ms'
 # Optional TrackingMore API key; when empty, live status lookups are disabled.
 CONF_TRACKINGMORE_API_KEY = 'trackingmore_api_key'
 
@@ -27,6 +43,18 @@ STATUS_PROVIDER_NONE = 'none'
 STATUS_PROVIDER_TRACKINGMORE = 'trackingmore'
 STATUS_PROVIDER_CARRIERS = 'carriers'
 DEFAULT_STATUS_PROVIDER = STATUS_PROVIDER_NONE
+# Follow retailer click-tracking redirects to the carrier's tracking page
+# (resolver.py). Off by default: it makes HTTP requests to retailer hosts.
+CONF_RESOLVE_LINKS = 'resolve_links'
+DEFAULT_RESOLVE_LINKS = False
+# Days provider-cache entries and hidden numbers are kept after their number
+# was last seen in mail (compaction.py). Never shorter than the scan window.
+CONF_RETENTION_DAYS = 'retention_days'
+DEFAULT_RETENTION_DAYS = 90
+# Keep every package seen in a local SQLite history (archive.py), searchable
+# with the search service. Off by default.
+CONF_ARCHIVE = 'archive'
+DEFAULT_ARCHIVE = False
 
 # Carrier-direct (free) API credentials. USPS/UPS/FedEx use OAuth2 client
 # credentials (id + secret); DHL uses a single API key. Each is optional — a
@@ -47,9 +75,16 @@ DEFAULT_FOLDER = 'INBOX'
 DEFAULT_DAYS_OLD = 30
 DEFAULT_SCAN_INTERVAL = 30  # minutes
 DEFAULT_MAX_PACKAGES = 100
+DEFAULT_PARSER_BUDGET_MS = 500
 
 # Seconds to wait for an IMAP server to respond on connect/login probes.
 IMAP_CONNECTION_TIMEOUT = 10
+# Messages requested per IMAP FETCH. Mail is parsed batch by batch, so only one
+# batch of raw messages is held in memory at a time.
+IMAP_FETCH_BATCH_SIZE = 25
+# While a refresh is still scanning the mailbox, packages found so far are
+# pushed to the sensor at most this often (seconds).
+PARTIAL_PUBLISH_INTERVAL = 5
 
 ATTR_COUNT = 'count'
 ATTR_TRACKING_NUMBERS = 'tracking_numbers'
@@ -58,6 +93,40 @@ EMAIL_ATTR_FROM = 'from'
 EMAIL_ATTR_SUBJECT = 'subject'
 EMAIL_ATTR_BODY = 'body'
 EMAIL_ATTR_DATE = 'date'
+# Decoded text/plain part, kept next to the HTML body.
+EMAIL_ATTR_PLAIN = 'plain'
+
+# Which part of an email a parser reads (ParserSpec.representation). Text
+# parsers read the plain part when the email has a usable one, and the HTML
+# body is then never normalized for them.
+REPRESENTATION_HTML = 'html'
+REPRESENTATION_TEXT = 'text'
+# Plain parts shorter than this are "view this email in HTML" stubs; text
+# parsers fall back to the HTML body.
+MIN_PLAIN_TEXT_CHARS = 120
+
+# E-commerce platforms whose shipment templates are read by one family
+# extractor (parsers/platform_families.py) instead of one parser per store.
+# Parser specs name the platform whose template they read (ParserSpec.platform).
+PLATFORM_SHOPIFY = 'shopify'
+PLATFORM_NARVAR = 'narvar'
+PLATFORM_AFTERSHIP = 'aftership'
+PLATFORM_ROUTE = 'route'
+# Hosts that give a platform away in List-Unsubscribe headers and in links.
+# Tracking-page platforms come first: a Shopify store can send its shipment
+# emails through Narvar, AfterShip or Route, never the other way round.
+PLATFORM_HOSTS = {
+    PLATFORM_NARVAR: ('narvar.com',),
+    PLATFORM_AFTERSHIP: ('aftership.com',),
+    PLATFORM_ROUTE: ('route.com', 'routeapp.io'),
+    PLATFORM_SHOPIFY: ('shopify.com', 'myshopify.com', 'shopifyemail.com'),
+}
+# Header name prefixes only a platform's own mailer sets.
+PLATFORM_HEADER_PREFIXES = {
+    'x-shopify-': PLATFORM_SHOPIFY,
+    'x-narvar-': PLATFORM_NARVAR,
+    'x-aftership-': PLATFORM_AFTERSHIP,
+}
 
 USPS_TRACKING_NUMBER_REGEX = r"\b(94\d{20}|\d{4}\s\d{4}\s\d{4}\s\d{4}\s\d{4}\s\d{2})\b"
 UPS_TRACKING_NUMBER_REGEX = r"\b(1Z[A-HJ-NP-Z0-9]{16})\b"
@@ -82,6 +151,34 @@ CARRIER_LINK_HINTS = {
   'DHL': ('dhl.com', 'dhl.de', 'dhlparcel', 'dhlglobalmail'),
   'Swiss Post': ('swisspost.ch', 'swiss-post', 'post.ch'),
   'Canada Post': ('canadapost.ca', 'canadapost-postescanada.ca', 'track-reperage'),
+  'Veho': ('shipveho.com',),
+}
+
+# Query parameters carrier and tracking-page links carry the number in.
+TRACKING_LINK_PARAMS = (
+    'tracking_numbers', 'tracking_number', 'tracking-numbers', 'tracking-number',
+    'trackingNumber', 'trackingNumbers', 'tracknum', 'tracknumbers', 'trknbr',
+    'qtc_tLabels1', 'tLabels', 'tracking-id',
+)
+
+# Carrier names and slugs as senders and tracking pages spell them, mapped to
+# the names used elsewhere. Keys are lower-cased with '-' and '_' as spaces.
+CARRIER_NAME_ALIASES = {
+    'ups': 'UPS',
+    'united parcel service': 'UPS',
+    'fedex': 'FedEx',
+    'federal express': 'FedEx',
+    'fedex ground': 'FedEx',
+    'usps': 'USPS',
+    'u.s. postal service': 'USPS',
+    'united states postal service': 'USPS',
+    'dhl': 'DHL',
+    'dhl express': 'DHL',
+    'dhl ecommerce': 'DHL',
+    'canada post': 'Canada Post',
+    'canadapost': 'Canada Post',
+    'swiss post': 'Swiss Post',
+    'veho': 'Veho',
 }
 
 MANUAL_RETAILER_CODE = 'manual_entry'
@@ -118,9 +215,17 @@ RETAILER_DISPLAY_NAMES = {
     'nuleaf': 'NuLeaf',
     'hue': 'Philips Hue',
     'generic': 'Generic',
+    'aftership': 'AfterShip',
 }
+# Seconds to coalesce store writes for. State lives in memory once loaded;
+# refreshes and service calls only mark it dirty, and it is flushed after this
+# delay, on unload and on Home Assistant shutdown.
+STORE_SAVE_DELAY = 10
+STORE_KEY_PACKAGES = 'packages'
 STORE_KEY_MANUAL_PACKAGES = 'manual_packages'
 STORE_KEY_HIDDEN_TRACKING_NUMBERS = 'hidden_tracking_numbers'
+# [{id, retailer_code?, carrier_code?, pattern?, older_than_days?}]; see hiding.py.
+STORE_KEY_HIDE_RULES = 'hide_rules'
 LEGACY_STORE_KEY_IGNORED = 'ignored_tracking_numbers'
 # Persists {tracking_number: {courier_code, delivery_status, ...}} for numbers
 # already registered with TrackingMore, so we don't re-register (re-spend credits).
@@ -184,6 +289,10 @@ CARRIER_MIN_CALL_SPACING = {
     'fedex': 0.2,
     'dhl': 5.0,
 }
+# Status lookups (carrier APIs and TrackingMore) are only made for packages whose
+# carrier_confidence (see classifier.py) reaches this. Numbers that fail their
+# carrier's check digit would only burn rate-limited calls and credits.
+MIN_ENRICH_CONFIDENCE = 0.5
 
 # Production hosts / endpoints (see plan for sources). Token lifetimes are read
 # from each response rather than hardcoded.
@@ -251,6 +360,67 @@ FEDEX_STATUS_MAP = {
     'RS': 'exception',
 }
 
+# --- Redirect-wrapper resolution (optional) -----------------------------------
+# Persists {wrapper URL: final URL} so each retailer redirect is followed once.
+STORE_KEY_RESOLVED_LINKS = 'resolved_links'
+# Oldest entries are dropped past this many, so the cache can't grow unbounded.
+RESOLVER_CACHE_SIZE = 500
+# Redirect chains followed at the same time, and seconds allowed per chain.
+RESOLVER_CONCURRENCY = 4
+RESOLVER_TIMEOUT = 10
+RESOLVER_MAX_REDIRECTS = 10
+# New links followed per poll cycle; the rest are followed on later cycles.
+RESOLVER_MAX_PER_CYCLE = 25
+# The only hosts whose links are followed, with their subdomains: Walmart's
+# short links, Narvar and the spmailtechno click tracker (a hint without a dot
+# matches that label in any host). Click tracker links that carry a carrier
+# URL (wrapped ui.com links) are unwrapped without a request.
+RESOLVER_WRAPPER_HINTS = ('w-mt.co', 'narvar.com', 'spmailtechno')
+
+# --- Retention / compaction ---------------------------------------------------
+# Persists {tracking_number: ISO date} of the last refresh that saw each number,
+# so provider caches and the hidden list can forget numbers gone from the mail.
+STORE_KEY_LAST_SEEN = 'last_seen'
+# Delivered entries are dropped once their number hasn't been seen this long,
+# ahead of the configured retention (CONF_RETENTION_DAYS).
+DELIVERED_GRACE_DAYS = 14
+# Seconds between compaction passes; the first refresh after setup runs one.
+COMPACTION_INTERVAL = 24 * 60 * 60
+
+# --- Package history archive (optional) ---------------------------------------
+# SQLite file in the store directory, next to the entry's shards.
+ARCHIVE_FILE = '{key}.archive.db'
+# Packages the search service returns by default, and at most.
+ARCHIVE_SEARCH_LIMIT = 50
+ARCHIVE_SEARCH_MAX_LIMIT = 500
+
+# --- Storage shards -----------------------------------------------------------
+# Each top-level store key is its own Store file, `<DOMAIN>_<entry_id>.<key>`,
+# with its own schema version, so a change writes only the shard it touched.
+# Entries from before sharding kept everything in `<DOMAIN>_<entry_id>`; that
+# file is split into the shards on first load and then removed.
+STORE_SHARDS = {
+    STORE_KEY_PACKAGES: 1,
+    STORE_KEY_MANUAL_PACKAGES: 1,
+    STORE_KEY_HIDDEN_TRACKING_NUMBERS: 1,
+    STORE_KEY_TRACKINGMORE: 1,
+    STORE_KEY_CARRIER_STATUS: 1,
+    STORE_KEY_RESOLVED_LINKS: 1,
+    STORE_KEY_LAST_SEEN: 1,
+    STORE_KEY_HIDE_RULES: 1,
+}
+
+# --- Parser budget / pathological-input guard ----------------------------------
+# A parser whose run on one email exceeds the budget has its results discarded.
+# After PARSER_BUDGET_STRIKES overruns in a row for the same sender domain it is
+# quarantined for that sender for PARSER_QUARANTINE_SECONDS; quarantines are
+# listed in the integration's diagnostics.
+PARSER_BUDGET_STRIKES = 3
+PARSER_QUARANTINE_SECONDS = 6 * 60 * 60
+# Bodies are cut to this many characters before any parser sees them. Real
+# shipment notices are well under 1 MB; anything larger is a newsletter or junk.
+MAX_EMAIL_BODY_CHARS = 1_000_000
+
    
 usps_pattern = [
     '^(94|93|92|94|95)[0-9]{20}$',
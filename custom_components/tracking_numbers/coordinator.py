@@ -2,19 +2,23 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import timedelta, date, datetime, timezone
+from datetime import timedelta, date, datetime
+from functools import partial
 import logging
+import re
+import sqlite3
 import time
-from typing import Any
+import uuid
+from typing import Any, Iterable, Iterator
 from email.utils import parsedate_to_datetime
 
 from imapclient import IMAPClient
 from mailparser import parse_from_bytes
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import STORAGE_DIR
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.helpers.storage import Store
 
 from .const import (
     DOMAIN,
@@ -27,8 +31,11 @@ from .const import (
     CONF_DAYS_OLD,
     CONF_SCAN_INTERVAL,
     CONF_MAX_PACKAGES,
+    CONF_PARSER_BUDGET_MS,
     CONF_TRACKINGMORE_API_KEY,
     CONF_STATUS_PROVIDER,
+    CONF_RESOLVE_LINKS,
+    CONF_ARCHIVE,
     STATUS_PROVIDER_TRACKINGMORE,
     STATUS_PROVIDER_CARRIERS,
     STATUS_PROVIDER_NONE,
@@ -36,30 +43,61 @@ from .const import (
     DEFAULT_DAYS_OLD,
     DEFAULT_SCAN_INTERVAL,
     DEFAULT_MAX_PACKAGES,
+    DEFAULT_PARSER_BUDGET_MS,
+    DEFAULT_RESOLVE_LINKS,
+    DEFAULT_ARCHIVE,
+    ARCHIVE_FILE,
+    EVENT_PACKAGES_CHANGED,
     EMAIL_ATTR_FROM,
-    EMAIL_ATTR_SUBJECT,
-    EMAIL_ATTR_BODY,
     EMAIL_ATTR_DATE,
     TRACKING_NUMBER_URLS,
     MANUAL_RETAILER_CODE,
     MANUAL_RETAILER_NAME,
     MANUAL_ORIGIN_FALLBACK,
     MANUAL_CARRIER_FALLBACK,
+    STORE_KEY_PACKAGES,
     STORE_KEY_MANUAL_PACKAGES,
     STORE_KEY_HIDDEN_TRACKING_NUMBERS,
+    STORE_KEY_HIDE_RULES,
     STORE_KEY_TRACKINGMORE,
     STORE_KEY_CARRIER_STATUS,
-    LEGACY_STORE_KEY_IGNORED,
+    STORE_KEY_RESOLVED_LINKS,
+    STORE_KEY_LAST_SEEN,
+    CONF_RETENTION_DAYS,
+    DEFAULT_RETENTION_DAYS,
+    DELIVERED_GRACE_DAYS,
+    COMPACTION_INTERVAL,
     IMAP_CONNECTION_TIMEOUT,
+    IMAP_FETCH_BATCH_SIZE,
+    PARTIAL_PUBLISH_INTERVAL,
     TRACKINGMORE_COURIER_MAP,
     TRACKINGMORE_CREATE_DELAY,
     TRACKINGMORE_MAX_NEW_PER_CYCLE,
     CARRIER_MAX_LOOKUPS_PER_CYCLE,
     CARRIER_MIN_CALL_SPACING,
+    MIN_ENRICH_CONFIDENCE,
 )
 
 # Import parsers and helpers from shared module
-from .parsers_list import parsers, find_carrier, retailer_display_name
+from .archive import PackageArchive
+from .budget import ParserBudget
+from .changes import ChangeTracker, PackageDelta
+from .compaction import compact, stamp_seen
+from .hiding import HideMatcher, validate_rule
+from .ingest import EmailRecord, record_from_mail
+from .merge import PackageMerger
+from .package_index import PackageIndex
+from .records import (
+    PackageRecord,
+    as_dict,
+    normalize_datetime,
+    records_from_store,
+    records_to_store,
+    to_epoch,
+)
+from .parsers_list import parsers, build_dispatcher
+from .resolver import LinkResolver, apply_resolved, wrapped_links
+from .storage import ShardedStore
 from .trackingmore import TrackingMoreClient
 from .carriers import build_carrier_clients
 
@@ -81,14 +119,55 @@ class TrackingNumbersCoordinator(DataUpdateCoordinator):
         self.options = options
         self.entry_id = entry_id
 
-        # Storage for package persistence
-        self.store = Store(hass, version=1, key=f"{DOMAIN}_{entry_id}")
+        # Storage for package persistence, one file per top-level key. Loaded
+        # once; from then on `stored_data` is the source of truth and writes
+        # are coalesced per shard.
+        # The mail-derived packages are held as compact PackageRecords.
+        self.storage = ShardedStore(
+            hass,
+            f"{DOMAIN}_{entry_id}",
+            codecs={STORE_KEY_PACKAGES: (records_from_store, records_to_store)},
+        )
         self.stored_data = {}
+        self._loaded = False
+        # Monotonic time of the next compaction pass, and what the last one did.
+        self._next_compaction = 0.0
+        self.compaction_report: dict[str, Any] = {}
+        # The listed packages (auto and manual), indexed with their summary
+        # counts kept current, so a service call only touches what it changed.
+        self.index = PackageIndex()
+        # Fingerprints of the published packages; a refresh that changes none
+        # publishes nothing and writes no packages shard. `last_delta` is the
+        # most recent change, also fired as EVENT_PACKAGES_CHANGED.
+        self.changes = ChangeTracker()
+        self.last_delta = PackageDelta()
+        # Numbers shown by _publish_partial during the running refresh. A
+        # service call can diff them into `changes` before the refresh ends,
+        # so the refresh indexes and saves whenever there are any.
+        self._partial: set[str] = set()
+        # Hidden numbers and hide rules compiled for the merger; rebuilt by
+        # _hide() after either changes.
+        self._hide_matcher: HideMatcher | None = None
+        # Every package ever seen, with its status history, when enabled.
+        self.archive: PackageArchive | None = None
+        if options.get(CONF_ARCHIVE, DEFAULT_ARCHIVE):
+            self.archive = PackageArchive(
+                hass.config.path(STORAGE_DIR, ARCHIVE_FILE.format(key=f"{DOMAIN}_{entry_id}"))
+            )
 
         # Carrier-direct clients, built lazily and cached so their OAuth tokens
         # persist across poll cycles. Credentials are fixed per config entry (an
         # options change reloads the entry, recreating the coordinator).
         self._carrier_clients: dict[str, Any] | None = None
+        # Follows retailer redirect links when enabled; built on first use.
+        self._resolver: LinkResolver | None = None
+
+        # Decides which parsers run on each email; keeps per-parser counters
+        # (subject skips, matches, errors, time) and the budget's quarantines
+        # for the lifetime of the entry.
+        self.dispatcher = build_dispatcher(
+            ParserBudget(options.get(CONF_PARSER_BUDGET_MS, DEFAULT_PARSER_BUDGET_MS))
+        )
 
         # Get scan interval from options
         scan_interval_minutes = options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
@@ -99,49 +178,78 @@ class TrackingNumbersCoordinator(DataUpdateCoordinator):
             _LOGGER,
             name=f"{DOMAIN}_{config[CONF_EMAIL]}",
             update_interval=update_interval,
+            # Returning the current data (nothing changed) skips the listeners.
+            always_update=False,
         )
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch tracking numbers from email."""
         _LOGGER.debug("Starting tracking numbers update")
 
-        # Load stored data
-        self.stored_data = await self.store.async_load() or {}
-        self._ensure_storage_defaults()
-        _LOGGER.debug("Loaded stored data: %s packages", len(self.stored_data.get("packages", {})))
+        await self.async_load_state()
 
         try:
             # Fetch emails and parse tracking numbers
             _LOGGER.debug("Fetching emails from IMAP server")
-            auto_packages = await self.hass.async_add_executor_job(
-                self._fetch_and_parse_emails
+            hide = self._hide()
+            self._partial.clear()
+            auto_packages, rest, hidden_seen = await self.hass.async_add_executor_job(
+                self._fetch_and_parse_emails, hide
             )
-            _LOGGER.debug("Fetched %d packages", len(auto_packages))
+            _LOGGER.debug("Fetched %d packages", len(auto_packages) + len(rest))
+            seen = {pkg['tracking_number'] for pkg in auto_packages} | hidden_seen
+
+            # Numbers hidden and rules added by a service call while the scan
+            # ran apply too.
+            if self._hide() is not hide:
+                hide, now = self._hide(), to_epoch(datetime.now())
+                auto_packages = [pkg for pkg in auto_packages if not hide.hides(pkg, now)]
+                rest = [pkg for pkg in rest if not hide.hides(pkg, now)]
+            self.stored_data["packages"] = {
+                pkg['tracking_number']: pkg for pkg in auto_packages
+            }
 
+            auto_packages = await self._resolve_links(auto_packages)
             packages = self._merge_manual_packages(auto_packages)
 
             # Optionally enrich with live delivery status (TrackingMore or carriers).
             packages = await self._enrich_status(packages)
 
-            # Build summary statistics
-            summary = self._build_summary(packages)
+            # A refresh that changed no package re-indexes, saves and publishes
+            # nothing.
+            listed = [as_dict(pkg) for pkg in packages]
+            delta = self._async_track_changes(listed)
+            changed_any = bool(delta or self._partial) or self.data is None
+            self._partial.clear()
+            if changed_any:
+                # Only packages whose indexed fields changed are re-indexed.
+                changed = self.index.replace(listed)
+                _LOGGER.debug("Package index: %d of %d entries changed", changed, len(self.index))
+                self._async_schedule_save(STORE_KEY_PACKAGES)
 
-            # Save updated data
-            await self.store.async_save(self.stored_data)
+            if self.archive is not None:
+                await self._archive_packages(listed + [as_dict(pkg) for pkg in rest])
 
-            return {
-                "packages": packages,
-                "summary": summary,
-                "count": len(packages),
-                "last_update": datetime.now().isoformat(),
-            }
+            self._compact(seen | {pkg['tracking_number'] for pkg in packages})
+
+            if not changed_any:
+                _LOGGER.debug("No package changed; keeping the published state")
+                return self.data
+            return {**self._snapshot(), "last_update": datetime.now().isoformat()}
 
         except Exception as err:
             _LOGGER.error("Error fetching tracking numbers: %s", err)
             raise UpdateFailed(f"Error communicating with email server: {err}") from err
 
-    def _fetch_and_parse_emails(self) -> list[dict[str, Any]]:
-        """Fetch emails and parse tracking numbers (blocking operation)."""
+    def _fetch_and_parse_emails(
+        self, hide: HideMatcher
+    ) -> tuple[list[PackageRecord], list[PackageRecord], set[str]]:
+        """Fetch emails and parse tracking numbers (blocking operation).
+
+        Packages `hide` covers are left out. Returns the newest max_packages
+        packages (newest first), the others found (unordered, and only when
+        the archive wants them) and the hidden numbers that turned up in mail.
+        """
         # Get configuration
         imap_server = self.config[CONF_IMAP_SERVER]
         imap_port = self.config[CONF_IMAP_PORT]
@@ -179,184 +287,103 @@ class TrackingNumbersCoordinator(DataUpdateCoordinator):
             server.logout()
             raise
 
-        # Fetch emails
-        emails = []
+        merger = PackageMerger(parsers, self.stored_data.get("packages", {}), hide)
+        max_packages = self.options.get(CONF_MAX_PACKAGES, DEFAULT_MAX_PACKAGES)
+        parsed = 0
+        published = 0
+        last_publish = time.monotonic()
+
+        try:
+            # Results go straight from each email into the merger; nothing is
+            # collected per parser for the whole mailbox.
+            for email in self._iter_emails(server, flag):
+                parsed += 1
+                delivered_at = email.get(EMAIL_ATTR_DATE)
+                for ATTR, result in self.dispatcher.stream(email):
+                    if merger.add(ATTR, result, delivered_at):
+                        _LOGGER.debug(
+                            "Parser %s found a tracking number in mail from %s",
+                            ATTR,
+                            email.get(EMAIL_ATTR_FROM),
+                        )
+
+                if (
+                    len(merger) > published
+                    and time.monotonic() - last_publish >= PARTIAL_PUBLISH_INTERVAL
+                ):
+                    self.hass.loop.call_soon_threadsafe(
+                        self._publish_partial, merger.packages(max_packages)
+                    )
+                    published = len(merger)
+                    last_publish = time.monotonic()
+        finally:
+            server.logout()
+
+        _LOGGER.info("Parsed %d emails for tracking numbers", parsed)
+        _LOGGER.debug("Ingest counters: %s", self.dispatcher.ingest_snapshot())
+        _LOGGER.debug("Parser counters: %s", self.dispatcher.stats_snapshot())
+
+        _LOGGER.info("Merged into %d unique packages", len(merger))
+        if merger.rule_hidden:
+            _LOGGER.debug("Hide rules left out %d packages", merger.rule_hidden)
+        packages = merger.packages(max_packages)
+        rest = merger.rest(packages) if self.archive is not None else []
+        return packages, rest, merger.hidden_seen
+
+    def _iter_emails(self, server: IMAPClient, flag: list[Any]) -> Iterator[EmailRecord]:
+        """Search, fetch and parse messages in batches, one email at a time.
+
+        An IMAP error ends the scan with whatever was read so far.
+        """
         try:
             _LOGGER.debug("Searching for emails with flag: %s", flag)
             messages = server.search(flag)
             _LOGGER.info("Found %d messages matching search criteria", len(messages))
+        except Exception as err:
+            _LOGGER.error("IMAP fetch error: %s", err)
+            return
 
-            for uid, message_data in server.fetch(messages, 'RFC822').items():
+        for offset in range(0, len(messages), IMAP_FETCH_BATCH_SIZE):
+            try:
+                fetched = server.fetch(messages[offset:offset + IMAP_FETCH_BATCH_SIZE], 'RFC822')
+            except Exception as err:
+                _LOGGER.error("IMAP fetch error: %s", err)
+                return
+            for message_data in fetched.values():
                 try:
                     mail = parse_from_bytes(message_data[b'RFC822'])
 
                     delivered_at = self._extract_email_timestamp(mail)
-
-                    # Prefer HTML body for link parsing, fallback to plain text
-                    body = mail.body
-                    if hasattr(mail, 'text_html') and mail.text_html:
-                        # text_html is a list, join all HTML parts
-                        body = '\n'.join(mail.text_html)
-                    elif hasattr(mail, 'text_plain') and mail.text_plain and not body:
-                        # text_plain is a list, join all plain text parts
-                        body = '\n'.join(mail.text_plain)
-
-                    emails.append({
-                        EMAIL_ATTR_FROM: mail.from_,
-                        EMAIL_ATTR_SUBJECT: mail.subject,
-                        EMAIL_ATTR_BODY: body,
-                        EMAIL_ATTR_DATE: delivered_at,
-                    })
+                    record = record_from_mail(mail, delivered_at)
                 except Exception as err:
                     _LOGGER.warning("Email parse error: %s", err)
-
-        except Exception as err:
-            _LOGGER.error("IMAP fetch error: %s", err)
-        finally:
-            server.logout()
-
-        # Parse emails for tracking numbers
-        all_tracking_numbers = {}
-        for ATTR, EMAIL_DOMAIN, parser in parsers:
-            all_tracking_numbers[ATTR] = []
-
-        _LOGGER.info("Parsing %d emails for tracking numbers", len(emails))
-
-        # Run parsers on each email
-        for email in emails:
-            email_from = email[EMAIL_ATTR_FROM]
-            delivered_at = email.get(EMAIL_ATTR_DATE)
-
-            if isinstance(email_from, (list, tuple)):
-                email_from = ''.join(list(email_from[0]))
-
-            # Run matching parsers
-            for ATTR, EMAIL_DOMAIN, parser in parsers:
-                try:
-                    if EMAIL_DOMAIN in email_from:
-                        tracking_nums = parser(email=email)
-                        if tracking_nums:
-                            enriched = self._enrich_tracking_results(tracking_nums, delivered_at)
-                            if enriched:
-                                _LOGGER.debug(
-                                    "Parser %s found %d tracking numbers from %s",
-                                    ATTR,
-                                    len(enriched),
-                                    email_from,
-                                )
-                                all_tracking_numbers[ATTR].extend(enriched)
-                except Exception as err:
-                    _LOGGER.error("Parser %s error: %s", ATTR, err)
-
-        # Convert to flat packages array
-        _LOGGER.info("Converting tracking numbers to packages")
-        packages = self._convert_to_packages(all_tracking_numbers)
-        _LOGGER.info("Converted to %d unique packages", len(packages))
-
-        return packages
-
-    def _convert_to_packages(
-        self, all_tracking_numbers: dict[str, list]
-    ) -> list[dict[str, Any]]:
-        """Convert nested tracking numbers to flat packages array."""
-        hidden_numbers = set(self.stored_data.get(STORE_KEY_HIDDEN_TRACKING_NUMBERS, []))
-        known_packages = self.stored_data.get("packages", {})
-        max_packages = self.options.get(CONF_MAX_PACKAGES, DEFAULT_MAX_PACKAGES)
-
-        packages = []
-        now = datetime.now().isoformat()
-
-        for ATTR, EMAIL_DOMAIN, _ in parsers:
-            tracking_numbers = all_tracking_numbers.get(ATTR, [])
-
-            if not tracking_numbers:
-                continue
-
-            retailer_name = retailer_display_name(ATTR)
-
-            # Normalize to list of dicts
-            if tracking_numbers and isinstance(tracking_numbers[0], (str, int)):
-                tracking_numbers = [{'tracking_number': str(x)} for x in tracking_numbers]
-
-            # Process each tracking number
-            for item in tracking_numbers:
-                tracking_number = item['tracking_number']
-
-                # Skip ignored
-                if tracking_number in hidden_numbers:
                     continue
+                yield record
 
-                # Get carrier info
-                pkg_info = find_carrier(item, EMAIL_DOMAIN)
-
-                delivered_iso = item.get('email_timestamp')
-                delivered_dt = self._parse_iso_datetime(delivered_iso)
-
-                # Check if we've seen this before
-                if tracking_number in known_packages:
-                    existing = known_packages[tracking_number]
-                    existing_first_iso = existing.get('first_seen')
-                    existing_first_dt = self._parse_iso_datetime(existing_first_iso)
-
-                    candidate_dt = existing_first_dt
-                    if delivered_dt and (candidate_dt is None or delivered_dt < candidate_dt):
-                        candidate_dt = delivered_dt
-
-                    if candidate_dt:
-                        pkg_info['first_seen'] = candidate_dt.isoformat()
-                    elif existing_first_iso:
-                        pkg_info['first_seen'] = existing_first_iso
-                    elif delivered_iso:
-                        pkg_info['first_seen'] = delivered_iso
-                    else:
-                        pkg_info['first_seen'] = now
-                    pkg_info['last_updated'] = now
-                else:
-                    # New package
-                    if delivered_dt:
-                        pkg_info['first_seen'] = delivered_dt.isoformat()
-                    elif delivered_iso:
-                        pkg_info['first_seen'] = delivered_iso
-                    else:
-                        pkg_info['first_seen'] = now
-                    pkg_info['last_updated'] = now
-
-                # Add retailer/retailer_code and carrier_code for easy filtering
-                pkg_info['retailer'] = retailer_name
-                pkg_info['retailer_code'] = EMAIL_DOMAIN.replace('@', '').replace('.', '_')
-                pkg_info['carrier_code'] = pkg_info['carrier'].lower().replace(' ', '_')
-
-                packages.append(pkg_info)
-
-                # Update known packages
-                known_packages[tracking_number] = pkg_info
-
-        # Deduplicate by tracking_number (keep most recent)
-        seen = {}
-        for pkg in packages:
-            tracking_number = pkg['tracking_number']
-            if tracking_number not in seen:
-                seen[tracking_number] = pkg
-
-        packages = list(seen.values())
-
-        # Sort by first_seen (newest first)
-        packages.sort(key=lambda x: x.get('first_seen', ''), reverse=True)
-
-        # Limit to max packages
-        packages = packages[:max_packages]
+    @callback
+    def _publish_partial(self, found: list[PackageRecord]) -> None:
+        """Show packages found so far while a refresh is still scanning mail.
 
-        # Update stored data
-        self.stored_data["packages"] = {
-            pkg['tracking_number']: pkg for pkg in packages
-        }
-
-        return packages
+        Only packages the sensor doesn't list yet are added, so known packages
+        keep their last status until the refresh completes. The change
+        tracker isn't told: the completed refresh reports them as added, and
+        indexes and saves them, like any other change.
+        """
+        if not self.data:
+            return
+        added = [pkg for pkg in found if pkg.tracking_number not in self.index]
+        if not added:
+            return
+        for pkg in added:
+            self.index.upsert(pkg.to_dict())
+        self._partial.update(pkg.tracking_number for pkg in added)
+        self.data = {**self.data, **self._snapshot()}
+        self.async_update_listeners()
 
     def _merge_manual_packages(self, auto_packages: list[dict[str, Any]]) -> list[dict[str, Any]]:
         """Merge auto and manual packages with manual overrides."""
         manual_packages = self.stored_data.get(STORE_KEY_MANUAL_PACKAGES, {})
-        hidden_numbers = set(self.stored_data.get(STORE_KEY_HIDDEN_TRACKING_NUMBERS, []))
+        hidden_numbers = self._hide().numbers
         merged: dict[str, dict[str, Any]] = {}
 
         for pkg in auto_packages:
@@ -372,9 +399,163 @@ class TrackingNumbersCoordinator(DataUpdateCoordinator):
                 manual_pkg['retailer'] = manual_pkg.get('origin') or MANUAL_RETAILER_NAME
             merged[tracking_number] = manual_pkg
 
-        packages = list(merged.values())
-        packages.sort(key=lambda x: x.get('last_updated', ''), reverse=True)
-        return packages
+        return list(merged.values())
+
+    @callback
+    def _async_track_changes(self, packages: Iterable[dict[str, Any]]) -> PackageDelta:
+        """Diff `packages` against what was last published; announce any change.
+
+        The first publish after setup only records what was published, so a
+        restart doesn't report every package as added.
+        """
+        delta = self.changes.diff(packages)
+        if delta and self.data is not None:
+            self.last_delta = delta
+            _LOGGER.debug(
+                "Packages changed: %d added, %d removed, %d status changes, %d other",
+                len(delta.added),
+                len(delta.removed),
+                len(delta.status_changed),
+                len(delta.changed),
+            )
+            self.hass.bus.async_fire(
+                EVENT_PACKAGES_CHANGED, {"entry_id": self.entry_id, **delta.as_dict()}
+            )
+        return delta
+
+    def _snapshot(self) -> dict[str, Any]:
+        """Listed packages, their summary and count, as read from the index."""
+        packages = self.index.packages()
+        return {
+            "packages": packages,
+            "summary": self.index.summary(),
+            "count": len(packages),
+        }
+
+    async def async_load_state(self) -> None:
+        """Read the store into memory, once per config entry."""
+        if self._loaded:
+            return
+        self.stored_data = await self.storage.async_load()
+        self._ensure_storage_defaults()
+        self._loaded = True
+        _LOGGER.debug("Loaded stored data: %s packages", len(self.stored_data.get("packages", {})))
+
+    @callback
+    def _async_schedule_save(self, *keys: str) -> None:
+        """Write the shards of `keys` after STORE_SAVE_DELAY.
+
+        Further changes within the delay are written by the same save.
+        """
+        self.storage.async_mark_dirty(*keys)
+
+    async def async_flush(self) -> None:
+        """Write pending changes now (unload, Home Assistant shutdown)."""
+        await self.storage.async_flush()
+
+    def _hide(self) -> HideMatcher:
+        """The hidden numbers and hide rules, compiled once per change."""
+        if self._hide_matcher is None:
+            self._hide_matcher = HideMatcher(
+                self.stored_data.get(STORE_KEY_HIDDEN_TRACKING_NUMBERS, []),
+                self.stored_data.get(STORE_KEY_HIDE_RULES, []),
+            )
+        return self._hide_matcher
+
+    @callback
+    def _async_save_hidden(self, numbers: Iterable[str]) -> None:
+        """Store the hidden numbers; the matcher is rebuilt on next use."""
+        self.stored_data[STORE_KEY_HIDDEN_TRACKING_NUMBERS] = list(numbers)
+        self._hide_matcher = None
+        self._async_schedule_save(STORE_KEY_HIDDEN_TRACKING_NUMBERS)
+
+    @callback
+    def _async_save_hide_rules(self, rules: list[dict[str, Any]]) -> None:
+        """Store the hide rules; the matcher is rebuilt on next use."""
+        self.stored_data[STORE_KEY_HIDE_RULES] = rules
+        self._hide_matcher = None
+        self._async_schedule_save(STORE_KEY_HIDE_RULES)
+
+    async def _archive_packages(self, packages: list[dict[str, Any]]) -> None:
+        """Record this refresh's packages in the archive.
+
+        An archive error is logged and doesn't fail the refresh.
+        """
+        # Naive UTC, like the packages' own timestamps.
+        now = normalize_datetime(datetime.now().astimezone()).isoformat(timespec='seconds')
+        try:
+            written = await self.hass.async_add_executor_job(
+                self.archive.record, packages, now
+            )
+        except sqlite3.Error as err:
+            _LOGGER.warning("Could not write the package archive: %s", err)
+            return
+        _LOGGER.debug("Archived %d packages", written)
+
+    async def async_search_archive(self, **filters: Any) -> list[dict[str, Any]]:
+        """Archived packages matching `filters` (see PackageArchive.search)."""
+        if self.archive is None:
+            raise ValueError("The package history archive is not enabled")
+        return await self.hass.async_add_executor_job(
+            partial(self.archive.search, **filters)
+        )
+
+    async def async_archive_stats(self) -> dict[str, int] | None:
+        """Row counts of the archive, None when it's off or unreadable."""
+        if self.archive is None:
+            return None
+        try:
+            return await self.hass.async_add_executor_job(self.archive.stats)
+        except sqlite3.Error as err:
+            _LOGGER.warning("Could not read the package archive: %s", err)
+            return None
+
+    async def async_close_archive(self) -> None:
+        """Close the archive's database connection (unload)."""
+        if self.archive is not None:
+            await self.hass.async_add_executor_job(self.archive.close)
+
+    def _compact(self, seen: set[str]) -> None:
+        """Stamp the numbers seen this refresh and drop stale cache entries.
+
+        The pass itself runs at most once per COMPACTION_INTERVAL; its shard
+        sizes before and after are logged and kept for diagnostics.
+        """
+        today = date.today()
+        if stamp_seen(self.stored_data[STORE_KEY_LAST_SEEN], seen, today):
+            self._async_schedule_save(STORE_KEY_LAST_SEEN)
+        if time.monotonic() < self._next_compaction:
+            return
+        self._next_compaction = time.monotonic() + COMPACTION_INTERVAL
+
+        days_old = self.options.get(
+            CONF_DAYS_OLD, self.config.get(CONF_DAYS_OLD, DEFAULT_DAYS_OLD)
+        )
+        retention = max(
+            self.options.get(CONF_RETENTION_DAYS, DEFAULT_RETENTION_DAYS), days_old
+        )
+        before = self.storage.sizes()
+        removed = compact(self.stored_data, today, retention, DELIVERED_GRACE_DAYS)
+        changed = [key for key, count in removed.items() if count]
+        if changed:
+            self._async_schedule_save(STORE_KEY_LAST_SEEN, *changed)
+            if STORE_KEY_HIDDEN_TRACKING_NUMBERS in changed:
+                self._hide_matcher = None
+        after = self.storage.sizes()
+
+        self.compaction_report = {
+            "compacted_at": datetime.now().isoformat(),
+            "retention_days": retention,
+            "removed": removed,
+            "bytes_before": before,
+            "bytes_after": after,
+        }
+        _LOGGER.info(
+            "Compacted stored state: %d -> %d bytes (removed %s)",
+            sum(before.values()),
+            sum(after.values()),
+            {key: count for key, count in removed.items() if count} or "nothing",
+        )
 
     def _ensure_storage_defaults(self) -> None:
         """Ensure store has expected structures."""
@@ -383,19 +564,18 @@ class TrackingNumbersCoordinator(DataUpdateCoordinator):
         manual = self.stored_data.get(STORE_KEY_MANUAL_PACKAGES)
         if not isinstance(manual, dict):
             self.stored_data[STORE_KEY_MANUAL_PACKAGES] = {}
-        hidden = self.stored_data.get(STORE_KEY_HIDDEN_TRACKING_NUMBERS)
-        if isinstance(hidden, list):
-            self.stored_data[STORE_KEY_HIDDEN_TRACKING_NUMBERS] = hidden
-        else:
-            legacy = self.stored_data.get(LEGACY_STORE_KEY_IGNORED)
-            if isinstance(legacy, list):
-                self.stored_data[STORE_KEY_HIDDEN_TRACKING_NUMBERS] = legacy
-            else:
-                self.stored_data[STORE_KEY_HIDDEN_TRACKING_NUMBERS] = []
+        if not isinstance(self.stored_data.get(STORE_KEY_HIDDEN_TRACKING_NUMBERS), list):
+            self.stored_data[STORE_KEY_HIDDEN_TRACKING_NUMBERS] = []
+        if not isinstance(self.stored_data.get(STORE_KEY_HIDE_RULES), list):
+            self.stored_data[STORE_KEY_HIDE_RULES] = []
         if not isinstance(self.stored_data.get(STORE_KEY_TRACKINGMORE), dict):
             self.stored_data[STORE_KEY_TRACKINGMORE] = {}
         if not isinstance(self.stored_data.get(STORE_KEY_CARRIER_STATUS), dict):
             self.stored_data[STORE_KEY_CARRIER_STATUS] = {}
+        if not isinstance(self.stored_data.get(STORE_KEY_RESOLVED_LINKS), dict):
+            self.stored_data[STORE_KEY_RESOLVED_LINKS] = {}
+        if not isinstance(self.stored_data.get(STORE_KEY_LAST_SEEN), dict):
+            self.stored_data[STORE_KEY_LAST_SEEN] = {}
 
     def _status_provider(self) -> str:
         """Resolve the configured status provider (with v4.9.0 back-compat)."""
@@ -411,6 +591,28 @@ class TrackingNumbersCoordinator(DataUpdateCoordinator):
         )
         return STATUS_PROVIDER_TRACKINGMORE if api_key else STATUS_PROVIDER_NONE
 
+    async def _resolve_links(
+        self, packages: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Follow retailer redirect links to the carrier page, when enabled.
+
+        Packages whose wrapper ends on a carrier's tracking page get that
+        carrier (and its tracking number), so status lookups can run for them.
+        """
+        if not self.options.get(CONF_RESOLVE_LINKS, DEFAULT_RESOLVE_LINKS):
+            return packages
+        links = wrapped_links(packages)
+        if not links:
+            return packages
+        if self._resolver is None:
+            self._resolver = LinkResolver(async_get_clientsession(self.hass))
+
+        resolved = await self._resolver.resolve(
+            links, self.stored_data[STORE_KEY_RESOLVED_LINKS]
+        )
+        self._async_schedule_save(STORE_KEY_RESOLVED_LINKS)
+        return apply_resolved(packages, resolved, self._hide().numbers)
+
     async def _enrich_status(
         self, packages: list[dict[str, Any]]
     ) -> list[dict[str, Any]]:
@@ -422,6 +624,15 @@ class TrackingNumbersCoordinator(DataUpdateCoordinator):
             return await self._enrich_with_trackingmore(packages)
         return packages
 
+    @staticmethod
+    def _worth_looking_up(pkg: dict[str, Any]) -> bool:
+        """Whether a package's number is plausible enough to spend a lookup on.
+
+        Manual entries carry no confidence and are always looked up.
+        """
+        confidence = pkg.get("carrier_confidence")
+        return confidence is None or confidence >= MIN_ENRICH_CONFIDENCE
+
     @staticmethod
     def _apply_status(
         pkg: dict[str, Any], status: dict[str, Any], updated: str
@@ -463,7 +674,7 @@ class TrackingNumbersCoordinator(DataUpdateCoordinator):
         for pkg in packages:
             carrier = pkg.get("carrier_code")
             client = clients.get(carrier)
-            if client is None:
+            if client is None or not self._worth_looking_up(pkg):
                 continue
             number = pkg["tracking_number"]
             cached = cache.get(number)
@@ -496,6 +707,7 @@ class TrackingNumbersCoordinator(DataUpdateCoordinator):
                 continue
 
             self._apply_status(pkg, result, now)
+            self._async_schedule_save(STORE_KEY_CARRIER_STATUS)
             cache[number] = {
                 "delivery_status": result.get("delivery_status"),
                 "status": result.get("status"),
@@ -526,6 +738,7 @@ class TrackingNumbersCoordinator(DataUpdateCoordinator):
             pkg
             for pkg in packages
             if TRACKINGMORE_COURIER_MAP.get(pkg.get("carrier_code"))
+            and self._worth_looking_up(pkg)
         ]
         if not trackable:
             return packages
@@ -554,6 +767,7 @@ class TrackingNumbersCoordinator(DataUpdateCoordinator):
             if result is None:
                 continue  # failed; retry on a later cycle
             registered[number] = {"courier_code": courier_code}
+            self._async_schedule_save(STORE_KEY_TRACKINGMORE)
             new_this_cycle += 1
             if result:  # create&get returned live status in the same call
                 status_by_number[number] = result
@@ -585,6 +799,7 @@ class TrackingNumbersCoordinator(DataUpdateCoordinator):
                 pkg["estimated_delivery"] = status["estimated_delivery"]
             if fresh:
                 pkg["status_updated"] = now
+                self._async_schedule_save(STORE_KEY_TRACKINGMORE)
                 registered.setdefault(number, {})["last_status"] = {
                     "status": fresh.get("status"),
                     "delivery_status": fresh.get("delivery_status"),
@@ -593,15 +808,6 @@ class TrackingNumbersCoordinator(DataUpdateCoordinator):
 
         return packages
 
-    @staticmethod
-    def _normalize_datetime(dt: datetime | None) -> datetime | None:
-        """Normalize datetimes to naive UTC for consistent storage."""
-        if dt is None:
-            return None
-        if dt.tzinfo is not None:
-            return dt.astimezone(timezone.utc).replace(tzinfo=None)
-        return dt
-
     def _extract_email_timestamp(self, mail) -> str | None:
         """Extract delivery timestamp from a parsed email."""
         mail_date = getattr(mail, 'date', None)
@@ -618,84 +824,30 @@ class TrackingNumbersCoordinator(DataUpdateCoordinator):
         if delivered is None:
             return None
 
-        normalized = self._normalize_datetime(delivered)
+        normalized = normalize_datetime(delivered)
         if normalized is None:
             return None
 
         return normalized.isoformat()
 
-    @staticmethod
-    def _parse_iso_datetime(value: str | None) -> datetime | None:
-        """Parse isoformat strings (with optional Z suffix) into naive UTC datetimes."""
-        if not value:
-            return None
-
-        if value.endswith('Z'):
-            value = value.replace('Z', '+00:00')
-
-        try:
-            parsed = datetime.fromisoformat(value)
-        except (TypeError, ValueError, AttributeError):
-            return None
-
-        return TrackingNumbersCoordinator._normalize_datetime(parsed)
-
-    @staticmethod
-    def _enrich_tracking_results(results, delivered_at: str | None) -> list[dict[str, Any]]:
-        """Ensure parser results carry the source email timestamp."""
-        if results is None:
-            return []
-
-        if isinstance(results, (str, bytes, int)):
-            iterable = [results]
-        else:
-            try:
-                iterable = list(results)
-            except TypeError:
-                iterable = [results]
-
-        enriched: list[dict[str, Any]] = []
-        for item in iterable:
-            if isinstance(item, dict):
-                enriched_item = dict(item)
-                if delivered_at and 'email_timestamp' not in enriched_item:
-                    enriched_item['email_timestamp'] = delivered_at
-            else:
-                enriched_item = {'tracking_number': str(item)}
-                if delivered_at:
-                    enriched_item['email_timestamp'] = delivered_at
-            enriched.append(enriched_item)
-
-        return enriched
-
     def _default_tracking_link(self, carrier: str, tracking_number: str) -> str:
         """Return a best-effort tracking link for manual entries."""
         key = (carrier or '').lower().replace(' ', '_')
         base = TRACKING_NUMBER_URLS.get(key, TRACKING_NUMBER_URLS['unknown'])
         return f"{base}{tracking_number}"
 
-    async def async_add_manual_package(
+    def _manual_package(
         self,
         tracking_number: str,
+        existing: dict[str, Any],
+        now: str,
         *,
         link: str | None = None,
         carrier: str | None = None,
         origin: str | None = None,
         status: str | None = None,
     ) -> dict[str, Any]:
-        """Persist a manual tracking number and update coordinator data."""
-        tracking_number = str(tracking_number or '').strip()
-        if not tracking_number:
-            raise ValueError("Tracking number is required")
-
-        self.stored_data = await self.store.async_load() or {}
-        self._ensure_storage_defaults()
-
-        manual_packages = self.stored_data.get(STORE_KEY_MANUAL_PACKAGES, {})
-
-        now = datetime.now().isoformat()
-        existing = manual_packages.get(tracking_number, {})
-
+        """A manual package, keeping what `existing` had for fields not given."""
         final_carrier = (carrier or existing.get('carrier') or MANUAL_CARRIER_FALLBACK).strip()
         final_origin = (origin or existing.get('origin') or MANUAL_ORIGIN_FALLBACK).strip()
 
@@ -721,30 +873,112 @@ class TrackingNumbersCoordinator(DataUpdateCoordinator):
 
         if status or existing.get('status'):
             package['status'] = status or existing.get('status')
+        return package
+
+    async def async_add_manual_package(
+        self,
+        tracking_number: str,
+        *,
+        link: str | None = None,
+        carrier: str | None = None,
+        origin: str | None = None,
+        status: str | None = None,
+    ) -> dict[str, Any]:
+        """Persist a manual tracking number and update coordinator data."""
+        tracking_number = str(tracking_number or '').strip()
+        if not tracking_number:
+            raise ValueError("Tracking number is required")
+
+        await self.async_load_state()
+
+        manual_packages = self.stored_data.get(STORE_KEY_MANUAL_PACKAGES, {})
+
+        now = datetime.now().isoformat()
+        package = self._manual_package(
+            tracking_number,
+            manual_packages.get(tracking_number, {}),
+            now,
+            link=link,
+            carrier=carrier,
+            origin=origin,
+            status=status,
+        )
 
         hidden_numbers = set(self.stored_data.get(STORE_KEY_HIDDEN_TRACKING_NUMBERS, []))
         if tracking_number in hidden_numbers:
             hidden_numbers.remove(tracking_number)
-            self.stored_data[STORE_KEY_HIDDEN_TRACKING_NUMBERS] = list(hidden_numbers)
+            self._async_save_hidden(hidden_numbers)
 
         manual_packages[tracking_number] = package
         self.stored_data[STORE_KEY_MANUAL_PACKAGES] = manual_packages
+        self._async_schedule_save(STORE_KEY_MANUAL_PACKAGES)
 
-        await self.store.async_save(self.stored_data)
+        self.index.upsert(package)
+        self._async_track_changes(self.index.packages())
+        self.async_set_updated_data({**self._snapshot(), 'last_update': now})
 
-        packages = self._merge_manual_packages(list(self.stored_data.get('packages', {}).values()))
-        summary = self._build_summary(packages)
+        return package
 
-        self.async_set_updated_data(
-            {
-                'packages': packages,
-                'summary': summary,
-                'count': len(packages),
-                'last_update': now,
-            }
-        )
+    async def async_add_manual_packages(
+        self, entries: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Add many manual packages with one save and one state update.
 
-        return package
+        `entries` come from bulk.prepare_entries. Returns one result per
+        entry, in order: ``added``, ``updated`` (the number was already a
+        manual entry), ``duplicate`` (repeated in `entries`) or ``invalid``.
+        """
+        await self.async_load_state()
+
+        manual_packages = self.stored_data.get(STORE_KEY_MANUAL_PACKAGES, {})
+        hidden_numbers = set(self.stored_data.get(STORE_KEY_HIDDEN_TRACKING_NUMBERS, []))
+        unhidden = False
+        now = datetime.now().isoformat()
+        done: set[str] = set()
+        results: list[dict[str, Any]] = []
+
+        for entry in entries:
+            tracking_number = entry['tracking_number']
+            if 'error' in entry:
+                results.append(
+                    {'tracking_number': tracking_number, 'result': 'invalid', 'error': entry['error']}
+                )
+                continue
+            if tracking_number in done:
+                results.append({'tracking_number': tracking_number, 'result': 'duplicate'})
+                continue
+            done.add(tracking_number)
+
+            existing = manual_packages.get(tracking_number)
+            package = self._manual_package(
+                tracking_number,
+                existing or {},
+                now,
+                link=entry.get('link'),
+                carrier=entry.get('carrier'),
+                origin=entry.get('origin'),
+                status=entry.get('status'),
+            )
+            manual_packages[tracking_number] = package
+            if tracking_number in hidden_numbers:
+                hidden_numbers.remove(tracking_number)
+                unhidden = True
+            self.index.upsert(package)
+            results.append({
+                'tracking_number': tracking_number,
+                'result': 'updated' if existing else 'added',
+                'carrier': package['carrier'],
+            })
+
+        if done:
+            self.stored_data[STORE_KEY_MANUAL_PACKAGES] = manual_packages
+            self._async_schedule_save(STORE_KEY_MANUAL_PACKAGES)
+            if unhidden:
+                self._async_save_hidden(hidden_numbers)
+            self._async_track_changes(self.index.packages())
+            self.async_set_updated_data({**self._snapshot(), 'last_update': now})
+
+        return results
 
     async def async_remove_tracking_number(self, tracking_number: str) -> None:
         """Remove a manual package or hide an email-derived package."""
@@ -752,57 +986,158 @@ class TrackingNumbersCoordinator(DataUpdateCoordinator):
         if not tracking_number:
             raise ValueError("Tracking number is required")
 
-        self.stored_data = await self.store.async_load() or {}
-        self._ensure_storage_defaults()
+        await self.async_load_state()
 
         manual_packages = self.stored_data.get(STORE_KEY_MANUAL_PACKAGES, {})
         hidden_numbers = set(self.stored_data.get(STORE_KEY_HIDDEN_TRACKING_NUMBERS, []))
         packages_store = self.stored_data.get('packages', {})
 
-        removed = False
-
         if tracking_number in manual_packages:
             manual_packages.pop(tracking_number)
             self.stored_data[STORE_KEY_MANUAL_PACKAGES] = manual_packages
-            removed = True
-        else:
-            if tracking_number not in hidden_numbers:
-                hidden_numbers.add(tracking_number)
-                removed = True
-            self.stored_data[STORE_KEY_HIDDEN_TRACKING_NUMBERS] = list(hidden_numbers)
+            self._async_schedule_save(STORE_KEY_MANUAL_PACKAGES)
+        elif tracking_number not in hidden_numbers:
+            hidden_numbers.add(tracking_number)
+            self._async_save_hidden(hidden_numbers)
 
         if tracking_number in packages_store:
             packages_store.pop(tracking_number)
             self.stored_data['packages'] = packages_store
+            self._async_schedule_save(STORE_KEY_PACKAGES)
 
-        if removed:
-            await self.store.async_save(self.stored_data)
-
-        packages = self._merge_manual_packages(list(self.stored_data.get('packages', {}).values()))
-        summary = self._build_summary(packages)
+        self.index.remove(tracking_number)
+        self._async_track_changes(self.index.packages())
+        self.async_set_updated_data(
+            {**self._snapshot(), 'last_update': datetime.now().isoformat()}
+        )
 
+    @callback
+    def _async_publish(self) -> None:
+        """Publish the index after a service call changed it."""
+        self._async_track_changes(self.index.packages())
         self.async_set_updated_data(
-            {
-                'packages': packages,
-                'summary': summary,
-                'count': len(packages),
-                'last_update': datetime.now().isoformat(),
-            }
+            {**self._snapshot(), 'last_update': datetime.now().isoformat()}
         )
 
-    def _build_summary(self, packages: list[dict[str, Any]]) -> dict[str, Any]:
-        """Build summary statistics."""
-        by_carrier = {}
-        by_retailer = {}
+    async def async_hide_tracking_numbers(
+        self, numbers: Iterable[str]
+    ) -> dict[str, list[str]]:
+        """Hide many numbers with one save and one state update.
 
-        for pkg in packages:
-            carrier = pkg.get('carrier', 'Unknown')
-            retailer = pkg.get('retailer') or pkg.get('origin') or 'Unknown'
+        Manual entries among them are kept, just not listed, until unhidden.
+        Returns the numbers ``hidden`` and those ``already_hidden``.
+        """
+        await self.async_load_state()
 
-            by_carrier[carrier] = by_carrier.get(carrier, 0) + 1
-            by_retailer[retailer] = by_retailer.get(retailer, 0) + 1
+        hidden_numbers = list(self.stored_data.get(STORE_KEY_HIDDEN_TRACKING_NUMBERS, []))
+        known = set(hidden_numbers)
+        packages_store = self.stored_data.get(STORE_KEY_PACKAGES, {})
+        result: dict[str, list[str]] = {'hidden': [], 'already_hidden': []}
 
-        return {
-            "by_carrier": by_carrier,
-            "by_retailer": by_retailer,
+        for tracking_number in numbers:
+            tracking_number = str(tracking_number or '').strip()
+            if not tracking_number:
+                continue
+            if tracking_number in known:
+                result['already_hidden'].append(tracking_number)
+                continue
+            known.add(tracking_number)
+            hidden_numbers.append(tracking_number)
+            result['hidden'].append(tracking_number)
+            packages_store.pop(tracking_number, None)
+            self.index.remove(tracking_number)
+
+        if result['hidden']:
+            self._async_save_hidden(hidden_numbers)
+            self._async_schedule_save(STORE_KEY_PACKAGES)
+            self._async_publish()
+        return result
+
+    async def async_unhide_tracking_numbers(
+        self, numbers: Iterable[str]
+    ) -> dict[str, list[str]]:
+        """Unhide many numbers with one save.
+
+        Manual entries are listed again at once; mail-derived packages come
+        back with the refresh this requests. Returns the numbers
+        ``unhidden`` and those ``not_hidden``.
+        """
+        await self.async_load_state()
+
+        requested = {str(number or '').strip() for number in numbers} - {''}
+        hidden_numbers = self.stored_data.get(STORE_KEY_HIDDEN_TRACKING_NUMBERS, [])
+        result: dict[str, list[str]] = {
+            'unhidden': [number for number in hidden_numbers if number in requested],
         }
+        result['not_hidden'] = sorted(requested.difference(result['unhidden']))
+        if not result['unhidden']:
+            return result
+
+        self._async_save_hidden(number for number in hidden_numbers if number not in requested)
+        manual_packages = self.stored_data.get(STORE_KEY_MANUAL_PACKAGES, {})
+        relisted = [
+            manual_packages[number] for number in result['unhidden'] if number in manual_packages
+        ]
+        if relisted:
+            for package in relisted:
+                self.index.upsert(package)
+            self._async_publish()
+        await self.async_request_refresh()
+        return result
+
+    def hide_rules(self) -> list[dict[str, Any]]:
+        """The stored hide rules."""
+        return list(self.stored_data.get(STORE_KEY_HIDE_RULES, []))
+
+    async def async_add_hide_rule(self, **fields: Any) -> dict[str, Any]:
+        """Store a hide rule and unlist the mail-derived packages it covers.
+
+        `fields` are hiding.RULE_FIELDS; raises ValueError when they don't
+        make a usable rule. Manual entries are only hidden by number. Returns
+        the stored ``rule`` (with its ``id``) and the numbers it ``hid``.
+        """
+        rule = {'id': uuid.uuid4().hex[:12], **validate_rule(fields)}
+
+        await self.async_load_state()
+
+        # Compiled with the stored rules before anything is saved, so a rule
+        # that can't be used never reaches the store and fails every refresh.
+        rules = [*self.hide_rules(), rule]
+        try:
+            hide = HideMatcher(
+                self.stored_data.get(STORE_KEY_HIDDEN_TRACKING_NUMBERS, []), rules
+            )
+        except re.error as err:
+            raise ValueError(f"Invalid hide rule {rule}: {err}") from err
+        self._async_save_hide_rules(rules)
+        self._hide_matcher = hide
+        now = to_epoch(datetime.now())
+        packages_store = self.stored_data.get(STORE_KEY_PACKAGES, {})
+        hid = [
+            pkg['tracking_number']
+            for pkg in self.index.packages()
+            if pkg.get('source') != 'manual' and hide.hides(pkg, now)
+        ]
+        for tracking_number in hid:
+            packages_store.pop(tracking_number, None)
+            self.index.remove(tracking_number)
+        if hid:
+            self._async_schedule_save(STORE_KEY_PACKAGES)
+            self._async_publish()
+        return {'rule': rule, 'hid': hid}
+
+    async def async_remove_hide_rule(self, rule_id: str) -> dict[str, Any]:
+        """Delete a hide rule; the refresh this requests lists what it hid.
+
+        Raises ValueError when there's no rule `rule_id`. Returns the
+        removed ``rule``.
+        """
+        await self.async_load_state()
+
+        rules = self.hide_rules()
+        removed = next((rule for rule in rules if rule.get('id') == rule_id), None)
+        if removed is None:
+            raise ValueError(f"No hide rule with id {rule_id!r}")
+        self._async_save_hide_rules([rule for rule in rules if rule is not removed])
+        await self.async_request_refresh()
+        return {'rule': removed}
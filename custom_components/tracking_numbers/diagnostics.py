@@ -0,0 +1,71 @@
+"""Diagnostics support for Tracking Numbers."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    DOMAIN,
+    CONF_EMAIL,
+    CONF_PASSWORD,
+    CONF_TRACKINGMORE_API_KEY,
+    CONF_USPS_CLIENT_ID,
+    CONF_USPS_CLIENT_SECRET,
+    CONF_UPS_CLIENT_ID,
+    CONF_UPS_CLIENT_SECRET,
+    CONF_FEDEX_CLIENT_ID,
+    CONF_FEDEX_CLIENT_SECRET,
+    CONF_DHL_API_KEY,
+    STORE_KEY_HIDDEN_TRACKING_NUMBERS,
+)
+
+TO_REDACT = {
+    CONF_EMAIL,
+    CONF_PASSWORD,
+    CONF_TRACKINGMORE_API_KEY,
+    CONF_USPS_CLIENT_ID,
+    CONF_USPS_CLIENT_SECRET,
+    CONF_UPS_CLIENT_ID,
+    CONF_UPS_CLIENT_SECRET,
+    CONF_FEDEX_CLIENT_ID,
+    CONF_FEDEX_CLIENT_SECRET,
+    CONF_DHL_API_KEY,
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    dispatcher = coordinator.dispatcher
+    data = coordinator.data or {}
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "package_count": data.get("count", 0),
+        "last_update": data.get("last_update"),
+        "ingest": dispatcher.ingest_snapshot(),
+        "parsers": dispatcher.stats_snapshot(),
+        "quarantined_parsers": dispatcher.budget.quarantines() if dispatcher.budget else [],
+        "changes": {
+            "published": len(coordinator.changes),
+            "digest": f"{coordinator.changes.digest & 0xFFFFFFFFFFFFFFFF:016x}",
+            "last_delta": coordinator.last_delta.as_dict(),
+        },
+        "hiding": {
+            "hidden_numbers": len(coordinator.stored_data.get(STORE_KEY_HIDDEN_TRACKING_NUMBERS, [])),
+            "rules": coordinator.hide_rules(),
+        },
+        "storage": {
+            "pending_shards": sorted(coordinator.storage.dirty),
+            "compaction": coordinator.compaction_report,
+            "archive": await coordinator.async_archive_stats(),
+        },
+    }
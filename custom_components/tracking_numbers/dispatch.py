@@ -0,0 +1,308 @@
+"""Per-email parser dispatch for Tracking Numbers.
+
+The dispatcher decides which parsers run on an email: the sender has to match
+the parser's ``EMAIL_DOMAIN`` and the subject has to pass the parser's subject
+gate. Gates are checked before a parser touches the body, so order
+confirmations, promotions and review requests from a shipping sender never pay
+for decoding or DOM construction. Every decision is counted per parser, and
+every run is timed against the optional :class:`~.budget.ParserBudget`.
+
+An email that declares its shipments as schema.org markup
+(:mod:`.structured`) is answered from that markup alone: the results are
+credited to the first selected parser and no parser runs.
+
+An email sent by an e-commerce platform (:mod:`.platforms`) goes to that
+platform's family extractor first. When it finds something, the store
+parsers that read the same template and the catch-all parsers are skipped,
+and its results are credited to the store's parser when there is one.
+"""
+from __future__ import annotations
+
+from collections import Counter
+import logging
+import re
+import time
+from typing import Any, Callable, Iterable, Iterator
+
+from .budget import ParserBudget, sender_key
+from .const import EMAIL_ATTR_BODY, EMAIL_ATTR_FROM, EMAIL_ATTR_SUBJECT
+from .ingest import plain_text
+from .platforms import detect_platform
+from .structured import declares_deliveries, parcel_deliveries
+
+_LOGGER = logging.getLogger(__name__)
+
+ParserEntry = tuple[str, str, Callable[..., Any]]
+
+
+class SubjectGate:
+    """Include/exclude subject patterns for one parser or rule.
+
+    An email passes when it matches ``include`` (if set) and does not match
+    ``exclude`` (if set). Patterns are searched case-sensitively unless they
+    carry their own inline flags.
+    """
+
+    __slots__ = ('include', 'exclude')
+
+    def __init__(self, include: str | re.Pattern | None = None, exclude: str | re.Pattern | None = None) -> None:
+        self.include = re.compile(include) if isinstance(include, str) else include
+        self.exclude = re.compile(exclude) if isinstance(exclude, str) else exclude
+
+    def allows(self, subject: str | None) -> bool:
+        """Whether an email with this subject should be parsed."""
+        subject = subject or ''
+        if self.include is not None and not self.include.search(subject):
+            return False
+        if self.exclude is not None and self.exclude.search(subject):
+            return False
+        return True
+
+
+def email_sender(email: dict[str, Any]) -> str:
+    """Flatten the From header the way mailparser hands it to us."""
+    email_from = email.get(EMAIL_ATTR_FROM) or ''
+    if isinstance(email_from, (list, tuple)):
+        email_from = ''.join(list(email_from[0])) if email_from else ''
+    return email_from
+
+
+class EmailDispatcher:
+    """Run the registered parsers against emails and keep per-parser counters.
+
+    `parsers` is the ordered ``(ATTR, EMAIL_DOMAIN, parser)`` list, `rules` the
+    compiled :class:`~.rule_engine.RuleMatcher` whose slugs are answered by a
+    single combined match per email, `subject_gates` maps a slug to its
+    :class:`SubjectGate`, `budget` bounds the wall time of each run and
+    `text_parsers` are the slugs that read the plain-text part.
+    `structured_data` turns the schema.org fast path on or off. `platforms`
+    maps store parsers to the platform whose template they read and
+    `families` maps each platform family extractor to its platform.
+    """
+
+    def __init__(
+        self,
+        parsers: Iterable[ParserEntry],
+        rules: Any,
+        subject_gates: dict[str, SubjectGate] | None = None,
+        budget: ParserBudget | None = None,
+        text_parsers: Iterable[str] = (),
+        structured_data: bool = True,
+        platforms: dict[str, str] | None = None,
+        families: dict[str, str] | None = None,
+    ) -> None:
+        self.parsers = list(parsers)
+        self.rules = rules
+        self.subject_gates = dict(subject_gates or {})
+        self.budget = budget
+        self.text_parsers = frozenset(text_parsers)
+        self.structured_data = structured_data
+        self.platforms = dict(platforms or {})
+        self.families = dict(families or {})
+        self.stats: dict[str, Counter] = {attr: Counter() for attr, _, _ in self.parsers}
+        self.elapsed: dict[str, float] = {attr: 0.0 for attr, _, _ in self.parsers}
+        # Bodies normalized and what the boilerplate pre-pass cut from them.
+        self.ingest: Counter = Counter()
+
+    def reset_stats(self) -> None:
+        """Clear the per-parser counters."""
+        self.ingest.clear()
+        for counter in self.stats.values():
+            counter.clear()
+        for attr in self.elapsed:
+            self.elapsed[attr] = 0.0
+
+    def stats_snapshot(self) -> dict[str, dict[str, int]]:
+        """Plain-dict copy of the counters for parsers that saw any email."""
+        snapshot = {}
+        for attr, counter in self.stats.items():
+            if not counter:
+                continue
+            snapshot[attr] = dict(counter)
+            if self.elapsed[attr]:
+                snapshot[attr]['time_ms'] = round(self.elapsed[attr] * 1000)
+        return snapshot
+
+    def ingest_snapshot(self) -> dict[str, float]:
+        """Body counters plus the share of characters the pre-pass removed."""
+        snapshot: dict[str, float] = dict(self.ingest)
+        if self.ingest['body_chars']:
+            snapshot['stripped_percent'] = round(
+                100 * self.ingest['stripped_chars'] / self.ingest['body_chars'], 1
+            )
+        return snapshot
+
+    def _within_budget(self, attr: str, sender: str, elapsed: float) -> bool:
+        """Account a run's wall time; False when its results must be dropped."""
+        self.elapsed[attr] += elapsed
+        if self.budget is None or self.budget.record(attr, sender, elapsed):
+            return True
+        self.stats[attr]['over_budget'] += 1
+        return False
+
+    def _select(self, email: dict[str, Any], email_from: str, sender: str) -> list[ParserEntry]:
+        """Parsers whose sender, subject gate and quarantine let them run."""
+        subject = email.get(EMAIL_ATTR_SUBJECT)
+        selected: list[ParserEntry] = []
+        for entry in self.parsers:
+            attr, email_domain, _ = entry
+            if email_domain not in email_from:
+                continue
+            if attr in self.families and detect_platform(email) != self.families[attr]:
+                continue
+            gate = self.subject_gates.get(attr)
+            if gate is not None and not gate.allows(subject):
+                self.stats[attr]['subject_skipped'] += 1
+                continue
+            if self.budget is not None and self.budget.is_quarantined(attr, sender):
+                self.stats[attr]['quarantined'] += 1
+                continue
+            selected.append(entry)
+        return selected
+
+    def _run(self, attr: str, parser: Callable[..., Any], email: dict[str, Any], sender: str) -> Any:
+        """Run one parser against the budget; None when its results are dropped.
+
+        Generator parsers are drained here so their run is timed as a whole,
+        and closed as soon as they pass the budget instead of being left to
+        finish.
+        """
+        start = time.perf_counter()
+        results = parser(email=email)
+        if isinstance(results, Iterator):
+            limit = self.budget.budget if self.budget is not None else 0
+            collected = []
+            for result in results:
+                collected.append(result)
+                if limit and time.perf_counter() - start > limit:
+                    results.close()
+                    break
+            results = collected
+        if not self._within_budget(attr, sender, time.perf_counter() - start):
+            return None
+        return results
+
+    def _run_family(
+        self,
+        family: ParserEntry,
+        selected: list[ParserEntry],
+        email: dict[str, Any],
+        sender: str,
+    ) -> Iterator[tuple[str, Any]]:
+        """Yield the family extractor's results; return the slugs it answered for.
+
+        Nothing is answered for when the extractor finds nothing (a platform's
+        order confirmation or newsletter), so the selected parsers still run.
+        """
+        attr, _, parser = family
+        platform = self.families[attr]
+        counter = self.stats[attr]
+        counter['parsed'] += 1
+        try:
+            results = self._run(attr, parser, email, sender)
+        except Exception as err:  # pylint: disable=broad-except
+            counter['errors'] += 1
+            _LOGGER.error("Parser %s error: %s", attr, err)
+            return set()
+        if not results:
+            return set()
+
+        members = [
+            entry_attr for entry_attr, email_domain, _ in selected
+            if self.platforms.get(entry_attr) == platform or not email_domain
+        ]
+        owner = next((entry_attr for entry_attr in members if entry_attr in self.platforms), attr)
+        for member in members:
+            if member != owner:
+                self.stats[member]['platform_skipped'] += 1
+        self.stats[owner]['platform'] += 1
+        self.stats[owner]['matched'] += 1
+        for result in results:
+            yield owner, result
+        return set(members)
+
+    def stream(self, email: dict[str, Any]) -> Iterator[tuple[str, Any]]:
+        """Yield ``(ATTR, result)`` for every tracking result found in `email`.
+
+        Parsers may return a list of results, a single result or be
+        generators; either way results are handed on one at a time, in the
+        order of the parsers list, so later deduplication still prefers the
+        earlier parser. A parser's results are released once its run has
+        finished within budget.
+        """
+        email_from = email_sender(email)
+        sender = sender_key(email_from)
+        selected = self._select(email, email_from, sender)
+        if not selected:
+            return
+
+        # Normalize what the selected parsers read up front, so its one-off
+        # cost isn't charged to whichever parser happens to read it first.
+        # When they all read text and there is a usable plain part, the HTML
+        # body is never decoded at all (unless it may carry schema.org markup).
+        text_only = all(attr in self.text_parsers for attr, _, _ in selected)
+        if text_only and self.structured_data and declares_deliveries(email):
+            text_only = False
+        if text_only and plain_text(email) is not None:
+            self.ingest['plain_only'] += 1
+        else:
+            email.get(EMAIL_ATTR_BODY)
+            self.ingest['bodies'] += 1
+            self.ingest['body_chars'] += getattr(email, 'body_chars', 0)
+            self.ingest['stripped_chars'] += getattr(email, 'stripped_chars', 0)
+
+            deliveries = parcel_deliveries(email) if self.structured_data else []
+            if deliveries:
+                owner = selected[0][0]
+                for attr, _, _ in selected[1:]:
+                    self.stats[attr]['structured_skipped'] += 1
+                self.stats[owner]['structured'] += 1
+                self.stats[owner]['matched'] += 1
+                for delivery in deliveries:
+                    yield owner, delivery
+                return
+
+        family = next((entry for entry in selected if entry[0] in self.families), None)
+        if family is not None:
+            selected.remove(family)
+            handled = yield from self._run_family(family, selected, email, sender)
+            selected = [entry for entry in selected if entry[0] not in handled]
+
+        rule_attrs = self.rules.attrs
+        wanted_rules = {attr for attr, _, _ in selected if attr in rule_attrs}
+        rule_results = {}
+        if wanted_rules:
+            # Rules share one pass, so every rule that ran is charged for it.
+            start = time.perf_counter()
+            rule_results = self.rules.match(email, email_from, only=wanted_rules)
+            elapsed = time.perf_counter() - start
+            for attr in wanted_rules:
+                if not self._within_budget(attr, sender, elapsed):
+                    rule_results.pop(attr, None)
+
+        for attr, _, parser in selected:
+            counter = self.stats[attr]
+            counter['parsed'] += 1
+            try:
+                if attr in rule_attrs:
+                    results = rule_results.get(attr)
+                else:
+                    results = self._run(attr, parser, email, sender)
+            except Exception as err:  # pylint: disable=broad-except
+                counter['errors'] += 1
+                _LOGGER.error("Parser %s error: %s", attr, err)
+                continue
+            if not results:
+                continue
+            if isinstance(results, (str, bytes, int, dict)):
+                results = (results,)
+            counter['matched'] += 1
+            for result in results:
+                yield attr, result
+
+    def dispatch(self, email: dict[str, Any]) -> list[tuple[str, list]]:
+        """Return ``[(ATTR, results)]`` for every parser that found something."""
+        found: dict[str, list] = {}
+        for attr, result in self.stream(email):
+            found.setdefault(attr, []).append(result)
+        return list(found.items())
@@ -0,0 +1,192 @@
+"""Hide rules for Tracking Numbers.
+
+Noise used to be hidden one number at a time: every Georgia Power bill,
+every Amazon order for digital goods, each a separate entry in
+``hidden_tracking_numbers``, which was turned into a set again on every
+refresh and service call. A hide rule covers all of them. It names any of a
+``retailer_code``, a ``carrier_code``, a regular expression ``pattern``
+searched in the tracking number, and ``older_than_days`` (days since
+``first_seen``), and hides a package when every field it names matches.
+
+:class:`HideMatcher` compiles the hidden numbers and the rules once (the
+coordinator rebuilds it only when either changes). Single-field rules are
+folded into sets, one combined regex and one age limit; rules naming several
+fields are checked one by one. Patterns with groups are searched one by one
+too, since joining them would renumber their backreferences, and so are all
+patterns when they can't share one regex (inline flags). The merger asks it
+twice per package, so a hidden package is never built, enriched, stored or
+listed: :meth:`HideMatcher.hides_early` before the carrier is worked out
+(number and retailer) and :meth:`HideMatcher.hides_built` once it is
+(carrier and age).
+"""
+from __future__ import annotations
+
+import logging
+import re
+from typing import Any, Iterable, Mapping, NamedTuple
+
+from .records import to_epoch
+
+_LOGGER = logging.getLogger(__name__)
+
+RULE_FIELDS = ('retailer_code', 'carrier_code', 'pattern', 'older_than_days')
+_DAY = 24 * 60 * 60
+
+
+def _code(value: Any) -> str:
+    """A carrier code, as the merger derives it from the carrier name."""
+    return str(value).strip().lower().replace(' ', '_')
+
+
+def _retailer_code(value: Any) -> str:
+    """A retailer code, as the merger derives it from the sender's domain.
+
+    ``southernco.com`` and ``southernco_com`` name the same retailer.
+    """
+    return _code(value).replace('@', '').replace('.', '_')
+
+
+def validate_rule(fields: Mapping[str, Any]) -> dict[str, Any]:
+    """The RULE_FIELDS of `fields`, normalized; ValueError when unusable."""
+    rule: dict[str, Any] = {}
+    if fields.get('retailer_code'):
+        rule['retailer_code'] = _retailer_code(fields['retailer_code'])
+    if fields.get('carrier_code'):
+        rule['carrier_code'] = _code(fields['carrier_code'])
+    if fields.get('pattern'):
+        try:
+            re.compile(fields['pattern'])
+        except re.error as err:
+            raise ValueError(f"Invalid pattern {fields['pattern']!r}: {err}") from err
+        rule['pattern'] = fields['pattern']
+    if fields.get('older_than_days') is not None:
+        days = int(fields['older_than_days'])
+        if days < 1:
+            raise ValueError("older_than_days must be at least 1")
+        rule['older_than_days'] = days
+    if not rule:
+        raise ValueError(f"A hide rule needs at least one of {', '.join(RULE_FIELDS)}")
+    return rule
+
+
+class _Rule(NamedTuple):
+    """A rule naming more than one field; None fields match anything."""
+
+    retailer_code: str | None
+    carrier_code: str | None
+    pattern: re.Pattern[str] | None
+    max_age: int | None
+
+    def matches(
+        self,
+        number: str,
+        retailer_code: str | None,
+        carrier_code: str | None,
+        age: int | None,
+    ) -> bool:
+        return (
+            (self.retailer_code is None or self.retailer_code == retailer_code)
+            and (self.carrier_code is None or self.carrier_code == carrier_code)
+            and (self.pattern is None or self.pattern.search(number) is not None)
+            and (self.max_age is None or (age is not None and age > self.max_age))
+        )
+
+
+class HideMatcher:
+    """Hidden numbers and hide rules, compiled into one matcher."""
+
+    def __init__(
+        self,
+        numbers: Iterable[str] = (),
+        rules: Iterable[Mapping[str, Any]] = (),
+    ) -> None:
+        self.numbers = frozenset(numbers)
+        self.rules = [dict(rule) for rule in rules]
+
+        retailers: set[str] = set()
+        carriers: set[str] = set()
+        patterns: list[re.Pattern[str]] = []
+        ages: list[int] = []
+        self._compound: list[_Rule] = []
+        for rule in self.rules:
+            try:
+                pattern = re.compile(rule['pattern']) if rule.get('pattern') else None
+            except re.error as err:
+                # Only a hand-edited store gets here; validate_rule compiles it.
+                _LOGGER.warning("Ignoring hide rule %s: %s", rule, err)
+                continue
+            named = [key for key in RULE_FIELDS if rule.get(key) is not None]
+            if named == ['retailer_code']:
+                retailers.add(rule['retailer_code'])
+            elif named == ['carrier_code']:
+                carriers.add(rule['carrier_code'])
+            elif named == ['pattern']:
+                patterns.append(pattern)
+            elif named == ['older_than_days']:
+                ages.append(rule['older_than_days'])
+            elif named:
+                self._compound.append(_Rule(
+                    rule.get('retailer_code'),
+                    rule.get('carrier_code'),
+                    pattern,
+                    rule['older_than_days'] * _DAY if rule.get('older_than_days') else None,
+                ))
+        self._retailers = frozenset(retailers)
+        self._carriers = frozenset(carriers)
+        self._pattern: re.Pattern[str] | None = None
+        # Patterns that can't be combined into _pattern, searched one by one:
+        # in a joined regex, \1 would point at another rule's group.
+        self._patterns = [pattern for pattern in patterns if pattern.groups]
+        plain = [pattern for pattern in patterns if not pattern.groups]
+        if len(plain) == 1:
+            self._pattern = plain[0]
+        elif plain:
+            try:
+                self._pattern = re.compile(
+                    '|'.join(f'(?:{pattern.pattern})' for pattern in plain)
+                )
+            except re.error:
+                self._patterns.extend(plain)
+        self._max_age = min(ages) * _DAY if ages else None
+        # Whether hides_built can match anything at all.
+        self._late = bool(self._carriers or self._max_age is not None or self._compound)
+
+    def __bool__(self) -> bool:
+        return bool(self.numbers or self.rules)
+
+    def hides_early(self, number: str, retailer_code: str | None) -> bool:
+        """Hidden by its number, or by a retailer-only or pattern-only rule."""
+        return (
+            number in self.numbers
+            or retailer_code in self._retailers
+            or (self._pattern is not None and self._pattern.search(number) is not None)
+            or any(pattern.search(number) is not None for pattern in self._patterns)
+        )
+
+    def hides_built(
+        self,
+        number: str,
+        retailer_code: str | None,
+        carrier_code: str | None,
+        first_seen: int | None,
+        now: int,
+    ) -> bool:
+        """Hidden by a rule on the carrier or age (epoch seconds), or a compound rule."""
+        if not self._late:
+            return False
+        if carrier_code in self._carriers:
+            return True
+        age = None if first_seen is None else now - first_seen
+        if self._max_age is not None and age is not None and age > self._max_age:
+            return True
+        return any(
+            rule.matches(number, retailer_code, carrier_code, age) for rule in self._compound
+        )
+
+    def hides(self, pkg: Mapping[str, Any], now: int) -> bool:
+        """Whether any hidden number or rule covers the package `pkg`."""
+        number = str(pkg.get('tracking_number') or '')
+        retailer_code = pkg.get('retailer_code')
+        return self.hides_early(number, retailer_code) or self.hides_built(
+            number, retailer_code, pkg.get('carrier_code'), to_epoch(pkg.get('first_seen')), now
+        )
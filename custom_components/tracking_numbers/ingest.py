@@ -0,0 +1,277 @@
+"""Email ingest stage for Tracking Numbers.
+
+Turns a parsed IMAP message into the ``email`` dict every parser receives and
+normalizes the body once per email: quoted-printable soft line breaks and
+escapes (including bodies that were encoded twice), stray ``3D"`` attribute
+artifacts, undecoded bytes and non-breaking spaces. Parsers can then work on
+clean HTML instead of each repairing it again. Oversized bodies are cut to
+``MAX_EMAIL_BODY_CHARS`` so no parser ever sees unbounded input.
+
+HTML bodies then go through a boilerplate pre-pass: ``<head>``, ``<style>``,
+``<script>`` and comments (MSO conditional blocks included) are cut and runs
+of whitespace collapsed before any parser builds a DOM. None of it is ever
+read by a parser; JSON-LD ``<script>`` blocks are data, not boilerplate, and
+are kept.
+
+The text/plain part is kept next to the HTML body as ``EMAIL_ATTR_PLAIN``
+and normalized the same way (without the HTML pre-pass), so parsers declared
+``REPRESENTATION_TEXT`` can scan it instead of the markup. The message
+headers are kept too (lower-cased names) for platform fingerprinting.
+
+Normalization is lazy: it runs the first time a parser reads the body, so
+emails rejected by the sender match or a subject gate never pay for it.
+"""
+from __future__ import annotations
+
+import logging
+import quopri
+import re
+from typing import Any, Iterator
+
+from .const import (
+    EMAIL_ATTR_BODY,
+    EMAIL_ATTR_DATE,
+    EMAIL_ATTR_FROM,
+    EMAIL_ATTR_PLAIN,
+    EMAIL_ATTR_SUBJECT,
+    MAX_EMAIL_BODY_CHARS,
+    MIN_PLAIN_TEXT_CHARS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Soft line breaks and `=3D` only show up in bodies that still carry
+# quoted-printable transfer encoding; plain HTML has neither.
+_QP_MARKERS = ('=\r\n', '=\n', '=3D', '=3d')
+# In a body that is still quoted-printable every `=` starts an escape or a
+# soft break. Bodies mailparser already decoded have bare ones (`href="`,
+# `?a=b`), and one `=` at a line end must not get them decoded again.
+_QP_BARE_EQUALS_RE = re.compile(r'=(?![0-9A-Fa-f]{2}|\r?\n)')
+# A body encoded twice still has markers after one decode; never loop forever.
+_MAX_QP_PASSES = 2
+# `href=3D"...` parsed without decoding leaves the value as `3D"...`.
+_QP_ATTRIBUTE_RE = re.compile(r'(\s[\w-]+)=3D(["\'])', re.IGNORECASE)
+# Start of a comment (including `<!--[if mso]>...<![endif]-->`) or of a head,
+# style or script element. `<!--[if !mso]><!-->` closes itself, so content
+# meant for non-Outlook clients stays. Attributes stop at the next `<`, so an
+# unclosed tag is never scanned past.
+_BOILERPLATE_OPEN_RE = re.compile(r'<!--|<(head|style|script)\b([^<>]*)>', re.IGNORECASE)
+# Line breaks are kept (some parsers match up to the end of a line); any other
+# run of whitespace becomes one space.
+_LINE_BREAK_RUN_RE = re.compile(r'[ \t\r\f\v]*\n\s*')
+_SPACE_RUN_RE = re.compile(r'[ \t\r\f\v]{2,}|[\t\r\f\v]')
+
+
+def decode_bytes(raw: bytes) -> str:
+    """Decode bytes as UTF-8, falling back to Windows-1252."""
+    try:
+        return raw.decode('utf-8')
+    except UnicodeDecodeError:
+        return raw.decode('cp1252', errors='replace')
+
+
+def looks_quoted_printable(body: str) -> bool:
+    """Whether a body is still quoted-printable.
+
+    It needs soft breaks or escapes, and no `=` that isn't one of them.
+    """
+    return (
+        any(marker in body for marker in _QP_MARKERS)
+        and _QP_BARE_EQUALS_RE.search(body) is None
+    )
+
+
+def normalize_body(body: str | bytes | None) -> str:
+    """Return the parser-ready form of an email body."""
+    if not body:
+        return ''
+    if isinstance(body, bytes):
+        body = decode_bytes(body[:MAX_EMAIL_BODY_CHARS])
+    if len(body) > MAX_EMAIL_BODY_CHARS:
+        _LOGGER.debug("Email body of %d chars truncated to %d", len(body), MAX_EMAIL_BODY_CHARS)
+        body = body[:MAX_EMAIL_BODY_CHARS]
+
+    for _ in range(_MAX_QP_PASSES):
+        if not looks_quoted_printable(body):
+            break
+        try:
+            decoded = quopri.decodestring(body.encode('utf-8', errors='ignore'))
+            # Escapes that don't decode to UTF-8 weren't transfer encoding;
+            # falling back to cp1252 would garble the whole body.
+            body = decoded.decode('utf-8')
+        except (ValueError, TypeError) as err:
+            _LOGGER.debug("Quoted-printable decode failed, keeping the body: %s", err)
+            break
+
+    if '3D' in body:
+        body = _QP_ATTRIBUTE_RE.sub(r'\1=\2', body)
+    if '\xa0' in body:
+        body = body.replace('\xa0', ' ')
+    return body
+
+
+def _close_tag_end(lower: str, tag: str, start: int, end: int) -> int:
+    """End of the first `</tag\\s*>` in `lower[start:end]`; -1 when there's none."""
+    closing = '</' + tag
+    while True:
+        found = lower.find(closing, start, end)
+        if found == -1:
+            return -1
+        index = found + len(closing)
+        while index < end and lower[index].isspace():
+            index += 1
+        if index < end and lower[index] == '>':
+            return index + 1
+        start = found + 1
+
+
+def _boilerplate(
+    body: str, lower: str, start: int, end: int
+) -> Iterator[tuple[int, int, int, int, str | None, str]]:
+    """Comments and head, style and script elements in `body[start:end]`.
+
+    Yields ``(start, content start, content end, end, tag, attributes)``,
+    `tag` None for a comment. Every search moves forward with ``str.find``,
+    so this is linear; it stops at the first element that isn't closed and
+    leaves the rest of the body as it is.
+    """
+    while True:
+        match = _BOILERPLATE_OPEN_RE.search(body, start, end)
+        if match is None:
+            return
+        tag = match.group(1)
+        if tag is None:
+            close = lower.find('-->', match.end(), end)
+            if close == -1:
+                return
+            yield match.start(), match.end(), close, close + 3, None, ''
+            start = close + 3
+            continue
+        tag = tag.lower()
+        close = _close_tag_end(lower, tag, match.end(), end)
+        if close == -1:
+            return
+        content_end = lower.rfind('</', match.end(), close)
+        yield match.start(), match.end(), content_end, close, tag, match.group(2)
+        start = close
+
+
+def _is_json_ld(tag: str | None, attributes: str) -> bool:
+    return tag == 'script' and 'ld+json' in attributes.lower()
+
+
+def strip_boilerplate(body: str) -> str:
+    """Cut head, style, script and comments from an HTML body; collapse whitespace."""
+    if '<' not in body:
+        return body
+    lower = body.lower()
+    parts: list[str] = []
+    kept = 0
+    for start, content_start, content_end, end, tag, attributes in _boilerplate(
+        body, lower, 0, len(body)
+    ):
+        parts.append(body[kept:start])
+        if _is_json_ld(tag, attributes):
+            parts.append(body[start:end])
+        elif tag == 'head':
+            parts.extend(
+                body[inner[0]:inner[3]]
+                for inner in _boilerplate(body, lower, content_start, content_end)
+                if _is_json_ld(inner[4], inner[5])
+            )
+        kept = end
+    parts.append(body[kept:])
+    body = ''.join(parts)
+    body = _LINE_BREAK_RUN_RE.sub('\n', body)
+    return _SPACE_RUN_RE.sub(' ', body)
+
+
+class EmailRecord(dict):
+    """The ``email`` dict handed to parsers, with a lazily normalized body.
+
+    Behaves like the plain dict parsers have always received; the body is
+    normalized on the first ``email[EMAIL_ATTR_BODY]`` or
+    ``email.get(EMAIL_ATTR_BODY)`` and cached in the dict. `body_chars` and
+    `stripped_chars` then record the decoded body length and how much of it
+    the boilerplate pre-pass removed (`strip=False` turns the pre-pass off).
+    The plain part is normalized on first access to ``EMAIL_ATTR_PLAIN``.
+    `headers` maps lower-cased header names to their values.
+    """
+
+    def __init__(
+        self,
+        sender: Any,
+        subject: str | None,
+        body: str | bytes | None,
+        date: str | None = None,
+        strip: bool = True,
+        plain: str | bytes | None = None,
+        headers: dict[str, Any] | None = None,
+    ) -> None:
+        super().__init__({
+            EMAIL_ATTR_FROM: sender,
+            EMAIL_ATTR_SUBJECT: subject,
+            EMAIL_ATTR_DATE: date,
+        })
+        self.raw_body = body
+        self.raw_plain = plain
+        self.headers = {str(name).lower(): value for name, value in (headers or {}).items()}
+        self.strip = strip
+        self.body_chars = 0
+        self.stripped_chars = 0
+        # Filled by links.link_index() / links.text_link_index() the first
+        # time a parser asks for them.
+        self.link_index = None
+        self.text_link_index = None
+        # Filled by platforms.detect_platform(); '' once checked and none found.
+        self.platform: str | None = None
+
+    def __missing__(self, key: str) -> Any:
+        if key == EMAIL_ATTR_PLAIN:
+            plain = normalize_body(self.raw_plain)
+            self[EMAIL_ATTR_PLAIN] = plain
+            return plain
+        if key != EMAIL_ATTR_BODY:
+            raise KeyError(key)
+        body = normalize_body(self.raw_body)
+        self.body_chars = len(body)
+        if self.strip:
+            body = strip_boilerplate(body)
+            self.stripped_chars = self.body_chars - len(body)
+        self[EMAIL_ATTR_BODY] = body
+        return body
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+def plain_text(email: dict[str, Any]) -> str | None:
+    """The decoded plain-text part, or None when the email has no usable one."""
+    plain = email.get(EMAIL_ATTR_PLAIN) or ''
+    if len(plain.strip()) < MIN_PLAIN_TEXT_CHARS:
+        return None
+    return plain
+
+
+def record_from_mail(mail: Any, delivered_at: str | None = None) -> EmailRecord:
+    """Build an :class:`EmailRecord` from a ``mailparser`` message.
+
+    The HTML parts are preferred for link parsing; plain text is used when the
+    message has no body otherwise. The plain parts and the headers are kept
+    either way.
+    """
+    body = mail.body
+    # text_plain is a list, join all plain text parts
+    plain = '\n'.join(mail.text_plain) if getattr(mail, 'text_plain', None) else None
+    if getattr(mail, 'text_html', None):
+        # text_html is a list, join all HTML parts
+        body = '\n'.join(mail.text_html)
+    elif plain and not body:
+        body = plain
+
+    return EmailRecord(
+        mail.from_, mail.subject, body, delivered_at, plain=plain, headers=getattr(mail, 'headers', None)
+    )
@@ -0,0 +1,223 @@
+"""DOM-free link index for email bodies.
+
+Most parsers only need the anchors of an email: the href, the anchor text and
+a query parameter or two. Building a BeautifulSoup tree for that is the most
+expensive thing a parser does, so this module streams the body through the
+standard library tokenizer once and keeps just the anchors.
+
+HTML entities in hrefs and text are resolved by the tokenizer. Host, path and
+the percent-decoded query dict of each link are parsed on first access and
+cached on the :class:`Link`. The index itself is cached on the
+:class:`~.ingest.EmailRecord`, so every parser that asks for it on the same
+email shares one pass over the body.
+
+Text parsers use :func:`text_link_index`, which collects the URLs written
+out in the plain-text part instead when the email has a usable one.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from html.parser import HTMLParser
+import logging
+import re
+from typing import Any, Iterator
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .const import EMAIL_ATTR_BODY
+from .ingest import EmailRecord, plain_text
+
+_LOGGER = logging.getLogger(__name__)
+
+# Text inside these tags is never visible anchor text.
+_SKIP_TEXT_TAGS = frozenset({'script', 'style'})
+# URLs in plain text, often wrapped as <https://...> or [https://...].
+_TEXT_URL_RE = re.compile(r'https?://[^\s<>"\'\[\]]+', re.IGNORECASE)
+_TEXT_URL_TRAILING = '.,;:!?)'
+
+
+@lru_cache(maxsize=64)
+def _nested_param_re(key: str) -> re.Pattern:
+    """Regex for `key=value` anywhere in a (decoded) URL, e.g. a wrapped one."""
+    return re.compile(rf'[?&;#]{re.escape(key)}=([^&#"\'\s<>]*)')
+
+
+class Link:
+    """One anchor: its href, visible text and other attributes."""
+
+    __slots__ = ('href', 'attrs', '_chunks', '_split', '_query', '_unquoted')
+
+    def __init__(self, href: str, attrs: dict[str, str] | None = None, chunks: list[str] | None = None) -> None:
+        self.href = href
+        self.attrs = attrs or {}
+        self._chunks = chunks or []
+        self._split = None
+        self._query: dict[str, list[str]] | None = None
+        self._unquoted: str | None = None
+
+    def __repr__(self) -> str:
+        return f'Link({self.href!r}, text={self.text!r})'
+
+    @property
+    def text(self) -> str:
+        """Anchor text with text nodes joined by a space, like ``get_text(' ', strip=True)``."""
+        return ' '.join(' '.join(self._chunks).split())
+
+    @property
+    def inline_text(self) -> str:
+        """Anchor text with text nodes concatenated, like ``get_text()``, whitespace collapsed."""
+        return ' '.join(''.join(self._chunks).split())
+
+    def _parts(self):
+        if self._split is None:
+            href = self.href if '//' in self.href else f'//{self.href}'
+            try:
+                self._split = urlsplit(href)
+            except ValueError:
+                self._split = urlsplit('')
+        return self._split
+
+    @property
+    def host(self) -> str:
+        """Lower-cased host name, tolerating scheme-less hrefs."""
+        try:
+            return (self._parts().hostname or '').lower()
+        except ValueError:
+            return ''
+
+    @property
+    def path(self) -> str:
+        """URL path component."""
+        return self._parts().path
+
+    @property
+    def query(self) -> dict[str, list[str]]:
+        """Percent-decoded query parameters of the link itself."""
+        if self._query is None:
+            self._query = parse_qs(self._parts().query)
+        return self._query
+
+    @property
+    def unquoted(self) -> str:
+        """The href with percent-encoding resolved, for wrapped/redirect URLs."""
+        if self._unquoted is None:
+            self._unquoted = unquote(self.href)
+        return self._unquoted
+
+    def on_host(self, domain: str) -> bool:
+        """Whether the link lives on `domain` or one of its subdomains."""
+        host = self.host
+        return host == domain or host.endswith(f'.{domain}')
+
+    def param(self, key: str) -> str | None:
+        """First value of query parameter `key` (see :meth:`params`)."""
+        values = self.params(key)
+        return values[0] if values else None
+
+    def params(self, key: str) -> list[str]:
+        """Values of query parameter `key`.
+
+        Falls back to URLs nested in the decoded href (click-tracking
+        redirects wrap the retailer's link in their own query string).
+        """
+        values = self.query.get(key)
+        if values:
+            return values
+        return [value for value in _nested_param_re(key).findall(self.unquoted) if value]
+
+
+class _AnchorCollector(HTMLParser):
+    """Tokenizer callback collecting anchors and their text."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.links: list[Link] = []
+        self._current: Link | None = None
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag == 'a':
+            attr_map = {name: value or '' for name, value in attrs}
+            self._current = Link((attr_map.get('href') or '').strip(), attr_map)
+            self.links.append(self._current)
+        elif tag in _SKIP_TEXT_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == 'a':
+            self._current = None
+        elif tag in _SKIP_TEXT_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data: str) -> None:
+        if self._current is not None and not self._skip_depth:
+            self._current._chunks.append(data)  # pylint: disable=protected-access
+
+
+class LinkIndex:
+    """All anchors of one email body, in document order."""
+
+    __slots__ = ('links',)
+
+    def __init__(self, links: list[Link]) -> None:
+        self.links = links
+
+    def __iter__(self) -> Iterator[Link]:
+        return iter(self.links)
+
+    def __len__(self) -> int:
+        return len(self.links)
+
+    @classmethod
+    def from_html(cls, body: str) -> 'LinkIndex':
+        """Tokenize `body` once and keep its anchors."""
+        if not body or ('<a' not in body and '<A' not in body):
+            return cls([])
+        collector = _AnchorCollector()
+        try:
+            collector.feed(body)
+            collector.close()
+        except Exception as err:  # pylint: disable=broad-except
+            # The tokenizer is lenient; keep whatever was collected so far.
+            _LOGGER.debug("Link index tokenizer stopped early: %s", err)
+        return cls(collector.links)
+
+    @classmethod
+    def from_text(cls, text: str) -> 'LinkIndex':
+        """Keep the URLs written out in a plain-text body, as text-less links."""
+        if not text or '://' not in text:
+            return cls([])
+        return cls([
+            Link(url.rstrip(_TEXT_URL_TRAILING))
+            for url in _TEXT_URL_RE.findall(text)
+        ])
+
+    def with_href(self) -> Iterator[Link]:
+        """Anchors that have a non-empty href."""
+        return (link for link in self.links if link.href)
+
+    def on_host(self, domain: str) -> Iterator[Link]:
+        """Anchors on `domain` or one of its subdomains."""
+        return (link for link in self.links if link.href and link.on_host(domain))
+
+
+def link_index(email: dict[str, Any]) -> LinkIndex:
+    """The link index of an email, built on first use and cached on the record."""
+    index = getattr(email, 'link_index', None)
+    if index is None:
+        index = LinkIndex.from_html(email.get(EMAIL_ATTR_BODY) or '')
+        if isinstance(email, EmailRecord):
+            email.link_index = index
+    return index
+
+
+def text_link_index(email: dict[str, Any]) -> LinkIndex:
+    """URLs of the plain-text part when usable, else the HTML link index."""
+    index = getattr(email, 'text_link_index', None)
+    if index is None:
+        text = plain_text(email)
+        if text is None:
+            return link_index(email)
+        index = LinkIndex.from_text(text)
+        if isinstance(email, EmailRecord):
+            email.text_link_index = index
+    return index
@@ -0,0 +1,179 @@
+"""Incremental package merging for Tracking Numbers.
+
+Parser results used to be collected per parser for the whole mailbox, copied
+to attach the email timestamp, and then converted, deduplicated and sorted in
+one go at the end. :class:`PackageMerger` takes results one at a time as the
+dispatcher streams them out of each email and keeps exactly one package per
+tracking number, so the packages found so far are available at any point of
+the scan.
+
+Deduplication keeps the package from the parser listed first in the parsers
+list (and, for the same parser, the first email that mentioned it), as the
+batch conversion did. ``first_seen`` is the earliest of the stored value and
+every email that mentioned the number. Packages are kept as
+:class:`~.records.PackageRecord`, so timestamps are compared as epoch
+seconds instead of being parsed again for every result.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+import heapq
+from typing import Any, Iterable
+
+from .hiding import HideMatcher
+from .parsers_list import find_carrier, retailer_display_name
+from .records import PackageRecord, to_epoch
+
+
+def _earliest(first: int | None, second: int | None) -> int | None:
+    """The earlier of two epoch timestamps; a missing one loses."""
+    if first is None:
+        return second
+    if second is None:
+        return first
+    return min(first, second)
+
+
+def _newest(entry: tuple[tuple[int, int], PackageRecord]) -> tuple[int, int, int]:
+    """Largest-first sort key: newest first_seen, then parsers-list order, then arrival."""
+    (rank, arrival), pkg = entry
+    return (pkg.first_seen, -rank, -arrival)
+
+
+class PackageMerger:
+    """Fold streamed ``(ATTR, result)`` records into one package per number.
+
+    `parsers` is the ordered ``(ATTR, EMAIL_DOMAIN, parser)`` list (its order
+    decides which parser's package wins a duplicate), `known_packages` the
+    stored :class:`~.records.PackageRecord` by tracking number and `hide` the
+    hidden numbers and hide rules; a package they cover is dropped before
+    its record is built. Results are either dicts with at least
+    ``tracking_number`` or bare tracking numbers.
+    """
+
+    def __init__(
+        self,
+        parsers: Iterable[tuple[str, str, Any]],
+        known_packages: dict[str, PackageRecord],
+        hide: HideMatcher,
+        now: str | None = None,
+    ) -> None:
+        # ATTR -> (rank, EMAIL_DOMAIN, retailer name, retailer code)
+        self._parsers = {
+            attr: (
+                rank,
+                email_domain,
+                retailer_display_name(attr),
+                email_domain.replace('@', '').replace('.', '_'),
+            )
+            for rank, (attr, email_domain, _) in enumerate(parsers)
+        }
+        self._known = known_packages
+        self._hide = hide
+        self._now = to_epoch(now or datetime.now())
+        # tracking number -> ((parser rank, arrival), package)
+        self._packages: dict[str, tuple[tuple[int, int], PackageRecord]] = {}
+        # Every result of an email carries the same date; parse it once.
+        self._delivered: tuple[str | None, int | None] = (None, None)
+        self._arrivals = 0
+        # Hidden numbers that still turned up in mail (see compaction.py).
+        self.hidden_seen: set[str] = set()
+        # Results dropped by a hide rule.
+        self.rule_hidden = 0
+
+    def __len__(self) -> int:
+        return len(self._packages)
+
+    def add(self, attr: str, result: Any, delivered_at: str | None = None) -> bool:
+        """Merge one parser result; return True when it added a new package."""
+        if isinstance(result, dict):
+            group = result
+            delivered_iso = result.get('email_timestamp', delivered_at)
+        else:
+            group = {'tracking_number': str(result)}
+            delivered_iso = delivered_at
+
+        # Not every parser result is a shipment (Georgia Power reports usage).
+        tracking_number = group.get('tracking_number')
+        if not tracking_number:
+            return False
+        if tracking_number in self._hide.numbers:
+            self.hidden_seen.add(tracking_number)
+            return False
+
+        rank, email_domain, retailer, retailer_code = self._parsers[attr]
+        if self._hide.rules and self._hide.hides_early(str(tracking_number), retailer_code):
+            self.rule_hidden += 1
+            return False
+        self._arrivals += 1
+        order = (rank, self._arrivals)
+        delivered = self._epoch(delivered_iso)
+
+        key = str(tracking_number).strip()
+        current = self._packages.get(key)
+        if current is not None:
+            current_order, current_pkg = current
+            if current_order[0] <= rank:
+                # Same package seen again: it can only move first_seen back.
+                current_pkg.first_seen = _earliest(current_pkg.first_seen, delivered)
+                return False
+
+        found = find_carrier(group, email_domain)
+        carrier_code = found['carrier'].lower().replace(' ', '_')
+        first_seen = self._first_seen(tracking_number, delivered)
+        if current is not None:
+            first_seen = _earliest(current[1].first_seen, first_seen)
+        if self._hide.rules and self._hide.hides_built(
+            key, retailer_code, carrier_code, first_seen, self._now
+        ):
+            self.rule_hidden += 1
+            return False
+        # Declared by the sender (schema.org markup); a status lookup
+        # overwrites it with the carrier's own estimate.
+        estimated = group.get('estimated_delivery')
+        pkg = PackageRecord.create(
+            found['tracking_number'],
+            found['carrier'],
+            found['origin'],
+            found['link'],
+            found['carrier_confidence'],
+            first_seen,
+            self._now,
+            retailer,
+            retailer_code,
+            carrier_code,
+            {'estimated_delivery': estimated} if estimated else None,
+        )
+
+        self._packages[key] = (order, pkg)
+        return current is None
+
+    def _epoch(self, delivered_iso: str | None) -> int | None:
+        if self._delivered[0] != delivered_iso:
+            self._delivered = (delivered_iso, to_epoch(delivered_iso))
+        return self._delivered[1]
+
+    def _first_seen(self, tracking_number: str, delivered: int | None) -> int:
+        """Earliest of the stored first_seen and this email's date."""
+        existing = self._known.get(tracking_number)
+        first_seen = _earliest(existing.first_seen if existing else None, delivered)
+        return self._now if first_seen is None else first_seen
+
+    def packages(self, limit: int | None = None) -> list[PackageRecord]:
+        """Packages merged so far, newest ``first_seen`` first, up to `limit`.
+
+        Ties keep parsers-list order, then the order results arrived in. With
+        a limit only the newest `limit` are picked (a bounded heap, so
+        O(n log limit)); the rest are never sorted.
+        """
+        entries = self._packages.values()
+        if limit is None:
+            ordered = sorted(entries, key=_newest, reverse=True)
+        else:
+            ordered = heapq.nlargest(limit, entries, key=_newest)
+        return [pkg for _, pkg in ordered]
+
+    def rest(self, listed: Iterable[PackageRecord]) -> list[PackageRecord]:
+        """Packages merged so far that aren't in `listed`, in no order."""
+        listed = set(listed)
+        return [pkg for _, pkg in self._packages.values() if pkg not in listed]
@@ -0,0 +1,164 @@
+"""Indexed package store for Tracking Numbers.
+
+The sensor's package list, its summary counts and any filter on it used to
+be rebuilt from scratch on every refresh and every service call.
+:class:`PackageIndex` keeps the listed packages by tracking number with
+secondary indexes on ``carrier_code``, ``retailer_code``,
+``delivery_status`` and ``first_seen``, and keeps the summary counts up to
+date as packages are added, changed or removed. A mutation costs time in
+proportion to what it changed, not to the number of packages.
+
+Nothing a refresh stamps on every package (``last_updated``) is part of an
+entry, so a refresh only re-indexes the packages that really changed, and
+only those whose ``first_seen`` moved are re-sorted.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Any, Iterable, NamedTuple
+
+# Fields with an exact-match index: value -> tracking numbers.
+INDEXED_FIELDS = ('carrier_code', 'retailer_code', 'delivery_status')
+UNKNOWN = 'Unknown'
+
+
+class _Entry(NamedTuple):
+    """What one package contributes to the indexes and counts.
+
+    Kept per number, so a package changed in place (a status lookup writes
+    onto the dict) can still be taken out of the buckets it was put in.
+    """
+
+    fields: tuple[Any, ...]
+    # Sort key, ascending; the list is read newest first.
+    first_seen: tuple[str, str]
+    counts: tuple[str, str, str]
+
+
+def _entry(pkg: dict[str, Any]) -> _Entry:
+    return _Entry(
+        tuple(pkg.get(field) for field in INDEXED_FIELDS),
+        (pkg.get('first_seen') or '', pkg['tracking_number']),
+        (
+            pkg.get('carrier', UNKNOWN),
+            pkg.get('retailer') or pkg.get('origin') or UNKNOWN,
+            pkg.get('delivery_status') or 'unknown',
+        ),
+    )
+
+
+class PackageIndex:
+    """The listed packages, indexed and counted as they change."""
+
+    def __init__(self, packages: Iterable[dict[str, Any]] = ()) -> None:
+        self._packages: dict[str, dict[str, Any]] = {}
+        self._index: dict[str, dict[Any, set[str]]] = {field: {} for field in INDEXED_FIELDS}
+        # Sorted (first_seen, tracking number) pairs: the listing order,
+        # oldest first, and range queries.
+        self._first_seen: list[tuple[str, str]] = []
+        self._entries: dict[str, _Entry] = {}
+        self._counts = {'by_carrier': Counter(), 'by_retailer': Counter(), 'by_status': Counter()}
+        self._listed: list[dict[str, Any]] | None = None
+        self.replace(packages)
+
+    def __len__(self) -> int:
+        return len(self._packages)
+
+    def __contains__(self, tracking_number: object) -> bool:
+        return tracking_number in self._packages
+
+    def get(self, tracking_number: str) -> dict[str, Any] | None:
+        """The package listed under `tracking_number`, if any."""
+        return self._packages.get(tracking_number)
+
+    def _unlink(self, number: str, entry: _Entry, keep: _Entry | None = None) -> None:
+        """Take `entry` out of the indexes, except the parts `keep` shares."""
+        for index, (field, value) in enumerate(zip(INDEXED_FIELDS, entry.fields)):
+            if keep is not None and keep.fields[index] == value:
+                continue
+            bucket = self._index[field][value]
+            bucket.discard(number)
+            if not bucket:
+                del self._index[field][value]
+        if keep is None or keep.first_seen != entry.first_seen:
+            del self._first_seen[bisect_left(self._first_seen, entry.first_seen)]
+        if keep is None or keep.counts != entry.counts:
+            for counter, value in zip(self._counts.values(), entry.counts):
+                counter[value] -= 1
+                if not counter[value]:
+                    del counter[value]
+
+    def _link(self, number: str, entry: _Entry, previous: _Entry | None = None) -> None:
+        """Put `entry` into the indexes, except the parts `previous` shares."""
+        self._entries[number] = entry
+        for index, (field, value) in enumerate(zip(INDEXED_FIELDS, entry.fields)):
+            if previous is None or previous.fields[index] != value:
+                self._index[field].setdefault(value, set()).add(number)
+        if previous is None or previous.first_seen != entry.first_seen:
+            insort(self._first_seen, entry.first_seen)
+        if previous is None or previous.counts != entry.counts:
+            for counter, value in zip(self._counts.values(), entry.counts):
+                counter[value] += 1
+
+    def upsert(self, pkg: dict[str, Any]) -> bool:
+        """List `pkg`, replacing the package with the same tracking number.
+
+        Returns whether any index or count changed.
+        """
+        number = pkg['tracking_number']
+        entry = _entry(pkg)
+        if self._packages.get(number) is not pkg:
+            self._packages[number] = pkg
+            self._listed = None
+        current = self._entries.get(number)
+        if current == entry:
+            return False
+        # Only the indexes, counts and position that differ are touched.
+        if current is not None:
+            self._unlink(number, current, keep=entry)
+        self._link(number, entry, previous=current)
+        self._listed = None
+        return True
+
+    def remove(self, tracking_number: str) -> dict[str, Any] | None:
+        """Stop listing `tracking_number`; the package removed, if any."""
+        pkg = self._packages.pop(tracking_number, None)
+        if pkg is not None:
+            self._unlink(tracking_number, self._entries.pop(tracking_number))
+            self._listed = None
+        return pkg
+
+    def replace(self, packages: Iterable[dict[str, Any]]) -> int:
+        """Make `packages` the listed set; return how many entries changed.
+
+        Packages whose indexed fields are unchanged are not re-indexed, so a
+        refresh that changed nothing touches no index.
+        """
+        incoming = {pkg['tracking_number']: pkg for pkg in packages if pkg.get('tracking_number')}
+        changed = 0
+        for number in [number for number in self._packages if number not in incoming]:
+            self.remove(number)
+            changed += 1
+        for pkg in incoming.values():
+            changed += self.upsert(pkg)
+        return changed
+
+    def packages(self) -> list[dict[str, Any]]:
+        """Listed packages, newest ``first_seen`` first."""
+        if self._listed is None:
+            self._listed = [self._packages[number] for _, number in reversed(self._first_seen)]
+        return self._listed
+
+    def numbers(self, field: str, value: Any) -> frozenset[str]:
+        """Tracking numbers whose `field` (one of INDEXED_FIELDS) equals `value`."""
+        return frozenset(self._index[field].get(value, ()))
+
+    def first_seen_since(self, since: str) -> list[dict[str, Any]]:
+        """Packages first seen at or after the ISO timestamp `since`, oldest first."""
+        start = bisect_left(self._first_seen, (since, ''))
+        return [self._packages[number] for _, number in self._first_seen[start:]]
+
+    def summary(self) -> dict[str, dict[str, int]]:
+        """``by_carrier``, ``by_retailer`` and ``by_status`` package counts."""
+        return {name: dict(counter) for name, counter in self._counts.items()}
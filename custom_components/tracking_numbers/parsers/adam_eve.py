@@ -1,8 +1,7 @@
 import logging
 import re
 
-from bs4 import BeautifulSoup
-from ..const import EMAIL_ATTR_BODY
+from ..links import link_index
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -16,15 +15,14 @@ def parse_adam_and_eve(email):
 
     _LOGGER.debug(f"[Adam Eve] Starting parser")
 
-    soup = BeautifulSoup(email[EMAIL_ATTR_BODY], 'html.parser')
-    for link in soup.find_all('a'):
-        linkText = link.text
+    for link in link_index(email):
+        linkText = link.inline_text
         if linkText:
             match = re.search(r'(\d{26})', linkText)
             if match and match.group(1) not in tracking_numbers:
                 tracking_numbers.append(match.group(1))
 
-        href = link.get('href') or ''
+        href = link.href
         href_match = re.search(r'trackingnumber=(\d{26})', href)
         if href_match and href_match.group(1) not in tracking_numbers:
             tracking_numbers.append(href_match.group(1))
@@ -1,8 +1,8 @@
 import logging
 import re
 
-from bs4 import BeautifulSoup
 from ..const import EMAIL_ATTR_BODY, EMAIL_ATTR_SUBJECT
+from ..links import link_index
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -16,8 +16,6 @@ def parse_amazon(email):
 
     _LOGGER.debug(f"[Amazon] Starting parser - Subject: {subject}")
 
-    soup = BeautifulSoup(email[EMAIL_ATTR_BODY], 'html.parser')
-
     # Try to find order number in subject line (old format)
     _LOGGER.debug("[Amazon] Checking for old format: 'Your AmazonSmile/Amazon.com order #...'")
     order_number_match = re.search('Your AmazonSmile order #(.*?) has shipped', email[EMAIL_ATTR_SUBJECT])
@@ -48,13 +46,12 @@ def parse_amazon(email):
 
     # find the link that has 'track package' text
     _LOGGER.debug("[Amazon] Searching for 'track package' links")
-    linkElements = soup.find_all('a')
-    for linkElement in linkElements:
+    for linkElement in link_index(email):
         if not re.search(r'track package', linkElement.text, re.IGNORECASE):
             continue
 
         # if found we no get url and check for duplicates
-        link = linkElement.get('href')
+        link = linkElement.href
         _LOGGER.debug(f"[Amazon] Found tracking link: {link}")
 
         # make sure we dont have dupes
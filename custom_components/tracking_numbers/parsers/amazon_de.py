@@ -1,8 +1,8 @@
 import logging
 import re
 
-from bs4 import BeautifulSoup
 from ..const import EMAIL_ATTR_BODY, EMAIL_ATTR_SUBJECT
+from ..links import link_index
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -16,8 +16,6 @@ def parse_amazon_de(email):
 
     _LOGGER.debug(f"[Amazon De] Starting parser - Subject: {subject}")
  
-    soup = BeautifulSoup(email[EMAIL_ATTR_BODY], 'html.parser')
-
     # see if it's an shipped order email
     _LOGGER.debug("[Amazon De] Checking for order number in body")
     order_number_match = re.search('Order: #(.*?)\n', email[EMAIL_ATTR_BODY])
@@ -34,13 +32,12 @@ def parse_amazon_de(email):
 
     # find the link that has 'track your package' text
     _LOGGER.debug("[Amazon De] Searching for 'track your package' links")
-    linkElements = soup.find_all('a')
-    for linkElement in linkElements:
+    for linkElement in link_index(email):
         if not re.search(r'track your package', linkElement.text, re.IGNORECASE):
             continue
 
         # if found we no get url and check for duplicates
-        link = linkElement.get('href')
+        link = linkElement.href
         _LOGGER.debug(f"[Amazon De] Found tracking link: {link}")
 
         # make sure we dont have dupes
@@ -1,29 +0,0 @@
-import logging
-import re
-
-from bs4 import BeautifulSoup
-from ..const import EMAIL_ATTR_BODY
-
-
-_LOGGER = logging.getLogger(__name__)
-ATTR_BH_PHOTO = 'bh_photo'
-EMAIL_DOMAIN_BH_PHOTO = 'bhphotovideo.com'
-
-
-def parse_bh_photo(email):
-    """Parse B&H Photo tracking numbers."""
-    tracking_numbers = []
-
-    _LOGGER.debug(f"[Bh Photo] Starting parser")
-
-    soup = BeautifulSoup(email[EMAIL_ATTR_BODY], 'html.parser')
-    links = [link.get('href') for link in soup.find_all('a')]
-    for link in links:
-        if not link:
-            continue
-        match = re.search('tracknumbers=(.*?)$', link)
-        if match and match.group(1) not in tracking_numbers:
-            tracking_numbers.append(match.group(1))
-
-    _LOGGER.debug(f"[Bh Photo] Parser complete - Found {len(tracking_numbers)} tracking number(s)")
-    return tracking_numbers
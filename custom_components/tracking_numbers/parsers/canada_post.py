@@ -1,11 +1,11 @@
 import logging
 import re
-from html import unescape
-from urllib.parse import unquote
 
 from bs4 import BeautifulSoup
 from ..const import EMAIL_ATTR_BODY
 from ..const import EMAIL_ATTR_SUBJECT
+from ..ingest import plain_text
+from ..links import text_link_index
 
 _LOGGER = logging.getLogger(__name__)
 ATTR_CANADA_POST = 'canada_post'
@@ -44,15 +44,11 @@ def parse_canada_post(email):
 
     _LOGGER.debug(f"[CanadaPost] Starting parser - Subject: {subject}")
 
-    soup = BeautifulSoup(email[EMAIL_ATTR_BODY], 'html.parser')
-    links = [link.get('href') for link in soup.find_all('a')]
+    links = text_link_index(email)
     _LOGGER.debug(f"[CanadaPost] Found {len(links)} links in email body")
 
-    for link in links:
-        if not link:
-            continue
-        link_str = unquote(unescape(str(link)))
-        for match in _CANADA_POST_LINK_PARAM_RE.finditer(link_str):
+    for link in links.with_href():
+        for match in _CANADA_POST_LINK_PARAM_RE.finditer(link.unquoted):
             _add_tracking_number(tracking_numbers, match.group(1))
 
     _LOGGER.debug("[CanadaPost] Checking subject line for tracking number")
@@ -61,7 +57,10 @@ def parse_canada_post(email):
 
     if not tracking_numbers:
         _LOGGER.debug("[CanadaPost] Checking body text for labeled tracking number")
-        body_text = soup.get_text(separator=' ')
+        body_text = plain_text(email)
+        if body_text is None:
+            soup = BeautifulSoup(email[EMAIL_ATTR_BODY], 'html.parser')
+            body_text = soup.get_text(separator=' ')
         for match in _CANADA_POST_BODY_LABEL_RE.finditer(body_text):
             _add_tracking_number(tracking_numbers, match.group(1))
 
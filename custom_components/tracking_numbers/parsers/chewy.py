@@ -1,10 +1,11 @@
 import logging
 import re
 from html import unescape
-from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
+from urllib.parse import urlencode, urlunparse
 
 from bs4 import BeautifulSoup
 from ..const import EMAIL_ATTR_BODY
+from ..links import Link, link_index
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -29,8 +30,13 @@ def parse_chewy(email):
     tracking_entries = []
     seen_ids: set[str] = set()
 
-    for raw_link in CHEWY_TRACK_LINK_RE.findall(body):
-        entry = _entry_from_link(raw_link)
+    links = [link for link in link_index(email).with_href() if CHEWY_TRACK_LINK_RE.match(link.href)]
+    if not links:
+        # Plain-text bodies (or links outside anchors): take the URLs verbatim.
+        links = [Link(unescape(raw_link.strip())) for raw_link in CHEWY_TRACK_LINK_RE.findall(body)]
+
+    for link in links:
+        entry = _entry_from_link(link)
         if not entry:
             continue
 
@@ -68,20 +74,18 @@ def parse_chewy(email):
     return tracking_entries
 
 
-def _entry_from_link(raw_link: str) -> dict | None:
+def _entry_from_link(link: Link) -> dict | None:
     """Build a tracking entry from a Chewy tracking URL."""
-    decoded_link = unescape(raw_link.strip())
-    parsed = urlparse(decoded_link)
+    decoded_link = link.href
 
-    if 'chewy.com' not in parsed.netloc:
+    if not link.on_host('chewy.com'):
         return None
 
-    if not parsed.path.endswith('/track'):
+    if not link.path.endswith('/track'):
         return None
 
-    params = parse_qs(parsed.query)
-    order_id = (params.get('orderId') or [''])[0].strip()
-    package_id = (params.get('packageId') or [''])[0].strip()
+    order_id = (link.query.get('orderId') or [''])[0].strip()
+    package_id = (link.query.get('packageId') or [''])[0].strip()
 
     canonical_params = []
     if order_id:
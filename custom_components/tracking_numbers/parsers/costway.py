@@ -1,5 +1,4 @@
 import logging
-import quopri
 import re
 
 from bs4 import BeautifulSoup
@@ -19,20 +18,15 @@ _COSTWAY_TRACKING_RE = re.compile(
 def parse_costway(email):
     """Parse Costway shipment notification tracking numbers."""
     subject = email.get(EMAIL_ATTR_SUBJECT, '') or ''
-    raw_body = email.get(EMAIL_ATTR_BODY, '') or ''
+    body = email.get(EMAIL_ATTR_BODY, '') or ''
 
     _LOGGER.debug(f"[Costway] Starting parser - Subject: {subject}")
 
-    if not raw_body:
+    if not body:
         _LOGGER.debug("[Costway] Empty email body; skipping")
         return []
 
-    decoded_body = raw_body
-    if '=\r' in raw_body or '=\n' in raw_body:
-        decoded = quopri.decodestring(raw_body)
-        decoded_body = decoded.decode('utf-8', errors='ignore') if isinstance(decoded, bytes) else decoded
-
-    text = BeautifulSoup(decoded_body, 'html.parser').get_text(' ', strip=True)
+    text = BeautifulSoup(body, 'html.parser').get_text(' ', strip=True)
 
     tracking_numbers: list[str] = []
     for match in _COSTWAY_TRACKING_RE.finditer(text):
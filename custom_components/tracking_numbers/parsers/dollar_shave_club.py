@@ -1,8 +1,7 @@
 import logging
 import re
 
-from bs4 import BeautifulSoup
-from ..const import EMAIL_ATTR_BODY
+from ..links import link_index
 
 _LOGGER = logging.getLogger(__name__)
 ATTR_DOLLAR_SHAVE_CLUB = 'dollar_shave_club'
@@ -15,14 +14,12 @@ def parse_dollar_shave_club(email):
 
     _LOGGER.debug(f"[Dollar Shave Club] Starting parser")
 
-    soup = BeautifulSoup(email[EMAIL_ATTR_BODY], 'html.parser')
-    elements = soup.find_all('a')
-    for element in elements:
-        title = element.get('title')
+    for element in link_index(email):
+        title = element.attrs.get('title')
         if not title:
             continue
         if 'Track Package' == title:
-            link = element.get('href')
+            link = element.href
             match = re.search(r'x=(.*?)%7c', link)
             if match and match.group(1) not in tracking_numbers:
                 tracking_numbers.append(match.group(1))
@@ -1,10 +1,9 @@
 import logging
-import quopri
 import re
-from urllib.parse import parse_qs, unquote, urlparse
+from urllib.parse import parse_qs, urlparse
 
-from bs4 import BeautifulSoup
 from ..const import EMAIL_ATTR_BODY
+from ..links import link_index
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -33,15 +32,6 @@ def parse_dsw(email):
         _LOGGER.debug("[Dsw] Empty email body received; skipping")
         return tracking_entries
 
-    try:
-        decoded_bytes = quopri.decodestring(body.encode('utf-8', errors='ignore'))
-        decoded_body = decoded_bytes.decode('utf-8', errors='replace')
-    except Exception as err:  # pragma: no cover - defensive
-        _LOGGER.debug("[Dsw] Failed to decode body as quoted-printable: %s", err)
-        decoded_body = body
-
-    soup = BeautifulSoup(decoded_body, 'html.parser')
-
     def _add_tracking_number(number: str, link: str | None = None, carrier: str | None = None) -> None:
         tracking_number = (number or '').strip()
         if not tracking_number or tracking_number in seen_numbers:
@@ -56,12 +46,11 @@ def parse_dsw(email):
         tracking_entries.append(entry)
 
     # Extract tracking info from anchor tags first
-    for anchor in soup.find_all('a', href=True):
-        href = anchor['href']
-        if not href or 'tracking_numbers' not in href.lower():
+    for anchor in link_index(email).with_href():
+        if 'tracking_numbers' not in anchor.href.lower():
             continue
 
-        decoded_href = unquote(href)
+        decoded_href = anchor.unquoted
         parsed = urlparse(decoded_href)
         params = parse_qs(parsed.query)
         candidates = params.get('tracking_numbers') or []
@@ -78,7 +67,7 @@ def parse_dsw(email):
 
     # Fallback: scan body for tracking_numbers parameter
     if not tracking_entries:
-        for match in TRACKING_PARAM_RE.findall(decoded_body):
+        for match in TRACKING_PARAM_RE.findall(body):
             _add_tracking_number(match)
 
     _LOGGER.debug("[Dsw] Parser complete - Found %d tracking number(s)", len(tracking_entries))
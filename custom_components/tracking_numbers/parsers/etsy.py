@@ -13,9 +13,8 @@ ORDER_NUMBER_PATTERN = re.compile(r'#\s*(\d+)', re.IGNORECASE)
 
 
 def _normalize_link(raw_link: str) -> str:
-    """Clean up quoted-printable artifacts and whitespace in URLs."""
-    link = raw_link.replace('=\n', '').replace('=3D', '=')
-    return re.sub(r'\s+', '', link.strip())
+    """Strip whitespace that wrapped into a URL."""
+    return re.sub(r'\s+', '', raw_link.strip())
 
 
 def parse_etsy(email):
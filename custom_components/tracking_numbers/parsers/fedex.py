@@ -1,11 +1,10 @@
 import logging
 import re
-from html import unescape
-from urllib.parse import unquote
 
-from bs4 import BeautifulSoup
 from ..const import EMAIL_ATTR_BODY
 from ..const import EMAIL_ATTR_SUBJECT
+from ..ingest import plain_text
+from ..links import text_link_index
 
 _LOGGER = logging.getLogger(__name__)
 ATTR_FEDEX = 'fedex'
@@ -26,12 +25,9 @@ def _add_tracking_number(tracking_numbers: list[str], tracking_num: str) -> None
     tracking_numbers.append(tracking_num)
 
 
-def _extract_query_param_values(link: str, key: str) -> list[str]:
-    match = re.search(rf"(?:\\?|&){re.escape(key)}=([^&#]+)", link)
-    if not match:
-        return []
-    raw_value = unquote(unescape(match.group(1)))
-    return [part.strip() for part in re.split(r"[,\s]+", raw_value) if part.strip()]
+def _split_param_values(values: list[str]) -> list[str]:
+    # FedEx packs several shipments into one parameter: "1234,5678" or "1234 5678"
+    return [part for value in values for part in re.split(r"[,\s]+", value) if part]
 
 
 def parse_fedex(email):
@@ -41,24 +37,13 @@ def parse_fedex(email):
 
     _LOGGER.debug(f"[Fedex] Starting parser - Subject: {subject}")
 
-    soup = BeautifulSoup(email[EMAIL_ATTR_BODY], 'html.parser')
-    links = [link.get('href') for link in soup.find_all('a')]
+    links = text_link_index(email)
     _LOGGER.debug(f"[Fedex] Found {len(links)} links in email body")
 
-    for link in links:
-        if not link:
-            continue
-        link_str = str(link)
-
-        match = re.search(r'tracknumbers=(.*?)&', link_str)
-        if match:
-            _add_tracking_number(tracking_numbers, match.group(1))
-
-        for tracking_num in _extract_query_param_values(link_str, "tracknumbers"):
-            _add_tracking_number(tracking_numbers, tracking_num)
-
-        for tracking_num in _extract_query_param_values(link_str, "trknbr"):
-            _add_tracking_number(tracking_numbers, tracking_num)
+    for link in links.with_href():
+        for key in ("tracknumbers", "trknbr"):
+            for tracking_num in _split_param_values(link.params(key)):
+                _add_tracking_number(tracking_numbers, tracking_num)
 
     _LOGGER.debug("[Fedex] Checking subject line for tracking number")
     match = re.search(r'FedEx Shipment (.*?): Your package is on its way', subject)
@@ -69,7 +54,7 @@ def parse_fedex(email):
         _add_tracking_number(tracking_numbers, tracking_num)
 
     if not tracking_numbers:
-        body = email.get(EMAIL_ATTR_BODY, '') or ''
+        body = plain_text(email) or email.get(EMAIL_ATTR_BODY, '') or ''
         for tracking_num in _FEDEX_TRACKING_IN_TEXT_RE.findall(body):
             _add_tracking_number(tracking_numbers, tracking_num)
     
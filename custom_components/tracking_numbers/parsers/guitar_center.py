@@ -20,6 +20,9 @@ def parse_guitar_center(email):
     for element in elements:
         if 'Tracking:' in element.text:
             tracking_link = element.find("a", recursive=False)
+            # Outer layout cells contain the label too, but not the link.
+            if not tracking_link:
+                continue
             tracking_number = tracking_link.text
             if tracking_number not in tracking_numbers:
                 tracking_numbers.append(tracking_number)
@@ -1,11 +1,10 @@
 import logging
-import quopri
 import re
 from typing import Iterable
-from urllib.parse import parse_qs, urlparse
 
 from bs4 import BeautifulSoup
 from ..const import EMAIL_ATTR_BODY, fedex_regex, ups_regex, usps_regex
+from ..links import Link, link_index
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -14,8 +13,11 @@ EMAIL_DOMAIN_HOME_DEPOT = 'homedepot.com'
 
 
 TRACKING_LABEL_RE = re.compile(r'tracking\s*number', re.IGNORECASE)
-TRACKING_LINE_RE = re.compile(r'(?:tracking\s*(?:number|#)\s*[:\-]?\s*)([A-Z0-9\s-]{8,})', re.IGNORECASE)
+# Bounded: an unbounded run of [A-Z0-9\s-] after a label backtracks badly on big bodies.
+TRACKING_LINE_RE = re.compile(r'(?:tracking\s*(?:number|#)\s*[:\-]?\s*)([A-Z0-9\s-]{8,40})', re.IGNORECASE)
 TRACKING_QUERY_KEYS = ('tracking', 'trackingnumber', 'tracking_number')
+# Longest carrier number we recognize (USPS IMpb with routing prefix) plus slack.
+MAX_TRACKING_LENGTH = 40
 ORDER_NUMBER_RE = re.compile(r'order\s*#\s*([A-Za-z]{2}\d{8})', re.IGNORECASE)
 TRACKING_REGEXES: tuple[re.Pattern[str], ...] = (
     re.compile(ups_regex, re.IGNORECASE),
@@ -36,10 +38,6 @@ def parse_home_depot(email):
         _LOGGER.debug("[Home Depot] Empty email body received; skipping")
         return tracking_entries
 
-    if '=\r' in body or '=\n' in body:
-        decoded = quopri.decodestring(body)
-        body = decoded.decode('utf-8', errors='ignore') if isinstance(decoded, bytes) else decoded
-
     soup = BeautifulSoup(body, 'html.parser')
     unified_text = soup.get_text(" ", strip=True)
     order_numbers = _extract_order_numbers(unified_text)
@@ -60,20 +58,14 @@ def parse_home_depot(email):
         tracking_entries.append(entry)
 
     # Inspect anchor tags for tracking parameters and relevant text.
-    for element in soup.find_all('a'):
-        raw_href = element.get('href') or ''
-        if not raw_href:
-            continue
-
-        href = _normalize_href(raw_href)
-        tracking_from_link = _extract_from_link(href)
+    for link in link_index(email).with_href():
+        tracking_from_link = _extract_from_link(link)
         if tracking_from_link:
-            _add_entry(tracking_from_link, href)
+            _add_entry(tracking_from_link, link.href)
             continue
 
-        anchor_text = element.get_text(" ", strip=True)
-        for candidate in _extract_tracking_candidates(anchor_text, require_label=False):
-            _add_entry(candidate, href)
+        for candidate in _extract_tracking_candidates(link.text, require_label=False):
+            _add_entry(candidate, link.href)
 
     # Scan for explicit "Tracking Number" labels within structured markup.
     for label in soup.find_all(string=TRACKING_LABEL_RE):
@@ -102,28 +94,12 @@ def _extract_order_numbers(text: str) -> set[str]:
     return orders
 
 
-def _normalize_href(href: str) -> str:
-    normalized = href.strip()
-    if normalized.startswith('3D"') and normalized.endswith('"'):
-        normalized = normalized[3:-1]
-    normalized = normalized.replace('=\r\n', '').replace('=\n', '')
-    if '=3D' in normalized:
-        try:
-            decoded = quopri.decodestring(normalized)
-            normalized = decoded.decode('utf-8', errors='ignore') if isinstance(decoded, bytes) else decoded
-        except Exception:  # pragma: no cover - best effort only
-            normalized = normalized.replace('=3D', '=')
-    return normalized
-
-
-def _extract_from_link(link: str) -> str | None:
-    parsed = urlparse(link)
-    if 'link.order.homedepot.com' not in parsed.netloc.lower():
+def _extract_from_link(link: Link) -> str | None:
+    if not link.on_host('link.order.homedepot.com'):
         return None
 
-    params = parse_qs(parsed.query)
     for key in TRACKING_QUERY_KEYS:
-        values = params.get(key)
+        values = link.query.get(key)
         if not values:
             continue
         for value in values:
@@ -148,8 +124,10 @@ def _extract_tracking_candidates(text: str, require_label: bool) -> Iterable[str
 
     tokens = text.split()
     current_parts: list[str] = []
+    current_length = 0
 
     def flush_parts() -> None:
+        nonlocal current_length
         if not current_parts:
             return
         candidate = ''.join(current_parts)
@@ -157,6 +135,7 @@ def _extract_tracking_candidates(text: str, require_label: bool) -> Iterable[str
         if normalized:
             matches.append(normalized)
         current_parts.clear()
+        current_length = 0
 
     for token in tokens:
         cleaned = re.sub(r'[^A-Za-z0-9]', '', token)
@@ -166,7 +145,12 @@ def _extract_tracking_candidates(text: str, require_label: bool) -> Iterable[str
 
         cleaned_upper = cleaned.upper()
         if any(ch.isdigit() for ch in cleaned_upper):
+            # A run longer than any tracking number can't match; start over
+            # instead of growing it (and re-joining it) without bound.
+            if current_length + len(cleaned_upper) > MAX_TRACKING_LENGTH:
+                flush_parts()
             current_parts.append(cleaned_upper)
+            current_length += len(cleaned_upper)
             continue
 
         if current_parts:
@@ -174,6 +158,7 @@ def _extract_tracking_candidates(text: str, require_label: bool) -> Iterable[str
             normalized = _normalize_tracking_candidate(candidate)
             if normalized:
                 current_parts.append(cleaned_upper)
+                current_length += len(cleaned_upper)
                 continue
             flush_parts()
 
@@ -1,5 +1,4 @@
 import logging
-import quopri
 import re
 
 from bs4 import BeautifulSoup
@@ -26,15 +25,13 @@ def parse_house_of_noa(email):
         _LOGGER.debug("[House of Noa] Empty email body; skipping parser")
         return tracking_numbers
 
-    decoded_body = _qp_decode(body)
-    soup = BeautifulSoup(decoded_body, 'html.parser')
+    soup = BeautifulSoup(body, 'html.parser')
 
     _LOGGER.debug("[House of Noa] Starting parser")
 
     # Extract tracking info from explicit UPS tracking links
     for anchor in soup.find_all('a', href=True):
-        raw_href = anchor.get('href')
-        href = _qp_decode(raw_href)
+        href = anchor.get('href')
         if not href:
             continue
 
@@ -80,8 +77,7 @@ def _normalize_tracking_number(value: str) -> str:
     if not value:
         return ''
 
-    decoded = _qp_decode(value)
-    clean_value = re.sub(r'[^A-Za-z0-9]', '', decoded or '')
+    clean_value = re.sub(r'[^A-Za-z0-9]', '', value)
     normalized = clean_value.upper()
 
     if not normalized:
@@ -91,14 +87,3 @@ def _normalize_tracking_number(value: str) -> str:
         return normalized
 
     return ''
-
-
-def _qp_decode(value: str | None) -> str:
-    """Decode quoted-printable fragments safely."""
-    if not value:
-        return ''
-
-    decoded = quopri.decodestring(value)
-    if isinstance(decoded, bytes):
-        return decoded.decode('utf-8', errors='ignore')
-    return decoded
@@ -11,6 +11,8 @@ ATTR_LITTER_ROBOT = 'litter_robot'
 EMAIL_DOMAIN_LITTER_ROBOT = 'litter-robot.com'
 
 TRACKING_LABEL_RE = re.compile(r'tracking\s*number', re.IGNORECASE)
+# Longest carrier number we recognize (USPS IMpb with routing prefix) plus slack.
+MAX_TRACKING_LENGTH = 40
 TRACKING_REGEXES: tuple[re.Pattern[str], ...] = (
     re.compile(ups_regex, re.IGNORECASE),
     re.compile(usps_regex, re.IGNORECASE),
@@ -80,16 +82,19 @@ def _extract_tracking_numbers(text: str) -> Iterable[str]:
 
     matches: list[str] = []
     current_parts: list[str] = []
+    current_length = 0
 
     tokens = text.split()
 
     def _flush_candidate() -> None:
+        nonlocal current_length
         if not current_parts:
             return
         candidate = ''.join(current_parts)
         if _matches_tracking(candidate):
             matches.append(candidate)
         current_parts.clear()
+        current_length = 0
 
     for token in tokens:
         cleaned = re.sub(r'[^A-Za-z0-9]', '', token)
@@ -101,7 +106,12 @@ def _extract_tracking_numbers(text: str) -> Iterable[str]:
         has_digit = any(char.isdigit() for char in cleaned_upper)
 
         if has_digit:
+            # A run longer than any tracking number can't match; start over
+            # instead of growing it (and re-joining it) without bound.
+            if current_length + len(cleaned_upper) > MAX_TRACKING_LENGTH:
+                _flush_candidate()
             current_parts.append(cleaned_upper)
+            current_length += len(cleaned_upper)
             continue
 
         if current_parts:
@@ -109,6 +119,7 @@ def _extract_tracking_numbers(text: str) -> Iterable[str]:
             candidate_with_suffix = candidate + cleaned_upper
             if _matches_tracking(candidate_with_suffix):
                 current_parts.append(cleaned_upper)
+                current_length += len(cleaned_upper)
                 continue
             _flush_candidate()
 
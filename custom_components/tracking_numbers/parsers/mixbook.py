@@ -1,9 +1,8 @@
 import logging
 import re
-from urllib.parse import parse_qs, urlparse
 
-from bs4 import BeautifulSoup
 from ..const import EMAIL_ATTR_BODY, EMAIL_ATTR_SUBJECT
+from ..links import link_index
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -34,13 +33,12 @@ def parse_mixbook(email):
         _LOGGER.debug("[Mixbook] Empty email body; skipping")
         return []
 
-    soup = BeautifulSoup(body, 'html.parser')
+    links = link_index(email)
 
     shipment_link = None
-    for a in soup.find_all('a', href=True):
-        href = a['href']
-        if _SHIPMENT_LINK_RE.match(href):
-            shipment_link = href
+    for a in links.with_href():
+        if _SHIPMENT_LINK_RE.match(a.href):
+            shipment_link = a.href
             break
 
     if not shipment_link:
@@ -53,9 +51,8 @@ def parse_mixbook(email):
         return []
 
     order_number = None
-    for a in soup.find_all('a', href=True):
-        qs = parse_qs(urlparse(a['href']).query)
-        oid = (qs.get('oid') or [''])[0].strip()
+    for a in links.with_href():
+        oid = (a.query.get('oid') or [''])[0].strip()
         if oid:
             order_number = oid
             break
@@ -1,10 +1,8 @@
 import logging
-import quopri
 import re
 
-from bs4 import BeautifulSoup
-
-from ..const import EMAIL_ATTR_BODY, EMAIL_ATTR_SUBJECT
+from ..const import EMAIL_ATTR_SUBJECT
+from ..links import link_index
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -12,27 +10,6 @@ ATTR_MOEN = 'moen'
 EMAIL_DOMAIN_MOEN = 'moen.com'
 
 
-def _decode_body(raw_body):
-    """Decode quoted-printable Moen emails to plain HTML."""
-    if raw_body is None:
-        return ''
-
-    if isinstance(raw_body, bytes):
-        raw_bytes = raw_body
-    else:
-        raw_bytes = raw_body.encode('utf-8', errors='ignore')
-
-    decoded = quopri.decodestring(raw_bytes)
-    decoded_text = decoded.decode('utf-8', errors='ignore')
-    if decoded_text.strip():
-        return decoded_text
-
-    if isinstance(raw_body, str):
-        return raw_body
-
-    return raw_body.decode('utf-8', errors='ignore')
-
-
 def parse_moen(email):
     """Parse Moen tracking emails."""
     tracking_numbers = []
@@ -46,19 +23,12 @@ def parse_moen(email):
         return tracking_numbers
 
     order_number = order_match.group(1)
-    body = _decode_body(email.get(EMAIL_ATTR_BODY, ''))
-    soup = BeautifulSoup(body or '', 'html.parser')
-
-    for anchor in soup.find_all('a', href=True):
-        href = anchor['href']
-        if not href:
-            continue
-
-        link = href.strip()
+    for anchor in link_index(email).with_href():
+        link = anchor.href
         if 'TrackConfirmAction' not in link:
             continue
 
-        tracking_text = anchor.get_text(strip=True)
+        tracking_text = anchor.inline_text
         tracking_number = order_number
 
         tracking_match = re.search(r'(\d{10,})', tracking_text)
@@ -0,0 +1,156 @@
+import logging
+import re
+from html import unescape
+
+from ..const import (
+    CARRIER_NAME_ALIASES,
+    EMAIL_ATTR_BODY,
+    EMAIL_DOMAIN_REGEX,
+    PLATFORM_AFTERSHIP,
+    PLATFORM_HOSTS,
+    PLATFORM_NARVAR,
+    PLATFORM_ROUTE,
+    PLATFORM_SHOPIFY,
+    TRACKING_LINK_PARAMS,
+)
+from ..dispatch import email_sender
+from ..links import link_index
+
+
+_LOGGER = logging.getLogger(__name__)
+ATTR_SHOPIFY = 'shopify'
+ATTR_NARVAR = 'narvar'
+ATTR_AFTERSHIP = 'aftership'
+ATTR_ROUTE = 'route'
+# Family extractors are picked by platform (platforms.py), not by sender.
+EMAIL_DOMAIN_SHOPIFY = ''
+EMAIL_DOMAIN_NARVAR = ''
+EMAIL_DOMAIN_AFTERSHIP = ''
+EMAIL_DOMAIN_ROUTE = ''
+
+# "UPS tracking number: <a href=...>1Z...</a>", the line every Shopify
+# shipping template renders (Narvar, AfterShip and Route print it too).
+_LABELED_RE = re.compile(
+    r'(?:\b(?P<carrier>UPS|FedEx|USPS|DHL(?: Express)?|Canada Post|Veho|Other)\s+)?'
+    r'tracking\s+(?:number|#)\s*[:#\-]?\s*'
+    r'(?P<tags>(?:<[^<>]{0,2000}>\s*){0,6})'
+    r'(?P<number>[A-Z0-9]{8,40})\b',
+    re.IGNORECASE,
+)
+_HREF_RE = re.compile(r'href\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+_NUMBER_RE = re.compile(r'[A-Z0-9]{8,40}')
+_CARRIER_PARAMS = ('carrier', 'courier', 'slug')
+# narvar.com/<retailer>/tracking/<carrier>?tracking_numbers=...
+_NARVAR_CARRIER_RE = re.compile(r'/tracking/([\w-]+)', re.IGNORECASE)
+# aftership.com/<courier slug>/<number> (or just /<number> on branded pages)
+_AFTERSHIP_PATH_RE = re.compile(r'^/(?:(?P<slug>[a-z][\w-]*)/)?(?P<number>[A-Za-z0-9]{8,40})/?$')
+
+
+def _tracking_number(value):
+    value = (value or '').strip().upper()
+    if _NUMBER_RE.fullmatch(value) and any(char.isdigit() for char in value):
+        return value
+    return None
+
+
+def _carrier(value):
+    """Carrier name for a label or a tracking-page slug; None when unknown."""
+    key = (value or '').strip().lower().replace('-', ' ').replace('_', ' ')
+    return CARRIER_NAME_ALIASES.get(key)
+
+
+def _link_results(email, platform):
+    """Numbers carried by tracking-page and carrier links, with their carrier."""
+    hosts = PLATFORM_HOSTS[platform]
+    for link in link_index(email).with_href():
+        on_platform = any(link.on_host(host) for host in hosts)
+        carrier = next((_carrier(link.param(key)) for key in _CARRIER_PARAMS if link.param(key)), None)
+        if on_platform and platform == PLATFORM_NARVAR and not carrier:
+            match = _NARVAR_CARRIER_RE.search(link.path)
+            carrier = _carrier(match.group(1)) if match else None
+
+        numbers = [
+            part
+            for key in TRACKING_LINK_PARAMS
+            for value in link.params(key)
+            for part in re.split(r'[,\s]+', value)
+        ]
+        if not numbers and on_platform and platform == PLATFORM_AFTERSHIP:
+            match = _AFTERSHIP_PATH_RE.match(link.path)
+            if match:
+                numbers = [match.group('number')]
+                carrier = carrier or _carrier(match.group('slug'))
+
+        for number in numbers:
+            number = _tracking_number(number)
+            if number:
+                yield number, carrier, link.href
+
+
+def _labeled_results(body):
+    """Numbers printed after a "<carrier> tracking number:" label."""
+    for match in _LABELED_RE.finditer(body):
+        number = _tracking_number(match.group('number'))
+        if not number:
+            continue
+        hrefs = _HREF_RE.findall(match.group('tags'))
+        yield number, _carrier(match.group('carrier')), unescape(hrefs[-1]) if hrefs else None
+
+
+def _extract(email, platform, label):
+    """Tracking results of one platform-family email.
+
+    Numbers come from tracking links first, then from labels in the body.
+    A carrier named by the link or label is kept and the link left to
+    carrier detection, so the package gets the carrier's own tracking page;
+    numbers with an unknown carrier keep the link the email gave them.
+    """
+    _LOGGER.debug(f"[{label}] Starting parser")
+    results = {}
+
+    def _add(number, carrier, link):
+        entry = results.get(number)
+        if entry is None:
+            entry = results[number] = {'tracking_number': number}
+            _LOGGER.debug(f"[{label}] Found tracking number: {number}")
+        if carrier and 'carrier' not in entry:
+            entry['carrier'] = carrier
+            entry.pop('link', None)
+        elif link and 'carrier' not in entry and 'link' not in entry:
+            entry['link'] = link
+
+    for number, carrier, link in _link_results(email, platform):
+        _add(number, carrier, link)
+    for number, carrier, link in _labeled_results(email.get(EMAIL_ATTR_BODY) or ''):
+        _add(number, carrier, link)
+
+    # The store, not the platform, is where the package comes from; mail sent
+    # from the platform's own domain doesn't say which store it is.
+    domain = re.search(EMAIL_DOMAIN_REGEX, email_sender(email))
+    origin = domain.group(1).lower() if domain else ''
+    if origin and not any(origin == host or origin.endswith(f'.{host}') for host in PLATFORM_HOSTS[platform]):
+        for entry in results.values():
+            entry['origin'] = origin
+
+    _LOGGER.debug(f"[{label}] Parser complete - Found {len(results)} tracking number(s)")
+    return list(results.values())
+
+
+def parse_shopify(email):
+    """Parse shipment emails rendered from Shopify's notification templates."""
+    return _extract(email, PLATFORM_SHOPIFY, 'Shopify')
+
+
+def parse_narvar(email):
+    """Parse shipment emails sent through Narvar, with narvar.com tracking links."""
+    return _extract(email, PLATFORM_NARVAR, 'Narvar')
+
+
+def parse_aftership(email):
+    """Parse shipment emails sent through AfterShip, with aftership.com tracking pages."""
+    return _extract(email, PLATFORM_AFTERSHIP, 'AfterShip')
+
+
+def parse_route(email):
+    """Parse shipment emails sent through Route, with route.com tracking links."""
+    return _extract(email, PLATFORM_ROUTE, 'Route')
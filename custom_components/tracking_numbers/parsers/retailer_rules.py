@@ -0,0 +1,155 @@
+"""Declarative rules for retailers that don't need a bespoke parser module.
+
+Each entry is compiled by ``rule_engine.compile_rules``; see that module for
+the meaning of every key. Keep ``attr`` and ``sender`` stable: they feed the
+retailer name and ``retailer_code`` of stored packages.
+"""
+
+RETAILER_RULES = [
+    {
+        'attr': 'ups',
+        'sender': 'ups.com',
+        'link_params': ('tracknum',),
+        'carrier': 'UPS',
+    },
+    {
+        'attr': 'paypal',
+        'sender': 'paypal.com',
+        'link_params': ('origTrackNum',),
+    },
+    {
+        'attr': 'usps',
+        'sender': 'usps.com',
+        'link_params': ('selectedTrckNum', 'tLabels'),
+        'carrier': 'USPS',
+    },
+    {
+        'attr': 'rockauto',
+        'sender': 'rockauto.com',
+        'link_params': ('tracknumbers', 'trknbr'),
+    },
+    {
+        'attr': 'bh_photo',
+        'sender': 'bhphotovideo.com',
+        'link_params': ('tracknumbers',),
+    },
+    {
+        'attr': 'dhl',
+        'sender': 'dhl',
+        'link_host': 'nolp.dhl.de',
+        'link_params': ('idc',),
+        'carrier': 'DHL',
+    },
+    {
+        # Philips Hue orders ship through Luzern Solutions.
+        'attr': 'hue',
+        'sender': 'luzernsolutions',
+        'body_patterns': (r'tracking number is: (.*?)<',),
+    },
+    {
+        'attr': 'western_digital',
+        'sender': 'wdc.com',
+        'link_params': ('tracknum',),
+    },
+    {
+        'attr': 'monoprice',
+        'sender': 'monoprice.com',
+        'link_params': ('TRK',),
+    },
+    {
+        'attr': 'best_buy',
+        'sender': 'bestbuy.com',
+        'link_contains': 'shipment/tracking',
+        'link_text': r'.+',
+    },
+    {
+        'attr': 'nuleaf',
+        'sender': 'nuleafnaturals.com',
+        'link_contains': 'emailtrk',
+        'link_text': r'.+',
+    },
+    {
+        'attr': 'timeless',
+        'sender': 'timelessha.com',
+        'link_contains': 'TrackConfirmAction.action',
+        'link_params': ('tLabels',),
+    },
+    {
+        'attr': 'wyze',
+        'sender': 'wyze.com',
+        'link_params': ('tracking_numbers',),
+        'body_patterns': (r'tracking_numbers=(.*?)&',),
+    },
+    {
+        'attr': 'reolink',
+        'sender': 'reolink.com',
+        'link_params': ('trackNums', 'qtc_tLabels1'),
+    },
+    {
+        'attr': 'groupon',
+        'sender': 'groupon.com',
+        'link_contains': 'track_order',
+        'link_text': r'(?!here$).+',
+    },
+    {
+        'attr': 'zazzle',
+        'sender': 'zazzle.com',
+        'link_params': ('trackNums',),
+    },
+    {
+        'attr': 'swiss_post',
+        'sender': 'post.ch',
+        'link_params': ('formattedParcelCodes',),
+        'value_pattern': r'\d+',
+        'carrier': 'Swiss Post',
+    },
+    {
+        'attr': 'BESPOKE_POST',
+        'sender': 'bespokepost.com',
+        'body_patterns': (r'Tracking Number (.*?) ',),
+    },
+    {
+        'attr': 'manta_sleep',
+        'sender': 'mantasleep.com',
+        'link_params': ('trackingnumber',),
+    },
+    {
+        'attr': 'prusa',
+        'sender': 'prusa3d.com',
+        'link_params': ('trknbr',),
+    },
+    {
+        'attr': 'gamestop',
+        'sender': 'gamestop.com',
+        'body_patterns': (r'tracking_numbers=([0-9]+)',),
+    },
+    {
+        'attr': 'nintendo',
+        'sender': 'nintendo.com',
+        'link_params': ('trackNums',),
+    },
+    {
+        'attr': 'sony',
+        'sender': 'sony.com',
+        'body_patterns': (r'tracking_numbers=(.*?)&',),
+    },
+    {
+        'attr': 'sylvane',
+        'sender': 'sylvane.com',
+        'link_params': ('trknbr',),
+    },
+    {
+        'attr': 'adafruit',
+        'sender': 'adafruit.com',
+        'body_patterns': (r'Delivery Confirmation ID is (.*?) ',),
+    },
+    {
+        # Walmart wraps the carrier tracking number in a `w-mt.co` redirect
+        # link whose anchor text is the number itself.
+        'attr': 'walmart',
+        'sender': 'walmart.com',
+        'link_host': 'w-mt.co',
+        'link_text': r'\d{12,30}',
+        'keep_link': True,
+    },
+]
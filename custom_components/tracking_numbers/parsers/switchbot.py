@@ -10,19 +10,11 @@ ATTR_SWITCHBOT = 'switchbot'
 EMAIL_DOMAIN_SWITCHBOT = 'switch-bot.com'
 
 
-def _normalize_body(raw_body: str) -> str:
-    """Normalize quoted-printable artifacts and whitespace for regex scanning."""
-    body = raw_body or ''
-    body = body.replace('=\r\n', '').replace('=\n', '')
-    body = body.replace('=3D', '=')
-    return body
-
-
 def parse_switchbot(email):
     """Parse SwitchBot shipping emails for carrier tracking numbers."""
     tracking_numbers: list[dict] = []
 
-    body = _normalize_body(email.get(EMAIL_ATTR_BODY, ''))
+    body = email.get(EMAIL_ATTR_BODY, '') or ''
     soup = BeautifulSoup(body, 'html.parser')
     text = soup.get_text(" ", strip=True)
 
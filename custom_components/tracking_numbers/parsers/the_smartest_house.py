@@ -1,5 +1,4 @@
 import logging
-import quopri
 import re
 
 from bs4 import BeautifulSoup
@@ -26,16 +25,11 @@ FLEX_USPS_REGEX = re.compile(r'94[\d\s-]{20,}')
 
 def parse_smartest_house(email):
     """Parse the smartest house tracking numbers."""
-    raw_body = email.get(EMAIL_ATTR_BODY, '')
-    if not raw_body:
+    body = email.get(EMAIL_ATTR_BODY, '')
+    if not body:
         _LOGGER.debug("[Smartest House] Empty email body received; skipping")
         return []
 
-    decoded_body = raw_body
-    if '=\r' in raw_body or '=\n' in raw_body:
-        decoded = quopri.decodestring(raw_body)
-        decoded_body = decoded.decode('utf-8', errors='ignore') if isinstance(decoded, bytes) else decoded
-
     tracking_numbers: list[str] = []
     seen: set[str] = set()
 
@@ -58,16 +52,10 @@ def parse_smartest_house(email):
                 targets.append(link_text)
             href = element.get('href')
             if href:
-                href = href.strip()
-                if href.startswith('3D"') and href.endswith('"'):
-                    href = href[3:-1]
-                href = href.replace('=\r\n', '').replace('=\n', '')
-                targets.append(href)
+                targets.append(href.strip())
         return targets
 
-    text_targets = _collect_targets(raw_body)
-    if decoded_body != raw_body:
-        text_targets.extend(_collect_targets(decoded_body))
+    text_targets = _collect_targets(body)
 
     for target in text_targets:
         if not target:
@@ -83,9 +71,9 @@ def parse_smartest_house(email):
         for match in FLEX_USPS_REGEX.findall(target):
             _add_tracking_number(match)
 
-    # Keep scanning the raw body for legacy tracking_number parameters that might
-    # only exist in encoded links.
-    for match in LEGACY_QUERY_REGEX.findall(raw_body):
+    # Keep scanning the body for legacy tracking_number parameters that might
+    # only exist in attributes the soup doesn't expose as links.
+    for match in LEGACY_QUERY_REGEX.findall(body):
         _add_tracking_number(match)
 
     _LOGGER.debug(
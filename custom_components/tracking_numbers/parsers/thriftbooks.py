@@ -1,5 +1,4 @@
 import logging
-import quopri
 import re
 
 from bs4 import BeautifulSoup
@@ -46,10 +45,6 @@ def parse_thrift_books(email):
             entry['link'] = link
         tracking_entries.append(entry)
 
-    if '=\r' in body or '=\n' in body:
-        decoded = quopri.decodestring(body)
-        body = decoded.decode('utf-8', errors='ignore') if isinstance(decoded, bytes) else decoded
-
     soup = BeautifulSoup(body, 'html.parser')
     text = soup.get_text(" ", strip=True)
 
@@ -57,13 +52,7 @@ def parse_thrift_books(email):
     track_link_priority = 99  # lower is better
     track_link_length = 0
     for element in soup.find_all('a'):
-        raw_href = element.get('href')
-        href = None
-        if raw_href:
-            href = raw_href.strip()
-            if href.startswith('3D"') and href.endswith('"'):
-                href = href[3:-1]
-            href = href.replace('=\r\n', '').replace('=\n', '')
+        href = (element.get('href') or '').strip()
         if not href:
             continue
         anchor_text = element.get_text(" ", strip=True)
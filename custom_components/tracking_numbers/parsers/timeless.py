@@ -1,29 +0,0 @@
-import logging
-import re
-
-from bs4 import BeautifulSoup
-from ..const import EMAIL_ATTR_BODY
-
-_LOGGER = logging.getLogger(__name__)
-ATTR_TIMELESS = 'timeless'
-EMAIL_DOMAIN_TIMLESS = 'timelessha.com'
-
-
-def parse_timeless(email):
-    """Parse timeless tracking numbers."""
-    tracking_numbers = []
-
-    _LOGGER.debug(f"[Timeless] Starting parser")
-
-    soup = BeautifulSoup(email[EMAIL_ATTR_BODY], 'html.parser')
-    elements = soup.find_all('a')
-    for element in elements:
-        link = element.get('href')
-        if not link:
-            continue
-        match = re.search(r'TrackConfirmAction\.action\?tLabels=(.*?)$', link)
-        if match and match.group(1) not in tracking_numbers:
-            tracking_numbers.append(match.group(1))
-
-    _LOGGER.debug(f"[Timeless] Parser complete - Found {len(tracking_numbers)} tracking number(s)")
-    return tracking_numbers
@@ -1,8 +1,8 @@
 import logging
 import re
 
-from bs4 import BeautifulSoup
-from ..const import EMAIL_ATTR_BODY, EMAIL_ATTR_SUBJECT
+from ..const import EMAIL_ATTR_SUBJECT
+from ..links import link_index
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -36,17 +36,14 @@ def parse_ubiquiti(email):
         _LOGGER.debug("No Ubiquiti order number found in subject: %s", subject)
         return tracking_numbers
 
-    soup = BeautifulSoup(email[EMAIL_ATTR_BODY], 'html.parser')
-    links = soup.find_all('a')
+    links = link_index(email)
 
     _LOGGER.debug("Found %d total links in email body", len(links))
 
     order_link = None
 
-    for link_tag in links:
-        href = link_tag.get('href')
-        if not href:
-            continue
+    for link_tag in links.with_href():
+        href = link_tag.href
 
         _LOGGER.debug("Checking link: %s", href[:100] if len(href) > 100 else href)
 
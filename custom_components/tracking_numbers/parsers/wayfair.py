@@ -1,13 +1,14 @@
 import logging
 import re
 
-from bs4 import BeautifulSoup
 from ..const import EMAIL_ATTR_BODY, EMAIL_ATTR_SUBJECT
+from ..links import link_index
 
 
 _LOGGER = logging.getLogger(__name__)
 ATTR_WAYFAIR = 'wayfair'
 EMAIL_DOMAIN_WAYFAIR = 'wayfair.com'
+SUBJECT_INCLUDE_WAYFAIR = r'(?i)track your package|your order is on the way|has shipped'
 
 
 def parse_wayfair(email):
@@ -18,10 +19,8 @@ def parse_wayfair(email):
     subject = email.get(EMAIL_ATTR_SUBJECT, '')
     _LOGGER.debug(f"Wayfair parser - Email subject: {subject}")
 
-    soup = BeautifulSoup(email[EMAIL_ATTR_BODY], 'html.parser')
-
     # Check if it's a shipping notification email
-    if not re.search(r'track your package|your order is on the way|has shipped', subject, re.IGNORECASE):
+    if not re.search(SUBJECT_INCLUDE_WAYFAIR, subject or ''):
         _LOGGER.debug("Wayfair parser: Subject doesn't match shipping email pattern")
         return tracking_numbers
 
@@ -33,11 +32,11 @@ def parse_wayfair(email):
     _LOGGER.debug(f"Wayfair parser - Order number from body: {order_number}")
 
     # Find all links that contain 'track_package'
-    link_elements = soup.find_all('a', href=True)
+    link_elements = list(link_index(email).with_href())
     _LOGGER.debug(f"Wayfair parser - Found {len(link_elements)} total links")
 
     for link_element in link_elements:
-        link = link_element.get('href')
+        link = link_element.href
 
         if not link or 'track_package' not in link:
             continue
@@ -1,29 +0,0 @@
-import logging
-import re
-
-from bs4 import BeautifulSoup
-from ..const import EMAIL_ATTR_BODY
-
-
-_LOGGER = logging.getLogger(__name__)
-ATTR_ZAZZLE = 'zazzle'
-EMAIL_DOMAIN_ZAZZLE = 'zazzle.com'
-
-
-def parse_zazzle(email):
-    """Parse Zazzle tracking numbers."""
-    tracking_numbers = []
-
-    _LOGGER.debug(f"[Zazzle] Starting parser")
-
-    soup = BeautifulSoup(email[EMAIL_ATTR_BODY], 'html.parser')
-    links = [link.get('href') for link in soup.find_all('a')]
-    for link in links:
-        if not link:
-            continue
-        match = re.search('trackNums=(.*?)$', link)
-        if match and match.group(1) not in tracking_numbers:
-            tracking_numbers.append(match.group(1))
-
-    _LOGGER.debug(f"[Zazzle] Parser complete - Found {len(tracking_numbers)} tracking number(s)")
-    return tracking_numbers
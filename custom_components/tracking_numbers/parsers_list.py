@@ -1,7 +1,8 @@
 """Parsers list and carrier detection for Tracking Numbers integration."""
+from functools import lru_cache
 import logging
 import re
-from urllib.parse import urlparse
+from urllib.parse import unquote, urlsplit
 
 from .const import (
     EMAIL_ATTR_FROM,
@@ -10,147 +11,164 @@ from .const import (
     TRACKING_NUMBER_URLS,
     CARRIER_LINK_HINTS,
     RETAILER_DISPLAY_NAMES,
-    usps_regex,
-    fedex_regex,
-    ups_regex,
+    REPRESENTATION_TEXT,
+    PLATFORM_AFTERSHIP,
+    PLATFORM_NARVAR,
+    PLATFORM_ROUTE,
+    PLATFORM_SHOPIFY,
 )
 
-# Parser imports
-from .parsers.ups import ATTR_UPS, EMAIL_DOMAIN_UPS, parse_ups
-from .parsers.amazon import ATTR_AMAZON, EMAIL_DOMAIN_AMAZON, parse_amazon
-from .parsers.amazon_de import ATTR_AMAZON_DE, EMAIL_DOMAIN_AMAZON_DE, parse_amazon_de
-from .parsers.fedex import ATTR_FEDEX, EMAIL_DOMAIN_FEDEX, parse_fedex
-from .parsers.paypal import ATTR_PAYPAL, EMAIL_DOMAIN_PAYPAL, parse_paypal
-from .parsers.usps import ATTR_USPS, EMAIL_DOMAIN_USPS, parse_usps
-from .parsers.ali_express import ATTR_ALI_EXPRESS, EMAIL_DOMAIN_ALI_EXPRESS, parse_ali_express
-from .parsers.newegg import ATTR_NEWEGG, EMAIL_DOMAIN_NEWEGG, parse_newegg
-from .parsers.rockauto import ATTR_ROCKAUTO, EMAIL_DOMAIN_ROCKAUTO, parse_rockauto
-from .parsers.bh_photo import ATTR_BH_PHOTO, EMAIL_DOMAIN_BH_PHOTO, parse_bh_photo
-from .parsers.ebay import ATTR_EBAY, EMAIL_DOMAIN_EBAY, parse_ebay
-from .parsers.dhl import ATTR_DHL, EMAIL_DOMAIN_DHL, parse_dhl
-from .parsers.hue import ATTR_HUE, EMAIL_DOMAIN_HUE, parse_hue
-from .parsers.google_express import ATTR_GOOGLE_EXPRESS, EMAIL_DOMAIN_GOOGLE_EXPRESS, parse_google_express
-from .parsers.western_digital import ATTR_WESTERN_DIGITAL, EMAIL_DOMAIN_WESTERN_DIGITAL, parse_western_digital
-from .parsers.monoprice import ATTR_MONOPRICE, EMAIL_DOMAIN_MONOPRICE, parse_monoprice
-from .parsers.georgia_power import ATTR_GEORGIA_POWER, EMAIL_DOMAIN_GEORGIA_POWER, parse_georgia_power
-from .parsers.best_buy import ATTR_BEST_BUY, EMAIL_DOMAIN_BEST_BUY, parse_best_buy
-from .parsers.dollar_shave_club import ATTR_DOLLAR_SHAVE_CLUB, EMAIL_DOMAIN_DOLLAR_SHAVE_CLUB, parse_dollar_shave_club
-from .parsers.nuleaf import ATTR_NULEAF, EMAIL_DOMAIN_NULEAF, parse_nuleaf
-from .parsers.timeless import ATTR_TIMELESS, EMAIL_DOMAIN_TIMLESS, parse_timeless
-from .parsers.dsw import ATTR_DSW, EMAIL_DOMAIN_DSW, parse_dsw
-from .parsers.wyze import ATTR_WYZE, EMAIL_DOMAIN_WYZE, parse_wyze
-from .parsers.reolink import ATTR_REOLINK, EMAIL_DOMAIN_REOLINK, parse_reolink
-from .parsers.chewy import ATTR_CHEWY, EMAIL_DOMAIN_CHEWY, parse_chewy
-from .parsers.groupon import ATTR_GROUPON, EMAIL_DOMAIN_GROUPON, parse_groupon
-from .parsers.zazzle import ATTR_ZAZZLE, EMAIL_DOMAIN_ZAZZLE, parse_zazzle
-from .parsers.home_depot import ATTR_HOME_DEPOT, EMAIL_DOMAIN_HOME_DEPOT, parse_home_depot
-from .parsers.house_of_noa import ATTR_HOUSE_OF_NOA, EMAIL_DOMAIN_HOUSE_OF_NOA, parse_house_of_noa
-from .parsers.swiss_post import ATTR_SWISS_POST, EMAIL_DOMAIN_SWISS_POST, parse_swiss_post
-from .parsers.canada_post import ATTR_CANADA_POST, EMAIL_DOMAIN_CANADA_POST, parse_canada_post
-from .parsers.bespoke_post import ATTR_DSW as ATTR_BESPOKE, EMAIL_DOMAIN_DSW as EMAIL_DOMAIN_BESPOKE, parse_bespoke_post
-from .parsers.manta_sleep import ATTR_MANTA_SLEEP, EMAIL_DOMAIN_MANTA_SLEEP, parse_manta_sleep
-from .parsers.prusa import ATTR_PRUSA, EMAIL_DOMAIN_PRUSA, parse_prusa
-from .parsers.adam_eve import ATTR_ADAM_AND_EVE, EMAIL_DOMAIN_ADAM_AND_EVE, parse_adam_and_eve
-from .parsers.target import ATTR_TARGET, EMAIL_DOMAIN_TARGET, parse_target
-from .parsers.gamestop import ATTR_GAMESTOP, EMAIL_DOMAIN_GAMESTOP, parse_gamestop
-from .parsers.litter_robot import ATTR_LITTER_ROBOT, EMAIL_DOMAIN_LITTER_ROBOT, parse_litter_robot
-from .parsers.the_smartest_house import ATTR_SMARTEST_HOUSE, EMAIL_DOMAIN_SMARTEST_HOUSE, parse_smartest_house
-from .parsers.ubiquiti import ATTR_UBIQUITI, EMAIL_DOMAIN_UBIQUITI, parse_ubiquiti
-from .parsers.nintendo import ATTR_NINTENDO, EMAIL_DOMAIN_NINTENDO, parse_nintendo
-from .parsers.pledgebox import ATTR_PLEDGEBOX, EMAIL_DOMAIN_PLEDGEBOX, parse_pledgebox
-from .parsers.guitar_center import ATTR_GUITAR_CENTER, EMAIL_DOMAIN_GUITAR_CENTER, parse_guitar_center
-from .parsers.sony import ATTR_SONY, EMAIL_DOMAIN_SONY, parse_sony
-from .parsers.sylvane import ATTR_SYLVANE, EMAIL_DOMAIN_SYLVANE, parse_sylvane
-from .parsers.loog_guitars import ATTR_LOOG_GUITARS, EMAIL_DOMAIN_LOOG_GUITARS, parse_loog_guitars
-from .parsers.adafruit import ATTR_ADAFRUIT, EMAIL_DOMAIN_ADAFRUIT, parse_adafruit
-from .parsers.thriftbooks import ATTR_THRIFT_BOOKS, EMAIL_DOMAIN_THRIFT_BOOKS, parse_thrift_books
-from .parsers.etsy import ATTR_ETSY, EMAIL_DOMAIN_ETSY, parse_etsy
-from .parsers.moen import ATTR_MOEN, EMAIL_DOMAIN_MOEN, parse_moen
-from .parsers.lowes import ATTR_LOWES, EMAIL_DOMAIN_LOWES, parse_lowes
-from .parsers.wayfair import ATTR_WAYFAIR, EMAIL_DOMAIN_WAYFAIR, parse_wayfair
-from .parsers.switchbot import ATTR_SWITCHBOT, EMAIL_DOMAIN_SWITCHBOT, parse_switchbot
-from .parsers.mixbook import ATTR_MIXBOOK, EMAIL_DOMAIN_MIXBOOK, parse_mixbook
-from .parsers.costway import ATTR_COSTWAY, EMAIL_DOMAIN_COSTWAY, parse_costway
-from .parsers.walmart import ATTR_WALMART, EMAIL_DOMAIN_WALMART, parse_walmart
-from .parsers.giri_designs import ATTR_GIRI_DESIGNS, EMAIL_DOMAIN_GIRI_DESIGNS, parse_giri_designs
-from .parsers.cradlewise import ATTR_CRADLEWISE, EMAIL_DOMAIN_CRADLEWISE, parse_cradlewise
-from .parsers.inovelli import ATTR_INOVELLI, EMAIL_DOMAIN_INOVELLI, parse_inovelli
-from .parsers.generic import ATTR_GENERIC, EMAIL_DOMAIN_GENERIC, parse_generic
+from .budget import ParserBudget
+from .classifier import classify, confidence_for
+from .dispatch import EmailDispatcher
+from .rule_engine import compile_rules
+from .parsers.retailer_rules import RETAILER_RULES
+from .registry import ParserRegistry, ParserSpec
+
+# Parser modules are described here and imported on first use (registry.py),
+# so Home Assistant startup doesn't pay for modules no email ever reaches.
+PARSER_SPECS = [
+    ParserSpec('amazon', 'amazon.com', 'amazon', 'parse_amazon', subject_include=r'Your (AmazonSmile|Amazon\.com) order #.* has shipped|^Shipped:'),
+    ParserSpec('amazon_de', 'amazon.de', 'amazon_de', 'parse_amazon_de'),
+    ParserSpec('fedex', 'fedex.com', 'fedex', 'parse_fedex', representation=REPRESENTATION_TEXT),
+    ParserSpec('ali_express', 'aliexpress.com', 'ali_express', 'parse_ali_express'),
+    ParserSpec('newegg', 'newegg.com', 'newegg', 'parse_newegg'),
+    ParserSpec('ebay', 'ebay.com', 'ebay', 'parse_ebay'),
+    ParserSpec('google_express', 'google.com', 'google_express', 'parse_google_express'),
+    ParserSpec('georgia_power', 'southernco.com', 'georgia_power', 'parse_georgia_power'),
+    ParserSpec('dollar_shave_club', 'dollarshaveclub.com', 'dollar_shave_club', 'parse_dollar_shave_club'),
+    ParserSpec('DSW', 'dsw.com', 'dsw', 'parse_dsw'),
+    ParserSpec('chewy', 'chewy.com', 'chewy', 'parse_chewy'),
+    ParserSpec('home_depot', 'homedepot.com', 'home_depot', 'parse_home_depot'),
+    ParserSpec('house_of_noa', 'House of Noa', 'house_of_noa', 'parse_house_of_noa'),
+    ParserSpec('canada_post', 'canadapost', 'canada_post', 'parse_canada_post', representation=REPRESENTATION_TEXT),
+    ParserSpec('adam_and_eve', 'adamandeve.com', 'adam_eve', 'parse_adam_and_eve'),
+    ParserSpec('target', 'target.com', 'target', 'parse_target'),
+    ParserSpec('litter_robot', 'litter-robot.com', 'litter_robot', 'parse_litter_robot'),
+    ParserSpec('smartesthouse', 'thesmartesthouse.com', 'the_smartest_house', 'parse_smartest_house'),
+    ParserSpec('ubiquiti', 'ui.com', 'ubiquiti', 'parse_ubiquiti', subject_include=r'A shipment from order #.*? is on the way|Order [A-Z]{2}\d+ (confirmed|shipped)', platform=PLATFORM_SHOPIFY),
+    ParserSpec('pledgebox', 'pledgebox.com', 'pledgebox', 'parse_pledgebox'),
+    ParserSpec('guitar_center', 'guitarcenter.com', 'guitar_center', 'parse_guitar_center'),
+    ParserSpec('loog_guitars', 'loogguitars.com', 'loog_guitars', 'parse_loog_guitars', platform=PLATFORM_SHOPIFY),
+    ParserSpec('thrift_books', 'thriftbooks', 'thriftbooks', 'parse_thrift_books', platform=PLATFORM_NARVAR),
+    ParserSpec('etsy', 'account.etsy.com', 'etsy', 'parse_etsy'),
+    ParserSpec('moen', 'moen.com', 'moen', 'parse_moen', subject_include=r'(?i)order\s*\d+'),
+    ParserSpec('lowes', 'lowes.com', 'lowes', 'parse_lowes', subject_include=r'#\d+', platform=PLATFORM_NARVAR),
+    ParserSpec('wayfair', 'wayfair.com', 'wayfair', 'parse_wayfair', subject_include=r'(?i)track your package|your order is on the way|has shipped'),
+    ParserSpec('switchbot', 'switch-bot.com', 'switchbot', 'parse_switchbot'),
+    ParserSpec('mixbook', 'mixbook.com', 'mixbook', 'parse_mixbook'),
+    ParserSpec('costway', 'costway.com', 'costway', 'parse_costway'),
+    ParserSpec('giri_designs', 'giridesigns.com', 'giri_designs', 'parse_giri_designs', platform=PLATFORM_SHOPIFY),
+    ParserSpec('cradlewise', 'cradlewise.com', 'cradlewise', 'parse_cradlewise', platform=PLATFORM_SHOPIFY),
+    ParserSpec('inovelli', 'inovelli.com', 'inovelli', 'parse_inovelli', platform=PLATFORM_SHOPIFY),
+    # Platform family extractors: chosen by platform fingerprint, not sender.
+    ParserSpec('shopify', '', 'platform_families', 'parse_shopify', platform=PLATFORM_SHOPIFY, family=True),
+    ParserSpec('narvar', '', 'platform_families', 'parse_narvar', platform=PLATFORM_NARVAR, family=True),
+    ParserSpec('aftership', '', 'platform_families', 'parse_aftership', platform=PLATFORM_AFTERSHIP, family=True),
+    ParserSpec('route', '', 'platform_families', 'parse_route', platform=PLATFORM_ROUTE, family=True),
+    ParserSpec('generic', '', 'generic', 'parse_generic', representation=REPRESENTATION_TEXT),
+]
 
 _LOGGER = logging.getLogger(__name__)
 
+# Retailers described as data (parsers/retailer_rules.py), compiled once.
+rule_matcher = compile_rules(RETAILER_RULES)
+parser_registry = ParserRegistry(PARSER_SPECS)
+
 # Parsers list - used by coordinator and sensor
 parsers = [
-    (ATTR_UPS, EMAIL_DOMAIN_UPS, parse_ups),
-    (ATTR_FEDEX, EMAIL_DOMAIN_FEDEX, parse_fedex),
-    (ATTR_AMAZON, EMAIL_DOMAIN_AMAZON, parse_amazon),
-    (ATTR_AMAZON_DE, EMAIL_DOMAIN_AMAZON_DE, parse_amazon_de),
-    (ATTR_PAYPAL, EMAIL_DOMAIN_PAYPAL, parse_paypal),
-    (ATTR_USPS, EMAIL_DOMAIN_USPS, parse_usps),
-    (ATTR_ALI_EXPRESS, EMAIL_DOMAIN_ALI_EXPRESS, parse_ali_express),
-    (ATTR_NEWEGG, EMAIL_DOMAIN_NEWEGG, parse_newegg),
-    (ATTR_ROCKAUTO, EMAIL_DOMAIN_ROCKAUTO, parse_rockauto),
-    (ATTR_BH_PHOTO, EMAIL_DOMAIN_BH_PHOTO, parse_bh_photo),
-    (ATTR_EBAY, EMAIL_DOMAIN_EBAY, parse_ebay),
-    (ATTR_DHL, EMAIL_DOMAIN_DHL, parse_dhl),
-    (ATTR_HUE, EMAIL_DOMAIN_HUE, parse_hue),
-    (ATTR_GOOGLE_EXPRESS, EMAIL_DOMAIN_GOOGLE_EXPRESS, parse_google_express),
-    (ATTR_WESTERN_DIGITAL, EMAIL_DOMAIN_WESTERN_DIGITAL, parse_western_digital),
-    (ATTR_MONOPRICE, EMAIL_DOMAIN_MONOPRICE, parse_monoprice),
-    (ATTR_GEORGIA_POWER, EMAIL_DOMAIN_GEORGIA_POWER, parse_georgia_power),
-    (ATTR_BEST_BUY, EMAIL_DOMAIN_BEST_BUY, parse_best_buy),
-    (ATTR_DOLLAR_SHAVE_CLUB, EMAIL_DOMAIN_DOLLAR_SHAVE_CLUB, parse_dollar_shave_club),
-    (ATTR_NULEAF, EMAIL_DOMAIN_NULEAF, parse_nuleaf),
-    (ATTR_TIMELESS, EMAIL_DOMAIN_TIMLESS, parse_timeless),
-    (ATTR_DSW, EMAIL_DOMAIN_DSW, parse_dsw),
-    (ATTR_WYZE, EMAIL_DOMAIN_WYZE, parse_wyze),
-    (ATTR_REOLINK, EMAIL_DOMAIN_REOLINK, parse_reolink),
-    (ATTR_CHEWY, EMAIL_DOMAIN_CHEWY, parse_chewy),
-    (ATTR_GROUPON, EMAIL_DOMAIN_GROUPON, parse_groupon),
-    (ATTR_ZAZZLE, EMAIL_DOMAIN_ZAZZLE, parse_zazzle),
-    (ATTR_HOME_DEPOT, EMAIL_DOMAIN_HOME_DEPOT, parse_home_depot),
-    (ATTR_HOUSE_OF_NOA, EMAIL_DOMAIN_HOUSE_OF_NOA, parse_house_of_noa),
-    (ATTR_SWISS_POST, EMAIL_DOMAIN_SWISS_POST, parse_swiss_post),
-    (ATTR_CANADA_POST, EMAIL_DOMAIN_CANADA_POST, parse_canada_post),
-    (ATTR_BESPOKE, EMAIL_DOMAIN_BESPOKE, parse_bespoke_post),
-    (ATTR_MANTA_SLEEP, EMAIL_DOMAIN_MANTA_SLEEP, parse_manta_sleep),
-    (ATTR_PRUSA, EMAIL_DOMAIN_PRUSA, parse_prusa),
-    (ATTR_ADAM_AND_EVE, EMAIL_DOMAIN_ADAM_AND_EVE, parse_adam_and_eve),
-    (ATTR_TARGET, EMAIL_DOMAIN_TARGET, parse_target),
-    (ATTR_GAMESTOP, EMAIL_DOMAIN_GAMESTOP, parse_gamestop),
-    (ATTR_LITTER_ROBOT, EMAIL_DOMAIN_LITTER_ROBOT, parse_litter_robot),
-    (ATTR_SMARTEST_HOUSE, EMAIL_DOMAIN_SMARTEST_HOUSE, parse_smartest_house),
-    (ATTR_UBIQUITI, EMAIL_DOMAIN_UBIQUITI, parse_ubiquiti),
-    (ATTR_NINTENDO, EMAIL_DOMAIN_NINTENDO, parse_nintendo),
-    (ATTR_PLEDGEBOX, EMAIL_DOMAIN_PLEDGEBOX, parse_pledgebox),
-    (ATTR_GUITAR_CENTER, EMAIL_DOMAIN_GUITAR_CENTER, parse_guitar_center),
-    (ATTR_SONY, EMAIL_DOMAIN_SONY, parse_sony),
-    (ATTR_SYLVANE, EMAIL_DOMAIN_SYLVANE, parse_sylvane),
-    (ATTR_LOOG_GUITARS, EMAIL_DOMAIN_LOOG_GUITARS, parse_loog_guitars),
-    (ATTR_ADAFRUIT, EMAIL_DOMAIN_ADAFRUIT, parse_adafruit),
-    (ATTR_THRIFT_BOOKS, EMAIL_DOMAIN_THRIFT_BOOKS, parse_thrift_books),
-    (ATTR_ETSY, EMAIL_DOMAIN_ETSY, parse_etsy),
-    (ATTR_MOEN, EMAIL_DOMAIN_MOEN, parse_moen),
-    (ATTR_LOWES, EMAIL_DOMAIN_LOWES, parse_lowes),
-    (ATTR_WAYFAIR, EMAIL_DOMAIN_WAYFAIR, parse_wayfair),
-    (ATTR_SWITCHBOT, EMAIL_DOMAIN_SWITCHBOT, parse_switchbot),
-    (ATTR_MIXBOOK, EMAIL_DOMAIN_MIXBOOK, parse_mixbook),
-    (ATTR_COSTWAY, EMAIL_DOMAIN_COSTWAY, parse_costway),
-    (ATTR_WALMART, EMAIL_DOMAIN_WALMART, parse_walmart),
-    (ATTR_GIRI_DESIGNS, EMAIL_DOMAIN_GIRI_DESIGNS, parse_giri_designs),
-    (ATTR_CRADLEWISE, EMAIL_DOMAIN_CRADLEWISE, parse_cradlewise),
-    (ATTR_INOVELLI, EMAIL_DOMAIN_INOVELLI, parse_inovelli),
-    (ATTR_GENERIC, EMAIL_DOMAIN_GENERIC, parse_generic),
+    rule_matcher.entry('ups'),
+    parser_registry.entry('fedex'),
+    parser_registry.entry('amazon'),
+    parser_registry.entry('amazon_de'),
+    rule_matcher.entry('paypal'),
+    rule_matcher.entry('usps'),
+    parser_registry.entry('ali_express'),
+    parser_registry.entry('newegg'),
+    rule_matcher.entry('rockauto'),
+    rule_matcher.entry('bh_photo'),
+    parser_registry.entry('ebay'),
+    rule_matcher.entry('dhl'),
+    rule_matcher.entry('hue'),
+    parser_registry.entry('google_express'),
+    rule_matcher.entry('western_digital'),
+    rule_matcher.entry('monoprice'),
+    parser_registry.entry('georgia_power'),
+    rule_matcher.entry('best_buy'),
+    parser_registry.entry('dollar_shave_club'),
+    rule_matcher.entry('nuleaf'),
+    rule_matcher.entry('timeless'),
+    parser_registry.entry('DSW'),
+    rule_matcher.entry('wyze'),
+    rule_matcher.entry('reolink'),
+    parser_registry.entry('chewy'),
+    rule_matcher.entry('groupon'),
+    rule_matcher.entry('zazzle'),
+    parser_registry.entry('home_depot'),
+    parser_registry.entry('house_of_noa'),
+    rule_matcher.entry('swiss_post'),
+    parser_registry.entry('canada_post'),
+    rule_matcher.entry('BESPOKE_POST'),
+    rule_matcher.entry('manta_sleep'),
+    rule_matcher.entry('prusa'),
+    parser_registry.entry('adam_and_eve'),
+    parser_registry.entry('target'),
+    rule_matcher.entry('gamestop'),
+    parser_registry.entry('litter_robot'),
+    parser_registry.entry('smartesthouse'),
+    parser_registry.entry('ubiquiti'),
+    rule_matcher.entry('nintendo'),
+    parser_registry.entry('pledgebox'),
+    parser_registry.entry('guitar_center'),
+    rule_matcher.entry('sony'),
+    rule_matcher.entry('sylvane'),
+    parser_registry.entry('loog_guitars'),
+    rule_matcher.entry('adafruit'),
+    parser_registry.entry('thrift_books'),
+    parser_registry.entry('etsy'),
+    parser_registry.entry('moen'),
+    parser_registry.entry('lowes'),
+    parser_registry.entry('wayfair'),
+    parser_registry.entry('switchbot'),
+    parser_registry.entry('mixbook'),
+    parser_registry.entry('costway'),
+    rule_matcher.entry('walmart'),
+    parser_registry.entry('giri_designs'),
+    parser_registry.entry('cradlewise'),
+    parser_registry.entry('inovelli'),
+    parser_registry.entry('shopify'),
+    parser_registry.entry('narvar'),
+    parser_registry.entry('aftership'),
+    parser_registry.entry('route'),
+    parser_registry.entry('generic'),
 ]
 
+# Subject gates checked by the dispatcher before a parser reads the body.
+# Parser specs and rules declare theirs with `subject_include`.
+PARSER_SUBJECT_GATES = {
+    **parser_registry.subject_gates(),
+    **rule_matcher.subject_gates(),
+}
+
 
+def build_dispatcher(budget: ParserBudget | None = None) -> EmailDispatcher:
+    """A dispatcher over the registered parsers, with its own counters."""
+    return EmailDispatcher(
+        parsers,
+        rule_matcher,
+        PARSER_SUBJECT_GATES,
+        budget,
+        parser_registry.text_parsers(),
+        platforms=parser_registry.platform_parsers(),
+        families=parser_registry.family_extractors(),
+    )
+
+
+# Carrier senders handled by parser modules; rule-based carriers (UPS, USPS,
+# DHL, Swiss Post) set `carrier` on their results directly.
 EMAIL_DOMAIN_CARRIER_MAP = {
-    EMAIL_DOMAIN_UPS: 'UPS',
-    EMAIL_DOMAIN_FEDEX: 'FedEx',
-    EMAIL_DOMAIN_USPS: 'USPS',
-    EMAIL_DOMAIN_DHL: 'DHL',
-    EMAIL_DOMAIN_SWISS_POST: 'Swiss Post',
-    EMAIL_DOMAIN_CANADA_POST: 'Canada Post',
+    parser_registry.specs['fedex'].email_domain: 'FedEx',
+    parser_registry.specs['canada_post'].email_domain: 'Canada Post',
 }
 
 
@@ -168,27 +186,65 @@ def retailer_display_name(attr: str) -> str:
     return key.replace('_', ' ').replace('-', ' ').title()
 
 
-def _carrier_from_link(link: str | None) -> str | None:
-    """Infer carrier from tracking link."""
+def _build_carrier_link_index(
+    hints: dict[str, tuple[str, ...]]
+) -> tuple[dict[str, str], re.Pattern, dict[str, str]]:
+    """Host-suffix map, hint regex and hint -> carrier map from CARRIER_LINK_HINTS.
+
+    Hints that look like domains go into the host map; every hint also goes
+    into the regex, which catches carrier URLs wrapped inside click-tracking
+    redirects and path-only hints such as ``track-reperage``. Domain hints
+    must start at a label boundary so ``groups.com`` isn't UPS.
+    """
+    hosts: dict[str, str] = {}
+    by_hint: dict[str, str] = {}
+    alternatives: dict[str, str] = {}
+    for carrier, carrier_hints in hints.items():
+        for hint in carrier_hints:
+            hint = (hint or '').lower()
+            if not hint or hint in by_hint:
+                continue
+            by_hint[hint] = carrier
+            if '.' in hint:
+                hosts[hint] = carrier
+                alternatives[hint] = rf'(?<![a-z0-9-]){re.escape(hint)}'
+            else:
+                alternatives[hint] = re.escape(hint)
+    # Longest first, so `postalpro.usps.com` wins over `usps.com`.
+    ordered = sorted(alternatives, key=len, reverse=True)
+    pattern = re.compile('|'.join(alternatives[hint] for hint in ordered))
+    return hosts, pattern, by_hint
+
+
+_CARRIER_HOSTS, _CARRIER_HINT_RE, _CARRIER_BY_HINT = _build_carrier_link_index(CARRIER_LINK_HINTS)
+
+
+@lru_cache(maxsize=1024)
+def carrier_from_link(link: str | None) -> str | None:
+    """Infer carrier from tracking link.
+
+    The link's host is looked up by suffix first; otherwise one regex search
+    over the decoded link finds any hint. Results are cached since the same
+    tracking URLs come back every cycle.
+    """
     if not link:
         return None
-    link_str = str(link).strip()
-    if not link_str:
+    lower_link = str(link).strip().lower()
+    if not lower_link:
         return None
 
-    lower_link = link_str.lower()
-    parsed = urlparse(lower_link if lower_link.startswith(('http://', 'https://')) else f'https://{lower_link}')
-    for carrier, hints in CARRIER_LINK_HINTS.items():
-        for hint in hints:
-            if not hint:
-                continue
-            if hint in lower_link:
-                return carrier
-            if parsed.netloc and hint in parsed.netloc:
-                return carrier
-            if parsed.path and hint in parsed.path:
-                return carrier
-    return None
+    try:
+        host = urlsplit(lower_link if '//' in lower_link else f'//{lower_link}').hostname or ''
+    except ValueError:
+        host = ''
+    labels = host.split('.')
+    for index in range(len(labels) - 1):
+        carrier = _CARRIER_HOSTS.get('.'.join(labels[index:]))
+        if carrier:
+            return carrier
+
+    match = _CARRIER_HINT_RE.search(unquote(lower_link))
+    return _CARRIER_BY_HINT[match.group()] if match else None
 
 
 def _tracking_link_for(carrier: str, tracking_number: str) -> str:
@@ -212,30 +268,22 @@ def find_carrier(tracking_group, email_domain):
     if tracking_lower.startswith('http://') or tracking_lower.startswith('https://'):
         link = tracking_number
         if not carrier:
-            carrier = _carrier_from_link(link)
+            carrier = carrier_from_link(link)
 
     if not carrier and link:
-        carrier = _carrier_from_link(link)
+        carrier = carrier_from_link(link)
 
     if not carrier:
         carrier = EMAIL_DOMAIN_CARRIER_MAP.get(email_domain)
 
     if not carrier and not tracking_lower.startswith('http'):
-        if re.search(usps_regex, tracking_upper):
-            carrier = 'USPS'
-        elif re.search(ups_regex, tracking_upper):
-            carrier = 'UPS'
-        elif re.search(fedex_regex, tracking_upper):
-            carrier = 'FedEx'
-
-    if not carrier and tracking_upper.isdigit():
-        length = len(tracking_upper)
-        if length in (12, 15, 20):
-            carrier = 'FedEx'
-        elif length in (22, 30):
-            carrier = 'USPS'
-        elif length >= 26:
-            carrier = 'DHL'
+        # Format plus check digit. Ambiguous digit runs that fail validation get
+        # no carrier; distinctive formats keep theirs with a low confidence.
+        carrier = classify(tracking_upper).carrier
+
+    # How far status lookups can trust the carrier, before falling back to
+    # the sender (which never maps to a carrier client).
+    carrier_confidence = confidence_for(tracking_number, carrier)
 
     if not carrier:
         carrier = email_domain or 'Unknown'
@@ -251,4 +299,5 @@ def find_carrier(tracking_group, email_domain):
         'carrier': tracking_group.get('carrier') or carrier,
         'origin': tracking_group.get('origin') or email_domain or carrier,
         'link': final_link,
+        'carrier_confidence': carrier_confidence,
     }
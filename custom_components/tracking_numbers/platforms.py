@@ -0,0 +1,94 @@
+"""E-commerce platform fingerprinting for Tracking Numbers.
+
+Many stores don't write their own shipment emails: Shopify renders them from
+one template, and Narvar, AfterShip and Route send them on a store's behalf
+with links to their own tracking pages. Recognizing the platform lets the
+dispatcher hand such an email to one family extractor
+(``parsers/platform_families.py``) instead of a parser per store, so any
+store on those platforms is handled without a bespoke module.
+
+Detection never decodes the body. Platform headers (``X-Shopify-*`` and
+friends) are checked first, then the hosts in ``List-Unsubscribe``, then
+substring searches of the undecoded body for the platforms' link hosts and
+Shopify's ``/_t/c/`` click-tracking redirects.
+"""
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from .const import EMAIL_ATTR_BODY, PLATFORM_HEADER_PREFIXES, PLATFORM_HOSTS, PLATFORM_SHOPIFY
+from .ingest import EmailRecord
+
+# Host names inside a List-Unsubscribe value (`<https://host/...>`, `<mailto:x@host>`).
+_HEADER_HOST_RE = re.compile(r'(?://|@)([\w.-]+)')
+# Shopify notification links go through `https://<store>/<shop id>/_t/c/v3/...`.
+_SHOPIFY_REDIRECT = '/_t/c/'
+
+
+def _host_re(host: str) -> re.Pattern:
+    """`host` at a label boundary, so ``reroute.com`` isn't Route."""
+    return re.compile(rf'(?<![\w-]){re.escape(host)}(?![\w-])')
+
+
+_BODY_MARKERS = [
+    (platform, host, _host_re(host))
+    for platform, hosts in PLATFORM_HOSTS.items()
+    for host in hosts
+]
+
+
+def _host_platform(host: str) -> str | None:
+    host = host.lower().rstrip('.')
+    for platform, hosts in PLATFORM_HOSTS.items():
+        if any(host == known or host.endswith(f'.{known}') for known in hosts):
+            return platform
+    return None
+
+
+def _from_headers(headers: dict[str, Any]) -> str | None:
+    for name in headers:
+        for prefix, platform in PLATFORM_HEADER_PREFIXES.items():
+            if name.startswith(prefix):
+                return platform
+    unsubscribe = headers.get('list-unsubscribe')
+    if unsubscribe:
+        for host in _HEADER_HOST_RE.findall(str(unsubscribe)):
+            platform = _host_platform(host)
+            if platform:
+                return platform
+    return None
+
+
+def _from_body(body: str | bytes | None) -> str | None:
+    if not body:
+        return None
+    if isinstance(body, bytes):
+        # Host names are ASCII; latin-1 maps every byte without failing.
+        body = body.decode('latin-1')
+    for platform, host, pattern in _BODY_MARKERS:
+        if host in body and pattern.search(body):
+            return platform
+    if _SHOPIFY_REDIRECT in body:
+        return PLATFORM_SHOPIFY
+    return None
+
+
+def detect_platform(email: dict[str, Any]) -> str | None:
+    """The e-commerce platform that sent `email`, or None.
+
+    Cached on the :class:`~.ingest.EmailRecord`, so the dispatcher and the
+    family extractor share one check.
+    """
+    platform = getattr(email, 'platform', None)
+    if platform is not None:
+        return platform or None
+    platform = _from_headers(getattr(email, 'headers', None) or {})
+    if platform is None:
+        body = getattr(email, 'raw_body', None)
+        if body is None:
+            body = email.get(EMAIL_ATTR_BODY)
+        platform = _from_body(body)
+    if isinstance(email, EmailRecord):
+        email.platform = platform or ''
+    return platform
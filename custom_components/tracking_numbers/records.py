@@ -0,0 +1,279 @@
+"""Compact package records for Tracking Numbers.
+
+The mailbox history used to be held as one dict per package: about a dozen
+string keys, ISO timestamps that were parsed again every time a package was
+merged, and the same carrier and retailer names repeated in every entry.
+:class:`PackageRecord` is a slotted record for the same data. Carrier and
+retailer names and codes are interned, a link that ends in the tracking
+number keeps only its (interned) prefix, and ``first_seen`` /
+``last_updated`` are integer epoch seconds (naive UTC, as
+:func:`normalize_datetime` stores them).
+
+Records answer ``record['key']``, ``record.get()`` and item assignment with
+the dict shape the rest of the integration uses, so link resolution and
+status lookups work on them unchanged. They become plain dicts only for the
+sensor (:func:`as_dict`) and the store (:func:`records_to_store`).
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from sys import intern
+from typing import Any, Mapping
+
+_EPOCH = datetime(1970, 1, 1)
+_SECOND = timedelta(seconds=1)
+
+# Fields every package has, in the order the sensor lists them.
+CORE_FIELDS = (
+    'tracking_number',
+    'carrier',
+    'origin',
+    'link',
+    'carrier_confidence',
+    'first_seen',
+    'last_updated',
+    'retailer',
+    'retailer_code',
+    'carrier_code',
+)
+_CORE = frozenset(CORE_FIELDS)
+_INTERNED = frozenset({'carrier', 'origin', 'retailer', 'retailer_code', 'carrier_code'})
+_TIMES = frozenset({'first_seen', 'last_updated'})
+
+
+def normalize_datetime(dt: datetime | None) -> datetime | None:
+    """Normalize datetimes to naive UTC for consistent storage."""
+    if dt is None:
+        return None
+    if dt.tzinfo is not None:
+        return dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def parse_iso_datetime(value: str | None) -> datetime | None:
+    """Parse isoformat strings (with optional Z suffix) into naive UTC datetimes."""
+    if not value:
+        return None
+
+    if value.endswith('Z'):
+        value = value.replace('Z', '+00:00')
+
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+    return normalize_datetime(parsed)
+
+
+def to_epoch(value: str | datetime | None) -> int | None:
+    """Epoch seconds of an ISO timestamp or datetime; None when unparsable.
+
+    Naive values are taken as UTC, like :func:`normalize_datetime` leaves them.
+    """
+    if isinstance(value, str):
+        dt = parse_iso_datetime(value) if value.endswith('Z') else None
+        if dt is None:
+            try:
+                dt = datetime.fromisoformat(value)
+            except ValueError:
+                return None
+    elif isinstance(value, datetime):
+        dt = value
+    else:
+        return None
+    if dt.tzinfo is not None:
+        return int(dt.timestamp())
+    return (dt - _EPOCH) // _SECOND
+
+
+@lru_cache(maxsize=4096)
+def _iso(epoch: int) -> str:
+    return (_EPOCH + timedelta(seconds=epoch)).isoformat()
+
+
+def to_iso(epoch: int | None) -> str | None:
+    """Naive UTC ISO timestamp of epoch seconds."""
+    if epoch is None:
+        return None
+    return _iso(epoch)
+
+
+def _intern(value: Any) -> Any:
+    return intern(value) if type(value) is str else value
+
+
+def _epoch(value: Any) -> int | None:
+    return value if value is None or type(value) is int else to_epoch(value)
+
+
+class PackageRecord:
+    """One package, stored compactly; reads and writes like the package dict.
+
+    Keys outside :data:`CORE_FIELDS` (status fields, ``order_number``,
+    ``estimated_delivery``...) live in :attr:`extra`. A core field that is
+    None counts as absent.
+    """
+
+    __slots__ = (
+        'tracking_number',
+        'carrier',
+        'origin',
+        '_link',
+        '_link_ends_with_number',
+        'carrier_confidence',
+        'first_seen',
+        'last_updated',
+        'retailer',
+        'retailer_code',
+        'carrier_code',
+        'extra',
+    )
+
+    def __init__(self, fields: Mapping[str, Any] | None = None) -> None:
+        fields = fields or {}
+        get = fields.get
+        self.tracking_number: str | None = get('tracking_number')
+        self.carrier: str | None = _intern(get('carrier'))
+        self.origin: str | None = _intern(get('origin'))
+        self.link = get('link')
+        self.carrier_confidence: float | None = get('carrier_confidence')
+        self.first_seen: int | None = _epoch(get('first_seen'))
+        self.last_updated: int | None = _epoch(get('last_updated'))
+        self.retailer: str | None = _intern(get('retailer'))
+        self.retailer_code: str | None = _intern(get('retailer_code'))
+        self.carrier_code: str | None = _intern(get('carrier_code'))
+        self.extra: dict[str, Any] | None = None
+        if not _CORE.issuperset(fields):
+            self.extra = {key: value for key, value in fields.items() if key not in _CORE}
+
+    @classmethod
+    def create(
+        cls,
+        tracking_number: str,
+        carrier: str,
+        origin: str | None,
+        link: str | None,
+        carrier_confidence: float | None,
+        first_seen: int | None,
+        last_updated: int | None,
+        retailer: str | None,
+        retailer_code: str | None,
+        carrier_code: str | None,
+        extra: dict[str, Any] | None = None,
+    ) -> PackageRecord:
+        """A record from its fields, timestamps already in epoch seconds."""
+        record = cls.__new__(cls)
+        record.tracking_number = tracking_number
+        record.carrier = _intern(carrier)
+        record.origin = _intern(origin)
+        record.link = link
+        record.carrier_confidence = carrier_confidence
+        record.first_seen = first_seen
+        record.last_updated = last_updated
+        record.retailer = _intern(retailer)
+        record.retailer_code = _intern(retailer_code)
+        record.carrier_code = _intern(carrier_code)
+        record.extra = extra
+        return record
+
+    @property
+    def link(self) -> str | None:
+        if self._link_ends_with_number:
+            return self._link + self.tracking_number
+        return self._link
+
+    @link.setter
+    def link(self, value: str | None) -> None:
+        number = self.tracking_number
+        if value and number and value.endswith(number) and len(value) > len(number):
+            self._link = intern(value[:-len(number)])
+            self._link_ends_with_number = True
+        else:
+            self._link = value
+            self._link_ends_with_number = False
+
+    def _core(self, key: str) -> Any:
+        if key in _TIMES:
+            return to_iso(getattr(self, key))
+        if key == 'link':
+            return self.link
+        return getattr(self, key)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _CORE:
+            value = self._core(key)
+            if value is None:
+                raise KeyError(key)
+            return value
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _TIMES:
+            setattr(self, key, _epoch(value))
+        elif key == 'link':
+            self.link = value
+        elif key == 'tracking_number':
+            link = self.link
+            self.tracking_number = value
+            self.link = link
+        elif key in _INTERNED:
+            setattr(self, key, _intern(value))
+        elif key in _CORE:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key: object) -> bool:
+        if key in _CORE:
+            return self._core(key) is not None
+        return bool(self.extra) and key in self.extra
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> dict[str, Any]:
+        """The package as the sensor and the store see it."""
+        pkg = {
+            'tracking_number': self.tracking_number,
+            'carrier': self.carrier,
+            'origin': self.origin,
+            'link': self.link,
+            'carrier_confidence': self.carrier_confidence,
+            'first_seen': to_iso(self.first_seen),
+            'last_updated': to_iso(self.last_updated),
+            'retailer': self.retailer,
+            'retailer_code': self.retailer_code,
+            'carrier_code': self.carrier_code,
+        }
+        if None in pkg.values():
+            pkg = {key: value for key, value in pkg.items() if value is not None}
+        if self.extra:
+            pkg.update(self.extra)
+        return pkg
+
+    def __repr__(self) -> str:
+        return f"PackageRecord({self.to_dict()!r})"
+
+
+def as_dict(pkg: PackageRecord | dict[str, Any]) -> dict[str, Any]:
+    """`pkg` as a plain dict (manual packages already are)."""
+    return pkg.to_dict() if isinstance(pkg, PackageRecord) else pkg
+
+
+def records_from_store(stored: dict[str, dict[str, Any]]) -> dict[str, PackageRecord]:
+    """Decode the stored packages shard; timestamps are parsed here, once."""
+    return {number: PackageRecord(pkg) for number, pkg in (stored or {}).items()}
+
+
+def records_to_store(records: dict[str, PackageRecord]) -> dict[str, dict[str, Any]]:
+    """Encode the packages shard for the store."""
+    return {number: as_dict(pkg) for number, pkg in records.items()}
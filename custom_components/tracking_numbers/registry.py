@@ -0,0 +1,162 @@
+"""Lazy parser registry for Tracking Numbers.
+
+Importing every parser module up front drags BeautifulSoup and dozens of
+modules into Home Assistant startup, even though a typical mailbox only ever
+sees mail from a handful of retailers. The registry keeps just the metadata
+each parser needs to be selected (slug, sender match, subject gate, module
+path) and imports the module the first time an email actually reaches it.
+
+Entries keep the ``(ATTR, EMAIL_DOMAIN, parser)`` tuple shape, so the
+dispatcher and coordinator don't care whether a parser has been loaded yet.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import importlib
+import logging
+import time
+from typing import Any, Callable
+
+from .const import REPRESENTATION_HTML, REPRESENTATION_TEXT
+from .dispatch import SubjectGate
+
+_LOGGER = logging.getLogger(__name__)
+
+_PARSERS_PACKAGE = f'{__package__}.parsers'
+
+
+@dataclass(frozen=True)
+class ParserSpec:
+    """Import-free description of one parser module.
+
+    `module` is the module name inside ``parsers/`` and `function` its parse
+    entry point. `version` is bumped whenever the parser's output changes in
+    a way cached results should notice. `representation` says which part of
+    the email the parser reads: ``REPRESENTATION_TEXT`` parsers scan the
+    plain part when there is a usable one and must only touch the HTML body
+    when there isn't. `platform` names the e-commerce platform whose
+    template the parser reads; `family` marks that platform's own extractor,
+    which runs on every email detected as coming from it, whatever the sender.
+    """
+
+    attr: str
+    email_domain: str
+    module: str
+    function: str
+    version: int = 1
+    subject_include: str | None = None
+    representation: str = REPRESENTATION_HTML
+    platform: str | None = None
+    family: bool = False
+
+    @property
+    def module_path(self) -> str:
+        """Fully qualified module name."""
+        return f'{_PARSERS_PACKAGE}.{self.module}'
+
+
+class LazyParser:
+    """Callable stand-in that imports its parser module on first call."""
+
+    __slots__ = ('spec', '_parser')
+
+    def __init__(self, spec: ParserSpec) -> None:
+        self.spec = spec
+        self._parser: Callable[..., Any] | None = None
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self.loaded else 'not loaded'
+        return f'<LazyParser {self.spec.module}.{self.spec.function} ({state})>'
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the parser module has been imported."""
+        return self._parser is not None
+
+    def load(self) -> Callable[..., Any]:
+        """Import the parser module (once) and return its parse function."""
+        if self._parser is None:
+            spec = self.spec
+            start = time.perf_counter()
+            module = importlib.import_module(spec.module_path)
+            _check_metadata(spec, module)
+            self._parser = getattr(module, spec.function)
+            _LOGGER.debug(
+                "Loaded parser %s in %.1f ms",
+                spec.module_path,
+                (time.perf_counter() - start) * 1000,
+            )
+        return self._parser
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.load()(*args, **kwargs)
+
+
+def _check_metadata(spec: ParserSpec, module: Any) -> None:
+    """Warn when a module's ATTR_/EMAIL_DOMAIN_ constants drifted from its spec."""
+    names = vars(module)
+    attrs = {value for name, value in names.items() if name.startswith('ATTR_')}
+    domains = {value for name, value in names.items() if name.startswith('EMAIL_DOMAIN_')}
+    if attrs and spec.attr not in attrs:
+        _LOGGER.warning("Parser %s declares ATTR %s, registry has %s", spec.module, attrs, spec.attr)
+    if domains and spec.email_domain not in domains:
+        _LOGGER.warning(
+            "Parser %s declares EMAIL_DOMAIN %s, registry has %s",
+            spec.module,
+            domains,
+            spec.email_domain,
+        )
+
+
+class ParserRegistry:
+    """Specs by slug, each with one shared :class:`LazyParser`."""
+
+    def __init__(self, specs: list[ParserSpec]) -> None:
+        self.specs = {spec.attr: spec for spec in specs}
+        self._parsers = {spec.attr: LazyParser(spec) for spec in specs}
+
+    def __contains__(self, attr: str) -> bool:
+        return attr in self.specs
+
+    def entry(self, attr: str) -> tuple[str, str, LazyParser]:
+        """``(ATTR, EMAIL_DOMAIN, parser)`` tuple for the parsers list."""
+        spec = self.specs[attr]
+        return (spec.attr, spec.email_domain, self._parsers[attr])
+
+    def subject_gates(self) -> dict[str, SubjectGate]:
+        """Subject gates for the specs that declare one."""
+        return {
+            attr: SubjectGate(spec.subject_include)
+            for attr, spec in self.specs.items()
+            if spec.subject_include
+        }
+
+    def text_parsers(self) -> set[str]:
+        """Slugs of the parsers that read the plain-text part."""
+        return {
+            attr for attr, spec in self.specs.items()
+            if spec.representation == REPRESENTATION_TEXT
+        }
+
+    def platform_parsers(self) -> dict[str, str]:
+        """Platform of each store parser that reads a platform template."""
+        return {
+            attr: spec.platform for attr, spec in self.specs.items()
+            if spec.platform and not spec.family
+        }
+
+    def family_extractors(self) -> dict[str, str]:
+        """Platform of each family extractor."""
+        return {
+            attr: spec.platform for attr, spec in self.specs.items()
+            if spec.platform and spec.family
+        }
+
+    def loaded(self) -> list[str]:
+        """Slugs whose module has been imported so far."""
+        return [attr for attr, parser in self._parsers.items() if parser.loaded]
+
+    def load_all(self) -> None:
+        """Import every parser module now (benchmarks, eager startup)."""
+        for parser in self._parsers.values():
+            parser.load()
@@ -0,0 +1,284 @@
+"""Redirect-wrapper resolution for Tracking Numbers.
+
+Some retailers never link to the carrier directly: Walmart sends ``w-mt.co``
+short links, Narvar and the ``spmailtechno`` click tracker bounce through
+their own hosts, and click trackers wrap ui.com links in their query string.
+Carrier detection then only sees the wrapper, falls back to the sender
+domain, and status lookups can't run.
+
+Optional (``CONF_RESOLVE_LINKS``): :class:`LinkResolver` follows links on
+the ``RESOLVER_WRAPPER_HINTS`` hosts with ``HEAD`` requests, a few at a
+time, and the carrier and tracking number are read from the URL the chain
+ends on. Links come from whoever sent the email, so no other host is ever
+requested, and a chain that redirects to a private, loopback or local
+address is abandoned. A carrier URL embedded in a click tracker's link is
+read from the link itself, without a request. Every ``wrapper -> final``
+pair is kept in a bounded cache persisted with the integration's store, so
+each link is followed at most once. Failed requests aren't cached and are
+tried again on a later cycle.
+"""
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+from typing import Any, Callable, Iterable
+from urllib.parse import parse_qs, unquote, urljoin, urlsplit
+
+import aiohttp
+
+from .classifier import confidence_for
+from .const import (
+    RESOLVER_CACHE_SIZE,
+    RESOLVER_CONCURRENCY,
+    RESOLVER_MAX_PER_CYCLE,
+    RESOLVER_MAX_REDIRECTS,
+    RESOLVER_TIMEOUT,
+    RESOLVER_WRAPPER_HINTS,
+    TRACKING_LINK_PARAMS,
+)
+from .parsers_list import carrier_from_link
+
+_LOGGER = logging.getLogger(__name__)
+
+# Servers that refuse HEAD answer one of these; the chain is then followed
+# with GET (the body is never read).
+_HEAD_REFUSED = frozenset({405, 501})
+_REDIRECTS = frozenset({301, 302, 303, 307, 308})
+# Names that only resolve inside the home network.
+_LOCAL_SUFFIXES = ('.localhost', '.local', '.lan', '.home', '.internal', '.home.arpa')
+
+
+def _host(link: str) -> str:
+    """Lower-cased host of an http(s) link; empty when it has none."""
+    if not link.lower().startswith(('http://', 'https://')):
+        return ''
+    try:
+        return (urlsplit(link).hostname or '').lower().rstrip('.')
+    except ValueError:
+        return ''
+
+
+def _is_wrapper_host(host: str, hints: Iterable[str]) -> bool:
+    """Whether `host` is one of the wrapper `hints`.
+
+    A hint with a dot is a domain and matches its subdomains; one without
+    matches any host that has it as a label.
+    """
+    labels = host.split('.')
+    return any(
+        (host == hint or host.endswith(f'.{hint}')) if '.' in hint else hint in labels
+        for hint in hints
+    )
+
+
+def is_public_url(url: str) -> bool:
+    """Whether `url` is http(s) on a host outside the home network.
+
+    IP literals must be global addresses; names must not be local ones.
+    Names are not resolved, so this keeps out links written to reach the
+    LAN, not DNS that points there.
+    """
+    host = _host(url)
+    if not host or '.' not in host and ':' not in host:
+        return False
+    try:
+        return ipaddress.ip_address(host.strip('[]')).is_global
+    except ValueError:
+        return not host.endswith(_LOCAL_SUFFIXES)
+
+
+def embedded_link(link: str | None) -> str | None:
+    """A carrier URL a click tracker carries in `link`'s query or path."""
+    if not link or not _host(link):
+        return None
+    try:
+        split = urlsplit(link)
+        values = [value for values in parse_qs(split.query).values() for value in values]
+    except ValueError:
+        return None
+    # A URL in the path takes the query with it.
+    path = unquote(split.path)
+    start = path.find('http', 1)
+    if start != -1:
+        values.insert(0, path[start:] + (f'?{split.query}' if split.query else ''))
+    for value in values:
+        value = value.strip()
+        if _host(value) and carrier_from_link(value):
+            return value
+    return None
+
+
+def is_wrapped(link: str | None, hints: Iterable[str] = RESOLVER_WRAPPER_HINTS) -> bool:
+    """Whether `link` only leads to the page that matters.
+
+    True for links on a wrapper host and for click tracker links that
+    carry a carrier URL.
+    """
+    if not link:
+        return False
+    host = _host(link)
+    return bool(host) and (_is_wrapper_host(host, hints) or embedded_link(link) is not None)
+
+
+def tracking_from_link(url: str) -> tuple[str, str | None] | None:
+    """``(carrier, tracking number)`` named by a carrier tracking URL.
+
+    The number is None when the URL names the carrier but not the number.
+    None when the URL isn't a carrier's.
+    """
+    carrier = carrier_from_link(url)
+    if not carrier:
+        return None
+    try:
+        query = parse_qs(urlsplit(url).query)
+    except ValueError:
+        return carrier, None
+    for key in TRACKING_LINK_PARAMS:
+        for value in query.get(key, ()):
+            number = value.split(',')[0].strip().upper()
+            if number.isalnum():
+                return carrier, number
+    return carrier, None
+
+
+class LinkResolver:
+    """Follow wrapper links to the end of their redirect chain.
+
+    `session` is any :class:`aiohttp.ClientSession` (Home Assistant's shared
+    one in the coordinator). At most `concurrency` chains are followed at
+    once, each within `timeout` seconds. Every hop must pass `url_allowed`;
+    the default keeps to public addresses, tests pass one that lets a local
+    server through.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        concurrency: int = RESOLVER_CONCURRENCY,
+        timeout: float = RESOLVER_TIMEOUT,
+        max_redirects: int = RESOLVER_MAX_REDIRECTS,
+        url_allowed: Callable[[str], bool] = is_public_url,
+    ) -> None:
+        self._session = session
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._max_redirects = max_redirects
+        self._url_allowed = url_allowed
+
+    async def _next(self, url: str) -> str | None:
+        """Where `url` redirects to; None when the chain ends at it."""
+        for method in ('HEAD', 'GET'):
+            async with self._session.request(
+                method, url, allow_redirects=False, timeout=self._timeout
+            ) as resp:
+                if method == 'HEAD' and resp.status in _HEAD_REFUSED:
+                    continue
+                location = resp.headers.get('Location')
+                if resp.status in _REDIRECTS and location:
+                    return urljoin(url, location)
+                return None
+        return None
+
+    async def _chain(self, url: str) -> str | None:
+        """Follow redirects hop by hop, so every hop's host can be checked."""
+        for _ in range(self._max_redirects + 1):
+            if not self._url_allowed(url):
+                _LOGGER.debug("Not following %s: address not allowed", url)
+                return None
+            location = await self._next(url)
+            if location is None:
+                return url
+            url = location
+        _LOGGER.debug("Gave up on %s after %d redirects", url, self._max_redirects)
+        return None
+
+    async def _follow(self, url: str) -> str | None:
+        """The URL the redirect chain from `url` ends on, or None on failure."""
+        async with self._semaphore:
+            try:
+                return await asyncio.wait_for(self._chain(url), self._timeout.total)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                _LOGGER.debug("Could not follow %s: %s", url, err)
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.warning("Unexpected error following %s: %s", url, err)
+        return None
+
+    async def resolve(
+        self,
+        urls: Iterable[str],
+        cache: dict[str, str],
+        limit: int = RESOLVER_MAX_PER_CYCLE,
+        max_entries: int = RESOLVER_CACHE_SIZE,
+    ) -> dict[str, str]:
+        """Final URLs for `urls`, from `cache` or followed now.
+
+        Carrier URLs embedded in a link are taken as they are. At most
+        `limit` links missing from the cache are followed per call.
+        `cache` is updated in place and trimmed to `max_entries`, oldest
+        first; entries that are read move to the back.
+        """
+        resolved: dict[str, str] = {}
+        missing: list[str] = []
+        for url in dict.fromkeys(urls):
+            embedded = embedded_link(url)
+            if embedded is not None:
+                resolved[url] = embedded
+            elif url in cache:
+                resolved[url] = cache[url] = cache.pop(url)
+            elif len(missing) < limit:
+                missing.append(url)
+
+        if missing:
+            finals = await asyncio.gather(*(self._follow(url) for url in missing))
+            for url, final in zip(missing, finals):
+                if final is None:
+                    continue
+                resolved[url] = cache[url] = final
+                _LOGGER.debug("Resolved %s -> %s", url, final)
+
+        for url in list(cache)[:max(0, len(cache) - max_entries)]:
+            del cache[url]
+        return resolved
+
+
+def apply_resolved(
+    packages: list[dict[str, Any]],
+    resolved: dict[str, str],
+    hidden_numbers: set[str],
+) -> list[dict[str, Any]]:
+    """Point packages whose wrapper resolved to a carrier page at that carrier.
+
+    The link, carrier and confidence are replaced; when the carrier URL names
+    a different tracking number (the email only gave an order number), the
+    package takes it and keeps the old one as ``order_number``. A package
+    whose new number is hidden or already listed is dropped.
+    """
+    listed = {pkg.get('tracking_number') for pkg in packages}
+    result = []
+    for pkg in packages:
+        final = resolved.get(pkg.get('link'))
+        found = tracking_from_link(final) if final else None
+        if found is None:
+            result.append(pkg)
+            continue
+
+        carrier, number = found
+        current = pkg.get('tracking_number')
+        if number and number != current:
+            if number in hidden_numbers or number in listed:
+                continue
+            listed.add(number)
+            pkg['order_number'] = current
+            pkg['tracking_number'] = number
+        pkg['link'] = final
+        pkg['carrier'] = carrier
+        pkg['carrier_code'] = carrier.lower().replace(' ', '_')
+        pkg['carrier_confidence'] = confidence_for(pkg['tracking_number'], carrier)
+        result.append(pkg)
+    return result
+
+
+def wrapped_links(packages: Iterable[dict[str, Any]]) -> list[str]:
+    """Links of `packages` that need resolving."""
+    return [pkg['link'] for pkg in packages if is_wrapped(pkg.get('link'))]
@@ -0,0 +1,267 @@
+"""Declarative retailer rules compiled into per-sender matchers.
+
+Many retailer emails only need the same few steps: match the sender, optionally
+check the subject, pull a query parameter (or the anchor text) out of the
+tracking links, and dedupe. Those retailers are described as plain dicts in
+``parsers/retailer_rules.py`` and compiled here once at import time, so adding
+one is a data change rather than a new parser module.
+
+Rule keys (only ``attr`` and ``sender`` are required):
+
+- ``attr``: parser slug, same role as a parser module's ``ATTR_*``.
+- ``sender``: substring matched against the From header (``EMAIL_DOMAIN_*``).
+- ``subject_include``: regex the subject must match for the rule to run.
+- ``subject_exclude``: regex that skips the rule when the subject matches.
+- ``link_host``: host (or parent domain) a tracking link must live on.
+- ``link_contains``: substring a tracking link's href must contain.
+- ``link_params``: query-parameter keys whose values are tracking numbers.
+- ``link_text``: regex the whole (whitespace-collapsed) anchor text must match.
+  Without ``link_params`` the anchor text itself is the tracking number.
+- ``body_patterns``: regexes (one capture group) scanned over the body.
+- ``value_pattern``: regex a candidate must start with; the match is kept.
+- ``carrier``: carrier name attached to every result.
+- ``keep_link``: attach the matched href as the result's ``link``.
+"""
+from __future__ import annotations
+
+import logging
+import re
+from typing import Any, Callable
+from urllib.parse import unquote
+
+from .const import EMAIL_ATTR_BODY, EMAIL_ATTR_FROM, EMAIL_ATTR_SUBJECT
+from .dispatch import SubjectGate
+from .links import Link, link_index
+
+_LOGGER = logging.getLogger(__name__)
+
+_RULE_KEYS = frozenset({
+    'attr',
+    'sender',
+    'subject_include',
+    'subject_exclude',
+    'link_host',
+    'link_contains',
+    'link_params',
+    'link_text',
+    'body_patterns',
+    'value_pattern',
+    'carrier',
+    'keep_link',
+})
+
+
+class RetailerRule:
+    """A single compiled retailer rule."""
+
+    def __init__(self, rule: dict[str, Any]) -> None:
+        unknown = set(rule) - _RULE_KEYS
+        if unknown:
+            raise ValueError(f"Unknown retailer rule keys {sorted(unknown)} in {rule.get('attr')}")
+        if not rule.get('attr') or 'sender' not in rule:
+            raise ValueError(f"Retailer rule needs 'attr' and 'sender': {rule}")
+
+        self.attr: str = rule['attr']
+        self.sender: str = rule['sender']
+        self.carrier: str | None = rule.get('carrier')
+        self.keep_link: bool = bool(rule.get('keep_link'))
+        self.link_host: str | None = (rule.get('link_host') or '').lower() or None
+        self.link_contains: str | None = rule.get('link_contains')
+        self.link_params: tuple[str, ...] = tuple(rule.get('link_params') or ())
+
+        self.gate: SubjectGate | None = None
+        if rule.get('subject_include') or rule.get('subject_exclude'):
+            self.gate = SubjectGate(rule.get('subject_include'), rule.get('subject_exclude'))
+        self.link_text_re = re.compile(rule['link_text']) if rule.get('link_text') else None
+        self.value_re = re.compile(rule['value_pattern']) if rule.get('value_pattern') else None
+        self.body_res = tuple(re.compile(pattern) for pattern in rule.get('body_patterns') or ())
+
+    @property
+    def uses_links(self) -> bool:
+        """Whether the rule needs the email's anchors at all."""
+        return bool(self.link_params or self.link_text_re or self.link_host or self.link_contains)
+
+    def allows_subject(self, subject: str) -> bool:
+        """Check the rule's subject gate, if any."""
+        return self.gate is None or self.gate.allows(subject)
+
+    def link_filter(self, link: Link) -> tuple[bool, str | None]:
+        """Apply host/substring/anchor-text filters to one link.
+
+        Returns ``(accepted, value_from_text)``; the second element is the
+        anchor-text tracking number for rules without ``link_params``.
+        """
+        if self.link_contains and self.link_contains not in link.href:
+            return False, None
+        if self.link_host and not link.on_host(self.link_host):
+            return False, None
+        if self.link_text_re is None:
+            return True, None
+        match = self.link_text_re.fullmatch(link.inline_text)
+        if not match:
+            return False, None
+        return True, match.group(1) if match.re.groups else match.group(0)
+
+    def clean_value(self, value: str | None) -> str | None:
+        """Normalize a candidate and apply ``value_pattern``."""
+        value = (value or '').strip()
+        if not value:
+            return None
+        if self.value_re is not None:
+            match = self.value_re.match(value)
+            if not match:
+                return None
+            value = match.group(0)
+        return value
+
+    def result(self, value: str, link: str | None) -> dict[str, Any]:
+        """Build a parser result dict."""
+        entry: dict[str, Any] = {'tracking_number': value}
+        if self.keep_link and link:
+            entry['link'] = link
+        if self.carrier:
+            entry['carrier'] = self.carrier
+        return entry
+
+    def parse(self, email: dict[str, Any]) -> list[dict[str, Any]]:
+        """Run this rule alone, like a regular ``parse_*`` function."""
+        return _SenderMatcher([self]).match(email).get(self.attr, [])
+
+
+class _SenderMatcher:
+    """All rules sharing one sender, evaluated in a single pass over the links.
+
+    The query-parameter keys of every rule are folded into one alternation so
+    each href is scanned once regardless of how many keys the sender uses.
+    """
+
+    def __init__(self, rules: list[RetailerRule]) -> None:
+        self.rules = rules
+        self._link_rules = [rule for rule in rules if rule.uses_links]
+        self._rules_by_param: dict[str, list[RetailerRule]] = {}
+        for rule in rules:
+            for key in rule.link_params:
+                self._rules_by_param.setdefault(key, []).append(rule)
+
+        self._param_re = None
+        if self._rules_by_param:
+            keys = '|'.join(re.escape(key) for key in sorted(self._rules_by_param, key=len, reverse=True))
+            self._param_re = re.compile(rf'[?&;#](?P<key>{keys})=(?P<value>[^&#"\'\s<>]*)')
+
+    def match(
+        self,
+        email: dict[str, Any],
+        only: set[str] | frozenset[str] | None = None,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Return ``{attr: [results]}`` for every rule of this sender.
+
+        The email's link index is shared with every other sender and parser
+        matched on it. `only` restricts the run to those slugs.
+        """
+        subject = email.get(EMAIL_ATTR_SUBJECT) or ''
+        body = email.get(EMAIL_ATTR_BODY) or ''
+
+        active = [
+            rule for rule in self.rules
+            if (only is None or rule.attr in only) and rule.allows_subject(subject)
+        ]
+        found: dict[str, list[dict[str, Any]]] = {rule.attr: [] for rule in active}
+        seen: dict[str, set[str]] = {rule.attr: set() for rule in active}
+        if not active or not body:
+            return found
+
+        def _add(rule: RetailerRule, value: str | None, link: str | None = None) -> None:
+            value = rule.clean_value(value)
+            if not value or value in seen[rule.attr]:
+                return
+            seen[rule.attr].add(value)
+            found[rule.attr].append(rule.result(value, link))
+
+        link_rules = [rule for rule in self._link_rules if rule.attr in found]
+        if link_rules:
+            for link in link_index(email).with_href():
+                accepted: set[str] = set()
+                for rule in link_rules:
+                    ok, text_value = rule.link_filter(link)
+                    if not ok:
+                        continue
+                    if rule.link_params:
+                        accepted.add(rule.attr)
+                    else:
+                        _add(rule, text_value, link.href)
+
+                if not accepted or self._param_re is None:
+                    continue
+                for match in self._param_re.finditer(link.href):
+                    for rule in self._rules_by_param[match.group('key')]:
+                        if rule.attr in accepted:
+                            _add(rule, unquote(match.group('value')), link.href)
+
+        for rule in active:
+            for pattern in rule.body_res:
+                for value in pattern.findall(body):
+                    _add(rule, value)
+
+        return found
+
+
+class RuleMatcher:
+    """Every retailer rule, grouped into one combined matcher per sender."""
+
+    def __init__(self, rules: list[dict[str, Any]]) -> None:
+        self._rules: dict[str, RetailerRule] = {}
+        grouped: dict[str, list[RetailerRule]] = {}
+        for raw in rules:
+            rule = RetailerRule(raw)
+            if rule.attr in self._rules:
+                raise ValueError(f"Duplicate retailer rule for {rule.attr}")
+            self._rules[rule.attr] = rule
+            grouped.setdefault(rule.sender, []).append(rule)
+        self._senders = {sender: _SenderMatcher(group) for sender, group in grouped.items()}
+
+    @property
+    def attrs(self) -> frozenset[str]:
+        """Slugs handled by rules rather than parser modules."""
+        return frozenset(self._rules)
+
+    def entry(self, attr: str) -> tuple[str, str, Callable[..., list[dict[str, Any]]]]:
+        """A ``(ATTR, EMAIL_DOMAIN, parser)`` tuple for the parsers list."""
+        rule = self._rules[attr]
+        return rule.attr, rule.sender, rule.parse
+
+    def sender(self, attr: str) -> str:
+        """Sender substring of a rule."""
+        return self._rules[attr].sender
+
+    def subject_gates(self) -> dict[str, SubjectGate]:
+        """Subject gates of the rules that declare one, keyed by slug."""
+        return {attr: rule.gate for attr, rule in self._rules.items() if rule.gate is not None}
+
+    def match(
+        self,
+        email: dict[str, Any],
+        email_from: str | None = None,
+        only: set[str] | frozenset[str] | None = None,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Run every rule whose sender matches, sharing one link scan per email.
+
+        `only` restricts the run to those slugs (the dispatcher passes the
+        rules whose subject gate already passed).
+        """
+        if email_from is None:
+            email_from = email.get(EMAIL_ATTR_FROM) or ''
+        results: dict[str, list[dict[str, Any]]] = {}
+
+        for sender, matcher in self._senders.items():
+            if sender not in email_from:
+                continue
+            try:
+                results.update(matcher.match(email, only))
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.error("Retailer rules for %s error: %s", sender, err)
+        return results
+
+
+def compile_rules(rules: list[dict[str, Any]]) -> RuleMatcher:
+    """Compile declarative retailer rules into a :class:`RuleMatcher`."""
+    return RuleMatcher(rules)
@@ -0,0 +1,135 @@
+"""Sharded persistence for Tracking Numbers.
+
+State used to be one Store document per config entry holding the package
+history, manual entries, the hidden list and every provider cache, so hiding
+one number rewrote all of it. :class:`ShardedStore` keeps each top-level key
+(``STORE_SHARDS``) in its own Store file with its own version; callers mark
+the keys they changed and only those files are written, each on its own
+debounced timer.
+
+A shard can have a codec, ``(decode, encode)``: the value is decoded once
+when loaded and encoded only when written, so it can be held in memory in a
+different shape than the JSON on disk (the packages shard holds
+:class:`~.records.PackageRecord`).
+
+Entries created before sharding are migrated on first load: the single
+document is split into the shards, they are written, and the old file is
+removed.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Any, Callable
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    LEGACY_STORE_KEY_IGNORED,
+    STORE_KEY_HIDDEN_TRACKING_NUMBERS,
+    STORE_SAVE_DELAY,
+    STORE_SHARDS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+Codec = tuple[Callable[[Any], Any], Callable[[Any], Any]]
+
+
+class ShardedStore:
+    """One Store file per top-level key under `key`.
+
+    :attr:`data` is the in-memory state (``{shard key: value}``) once
+    :meth:`async_load` has run; it is what callers read and change.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        key: str,
+        shards: dict[str, int] = STORE_SHARDS,
+        delay: float = STORE_SAVE_DELAY,
+        codecs: dict[str, Codec] | None = None,
+    ) -> None:
+        self._stores = {
+            name: Store(hass, version=version, key=f"{key}.{name}")
+            for name, version in shards.items()
+        }
+        self._legacy = Store(hass, version=1, key=key)
+        self._delay = delay
+        self._codecs = dict(codecs or {})
+        self._dirty: set[str] = set()
+        self.data: dict[str, Any] = {}
+
+    async def async_load(self) -> dict[str, Any]:
+        """Read every shard, migrating the single-file layout when it's all there is."""
+        loaded = await asyncio.gather(*(store.async_load() for store in self._stores.values()))
+        self.data = {
+            name: value
+            for name, value in zip(self._stores, loaded)
+            if value is not None
+        }
+        if not self.data:
+            await self._async_migrate()
+        for name, (decode, _) in self._codecs.items():
+            if name in self.data:
+                self.data[name] = decode(self.data[name])
+        return self.data
+
+    def _encoded(self, name: str) -> Any:
+        value = self.data.get(name)
+        codec = self._codecs.get(name)
+        return codec[1](value) if codec is not None and value is not None else value
+
+    async def _async_migrate(self) -> None:
+        legacy = await self._legacy.async_load()
+        if not legacy:
+            return
+        if LEGACY_STORE_KEY_IGNORED in legacy and STORE_KEY_HIDDEN_TRACKING_NUMBERS not in legacy:
+            legacy[STORE_KEY_HIDDEN_TRACKING_NUMBERS] = legacy[LEGACY_STORE_KEY_IGNORED]
+        self.data = {name: legacy[name] for name in self._stores if name in legacy}
+        await asyncio.gather(
+            *(self._stores[name].async_save(value) for name, value in self.data.items())
+        )
+        await self._legacy.async_remove()
+        _LOGGER.info("Split stored state into %d shards: %s", len(self.data), ", ".join(self.data))
+
+    @callback
+    def async_mark_dirty(self, *names: str) -> None:
+        """Write the `names` shards after the save delay.
+
+        Further changes to a shard within its delay are written by the same
+        save.
+        """
+        for name in names:
+            self._dirty.add(name)
+            self._stores[name].async_delay_save(
+                lambda name=name: self._data_to_save(name), self._delay
+            )
+
+    @callback
+    def _data_to_save(self, name: str) -> Any:
+        """Snapshot of one shard, handed to its Store when the write runs."""
+        self._dirty.discard(name)
+        return self._encoded(name)
+
+    @property
+    def dirty(self) -> frozenset[str]:
+        """Shards with changes not yet written."""
+        return frozenset(self._dirty)
+
+    def sizes(self) -> dict[str, int]:
+        """Approximate serialized size of each shard, in bytes."""
+        return {
+            name: len(json.dumps(self._encoded(name), separators=(',', ':'), default=str))
+            for name in self.data
+        }
+
+    async def async_flush(self) -> None:
+        """Write every dirty shard now (unload, Home Assistant shutdown)."""
+        names = list(self._dirty)
+        await asyncio.gather(
+            *(self._stores[name].async_save(self._data_to_save(name)) for name in names)
+        )
@@ -0,0 +1,200 @@
+"""schema.org parcel-delivery extraction for Tracking Numbers.
+
+Large senders (Amazon, Walmart, Best Buy, eBay, Shopify stores) embed
+schema.org ``ParcelDelivery`` markup in shipping emails so mail clients can
+show a "Track package" button. When it's there it states the tracking
+number, carrier, tracking URL and expected arrival outright, which is more
+reliable than scraping the retailer's layout and cheaper too.
+
+Both encodings are read: JSON-LD ``<script type="application/ld+json">``
+blocks (kept by the ingest pre-pass) and microdata (``itemscope`` /
+``itemprop`` attributes). Bodies that don't contain ``trackingNumber`` are
+rejected with a substring check before anything is parsed.
+"""
+from __future__ import annotations
+
+from html import unescape
+from html.parser import HTMLParser
+import json
+import logging
+import re
+from typing import Any, Iterator
+
+from .const import CARRIER_NAME_ALIASES, EMAIL_ATTR_BODY
+
+_LOGGER = logging.getLogger(__name__)
+
+_MARKER = 'trackingNumber'
+_JSON_LD_RE = re.compile(
+    r'<script\b[^>]*application/ld\+json[^>]*>(.*?)</script\s*>',
+    re.IGNORECASE | re.DOTALL,
+)
+# Elements without an end tag; their itemprop value is always an attribute.
+_VOID_TAGS = frozenset({'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'wbr'})
+
+
+def _carrier_name(value: Any) -> str | None:
+    """Carrier from a ``carrier``/``provider`` value (string or Organization)."""
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        value = value.get('name') or value.get('alternateName')
+    if not isinstance(value, str) or not value.strip():
+        return None
+    name = value.strip()
+    return CARRIER_NAME_ALIASES.get(name.lower().replace('-', ' ').replace('_', ' '), name)
+
+
+def _text(value: Any) -> str | None:
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        value = str(value)
+    if not isinstance(value, str):
+        return None
+    return value.strip() or None
+
+
+def _delivery(node: dict[str, Any]) -> dict[str, str] | None:
+    """Parser-style result for one node carrying ``trackingNumber``."""
+    tracking_number = _text(node.get('trackingNumber'))
+    if not tracking_number:
+        return None
+    result = {'tracking_number': tracking_number}
+    carrier = _carrier_name(node.get('carrier') or node.get('provider'))
+    if carrier:
+        result['carrier'] = carrier
+    link = _text(node.get('trackingUrl'))
+    if link:
+        result['link'] = link
+    arrival = _text(node.get('expectedArrivalUntil') or node.get('expectedArrivalFrom'))
+    if arrival:
+        result['estimated_delivery'] = arrival
+    return result
+
+
+def _walk(node: Any) -> Iterator[dict[str, Any]]:
+    """Every object carrying a tracking number, at any depth (Order -> orderDelivery)."""
+    if isinstance(node, list):
+        for item in node:
+            yield from _walk(item)
+    elif isinstance(node, dict):
+        if _MARKER in node:
+            yield node
+        for value in node.values():
+            if isinstance(value, (dict, list)):
+                yield from _walk(value)
+
+
+def _json_ld(body: str) -> Iterator[Any]:
+    for block in _JSON_LD_RE.findall(body):
+        if _MARKER not in block:
+            continue
+        try:
+            yield json.loads(block)
+        except ValueError:
+            try:
+                # Some templates HTML-escape the script contents.
+                yield json.loads(unescape(block))
+            except ValueError as err:
+                _LOGGER.debug("Unreadable JSON-LD block: %s", err)
+
+
+class _MicrodataCollector(HTMLParser):
+    """Tokenizer callback turning microdata itemscopes into nested dicts."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.items: list[dict[str, Any]] = []
+        # (tag, item opened here, (item, prop, text chunks) for a text-valued prop)
+        self._open: list[tuple[str, dict | None, tuple[dict, str, list[str]] | None]] = []
+
+    def _scope(self) -> dict[str, Any] | None:
+        for _, item, _ in reversed(self._open):
+            if item is not None:
+                return item
+        return None
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        attr_map = dict(attrs)
+        prop = attr_map.get('itemprop')
+        scope = self._scope()
+        item = None
+        capture = None
+        if 'itemscope' in attr_map:
+            item = {'@type': (attr_map.get('itemtype') or '').rstrip('/').rsplit('/', 1)[-1]}
+            if prop and scope is not None:
+                scope[prop] = item
+            else:
+                self.items.append(item)
+        elif prop and scope is not None:
+            value = next(
+                (attr_map[key] for key in ('content', 'href', 'datetime', 'src') if attr_map.get(key) is not None),
+                None,
+            )
+            if value is not None:
+                scope[prop] = value
+            elif tag not in _VOID_TAGS:
+                capture = (scope, prop, [])
+        if tag not in _VOID_TAGS:
+            self._open.append((tag, item, capture))
+
+    def handle_endtag(self, tag: str) -> None:
+        for index in range(len(self._open) - 1, -1, -1):
+            if self._open[index][0] == tag:
+                break
+        else:
+            return
+        for _, _, capture in self._open[index:]:
+            if capture is not None:
+                scope, prop, chunks = capture
+                scope[prop] = ' '.join(''.join(chunks).split())
+        del self._open[index:]
+
+    def handle_data(self, data: str) -> None:
+        for _, _, capture in self._open:
+            if capture is not None:
+                capture[2].append(data)
+
+
+def _microdata(body: str) -> list[dict[str, Any]]:
+    if 'itemprop' not in body:
+        return []
+    collector = _MicrodataCollector()
+    try:
+        collector.feed(body)
+        collector.close()
+    except Exception as err:  # pylint: disable=broad-except
+        _LOGGER.debug("Microdata tokenizer stopped early: %s", err)
+    return collector.items
+
+
+def declares_deliveries(email: dict[str, Any]) -> bool:
+    """Whether the body may carry markup, checked without decoding it."""
+    body = getattr(email, 'raw_body', None)
+    if body is None:
+        body = email.get(EMAIL_ATTR_BODY) or ''
+    return (_MARKER.encode() if isinstance(body, bytes) else _MARKER) in body
+
+
+def parcel_deliveries(email: dict[str, Any]) -> list[dict[str, str]]:
+    """Tracking results declared as schema.org markup in the email body.
+
+    Each result has ``tracking_number`` and, when declared, ``carrier``,
+    ``link`` and ``estimated_delivery``. Empty when the body has no markup.
+    """
+    body = email.get(EMAIL_ATTR_BODY) or ''
+    if _MARKER not in body:
+        return []
+
+    results: dict[str, dict[str, str]] = {}
+    for read in (_json_ld, _microdata):
+        for source in read(body):
+            for node in _walk(source):
+                delivery = _delivery(node)
+                if delivery and delivery['tracking_number'] not in results:
+                    results[delivery['tracking_number']] = delivery
+        if results:
+            # Senders that use both say the same thing twice.
+            break
+    return list(results.values())
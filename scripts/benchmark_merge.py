@@ -0,0 +1,129 @@
+"""Memory and merge-time benchmark for the package history.
+
+Builds a synthetic history of stored packages (the packages shard as it is
+written to disk), loads it the way the coordinator does, and times a refresh
+that sees every stored number again in mail:
+
+  python3 scripts/benchmark_merge.py                  # 5000 packages
+  python3 scripts/benchmark_merge.py --packages 20000 --iterations 10
+
+Reported: traced memory of the loaded history, and median times to merge one
+result per package, pick the newest ``--limit`` (max_packages), sort every
+package, and turn the sorted list into the sensor's dicts.
+
+Only the integration's parsing modules are imported (not its Home Assistant
+package ``__init__``), so this runs with just ``requirements.txt`` installed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+import types
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = "custom_components.tracking_numbers"
+
+
+def load_integration() -> tuple[Any, Any, Any]:
+    """Import ``parsers_list``, ``merge`` and ``records`` without the package ``__init__``."""
+    for name, path in (
+        ("custom_components", REPO_ROOT / "custom_components"),
+        (PACKAGE, REPO_ROOT / "custom_components" / "tracking_numbers"),
+    ):
+        if name not in sys.modules:
+            module = types.ModuleType(name)
+            module.__path__ = [str(path)]
+            sys.modules[name] = module
+    return (
+        importlib.import_module(f"{PACKAGE}.parsers_list"),
+        importlib.import_module(f"{PACKAGE}.merge"),
+        importlib.import_module(f"{PACKAGE}.records"),
+    )
+
+
+def synthetic_history(parsers_list: Any, count: int) -> tuple[str, list[tuple[str, dict[str, str], str]]]:
+    """The stored packages shard as JSON, and one mail result per package."""
+    senders = [(attr, domain) for attr, domain, _ in parsers_list.parsers if domain][:40]
+    stored = {}
+    results = []
+    for index in range(count):
+        attr, domain = senders[index % len(senders)]
+        number = f"1Z{index:016d}"
+        stored[number] = {
+            "tracking_number": number,
+            "carrier": "UPS",
+            "origin": domain.replace("@", ""),
+            "link": f"https://www.ups.com/track?tracknum={number}",
+            "carrier_confidence": 1.0,
+            "first_seen": f"2026-0{1 + index % 9}-1{index % 10}T10:{index % 60:02d}:00",
+            "last_updated": "2026-10-19T09:00:00",
+            "retailer": parsers_list.retailer_display_name(attr),
+            "retailer_code": domain.replace("@", "").replace(".", "_"),
+            "carrier_code": "ups",
+            "status": "In Transit",
+            "delivery_status": "transit",
+            "status_updated": "2026-10-19T09:00:00",
+        }
+        results.append((attr, {"tracking_number": number, "carrier": "UPS"}, f"2026-10-0{1 + index % 9}T08:00:00+00:00"))
+    return json.dumps(stored), results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--packages", type=int, default=5000, help="stored packages in the history")
+    parser.add_argument("--iterations", type=int, default=5, help="timed refreshes")
+    parser.add_argument("--limit", type=int, default=100, help="max_packages to select")
+    args = parser.parse_args()
+
+    parsers_list, merge, records = load_integration()
+    raw, results = synthetic_history(parsers_list, args.packages)
+
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    known = records.records_from_store(json.loads(raw))
+    history_kib = (tracemalloc.get_traced_memory()[0] - baseline) / 1024
+    tracemalloc.stop()
+
+    merge_times = []
+    select_times = []
+    sort_times = []
+    convert_times = []
+    for _ in range(args.iterations):
+        start = time.perf_counter()
+        merger = merge.PackageMerger(parsers_list.parsers, known, merge.HideMatcher())
+        for attr, result, delivered_at in results:
+            merger.add(attr, result, delivered_at)
+        merge_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        merger.packages(args.limit)
+        select_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        packages = merger.packages()
+        sort_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        [records.as_dict(pkg) for pkg in packages]
+        convert_times.append(time.perf_counter() - start)
+
+    print(f"packages          {args.packages:>10}")
+    print(f"history KiB       {history_kib:>10.0f}")
+    print(f"bytes/package     {history_kib * 1024 / args.packages:>10.0f}")
+    print(f"merge ms          {statistics.median(merge_times) * 1000:>10.1f}")
+    print(f"select top ms     {statistics.median(select_times) * 1000:>10.1f}")
+    print(f"sort all ms       {statistics.median(sort_times) * 1000:>10.1f}")
+    print(f"to dicts ms       {statistics.median(convert_times) * 1000:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,365 @@
+"""Golden-corpus check and throughput benchmark for the email parsers.
+
+The corpus lives in ``scripts/corpus/<parser slug>/<name>.eml``: anonymized
+shipment emails, one directory per parser ATTR. Next to each ``.eml`` sits
+``<name>.json`` with the expected dispatcher output for that email
+(``{ATTR: results}`` for every parser that matched it). A result whose
+tracking number isn't 4-64 letters, digits or hyphens fails the check and
+is never written as expected output, so a wrong extraction can't become the
+golden answer.
+
+  python3 scripts/benchmark_parsers.py --check            # compare against expected outputs
+  python3 scripts/benchmark_parsers.py --update-expected  # rewrite them after an intended change
+  python3 scripts/benchmark_parsers.py                    # benchmark every parser
+  python3 scripts/benchmark_parsers.py --parser amazon --iterations 500
+  python3 scripts/benchmark_parsers.py --save             # store a baseline
+  python3 scripts/benchmark_parsers.py --compare          # diff against the stored baseline
+  python3 scripts/benchmark_parsers.py --differential     # every parser, with and without the pre-pass
+
+Each parser is benchmarked by calling it directly on its own corpus emails
+(subject gates bypassed), and the whole corpus is also pushed through the
+dispatcher the way the coordinator does it. Every call gets a fresh email
+record, so body normalization and the link index are part of the measured
+cost. Reported per parser: emails/sec, p50/p99 latency, and per email the
+peak traced memory and the number of allocations (tracemalloc, measured in a
+separate pass). Allocations are the memory blocks a call allocated that are
+still alive when it returns, its results and the record's cached body and
+link index included; short-lived temporaries aren't counted.
+
+``--differential`` runs every parser on every corpus email (gates bypassed)
+with and without the ingest boilerplate pre-pass, reports any output that
+differs and how much of the corpus the pre-pass removed.
+
+Only the integration's parsing modules are imported (not its Home Assistant
+package ``__init__``), so this runs with just ``requirements.txt`` installed.
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import timezone
+import email
+from email import policy
+from email.utils import getaddresses, parsedate_to_datetime
+import importlib
+import json
+from pathlib import Path
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+import types
+from typing import Any, Callable, Iterator
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+CORPUS_DIR = Path(__file__).resolve().parent / "corpus"
+DEFAULT_BASELINE = REPO_ROOT / ".benchmarks" / "parsers.json"
+PACKAGE = "custom_components.tracking_numbers"
+DISPATCH = "(dispatch)"
+# What a tracking number (or order number) in expected output looks like.
+PLAUSIBLE_NUMBER = re.compile(r"[A-Za-z0-9-]{4,64}")
+
+
+def load_integration() -> tuple[Any, Any]:
+    """Import ``parsers_list`` and ``ingest`` without the package ``__init__``."""
+    for name, path in (
+        ("custom_components", REPO_ROOT / "custom_components"),
+        (PACKAGE, REPO_ROOT / "custom_components" / "tracking_numbers"),
+    ):
+        if name not in sys.modules:
+            module = types.ModuleType(name)
+            module.__path__ = [str(path)]
+            sys.modules[name] = module
+    return (
+        importlib.import_module(f"{PACKAGE}.parsers_list"),
+        importlib.import_module(f"{PACKAGE}.ingest"),
+    )
+
+
+class Fixture:
+    """One corpus email, parsed once into the fields an EmailRecord needs."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.parser = path.parent.name
+        self.expected_path = path.with_suffix(".json")
+
+        message = email.message_from_bytes(path.read_bytes(), policy=policy.default)
+        # mailparser hands the coordinator `from_` as [(name, address)].
+        self.sender = getaddresses([message.get("From", "")])
+        self.subject = str(message.get("Subject", ""))
+        part = message.get_body(preferencelist=("html", "plain"))
+        self.body = part.get_content() if part is not None else ""
+        # Like ingest.record_from_mail, the plain part is kept next to the HTML.
+        plain = message.get_body(preferencelist=("plain",))
+        self.plain = plain.get_content() if plain is not None else None
+        # Kept for platform fingerprinting, as mailparser's `headers` are.
+        self.headers = {name: str(value) for name, value in message.items()}
+        self.date = None
+        if message.get("Date"):
+            self.date = parsedate_to_datetime(message["Date"]).astimezone(timezone.utc).isoformat()
+
+    @property
+    def name(self) -> str:
+        return f"{self.parser}/{self.path.stem}"
+
+    def record(self, ingest: Any, strip: bool = True) -> Any:
+        """A fresh EmailRecord, so no cached body or link index carries over."""
+        return ingest.EmailRecord(
+            self.sender, self.subject, self.body, self.date, strip=strip, plain=self.plain, headers=self.headers
+        )
+
+    def expected(self) -> dict[str, Any] | None:
+        if not self.expected_path.exists():
+            return None
+        return json.loads(self.expected_path.read_text(encoding="utf-8"))
+
+
+def load_corpus(only: set[str] | None = None) -> list[Fixture]:
+    fixtures = [Fixture(path) for path in sorted(CORPUS_DIR.glob("*/*.eml"))]
+    if only:
+        fixtures = [fixture for fixture in fixtures if fixture.parser in only]
+    return fixtures
+
+
+def _plain(value: Any) -> Any:
+    """JSON round-trip so tuples/lists and key order compare like stored files."""
+    return json.loads(json.dumps(value, sort_keys=True))
+
+
+def dispatch_output(dispatcher: Any, ingest: Any, fixture: Fixture) -> dict[str, Any]:
+    return _plain({attr: results for attr, results in dispatcher.dispatch(fixture.record(ingest))})
+
+
+def implausible_numbers(output: dict[str, Any]) -> list[str]:
+    """Tracking numbers in dispatcher `output` that can't be real ones."""
+    bad = []
+    for results in output.values():
+        for result in results:
+            number = result.get("tracking_number") if isinstance(result, dict) else result
+            if number is not None and not PLAUSIBLE_NUMBER.fullmatch(str(number)):
+                bad.append(str(number))
+    return bad
+
+
+def check(fixtures: list[Fixture], dispatcher: Any, ingest: Any, update: bool) -> int:
+    """Compare (or rewrite) expected outputs; return the number of mismatches."""
+    failures = 0
+    for fixture in fixtures:
+        actual = dispatch_output(dispatcher, ingest, fixture)
+        bad = implausible_numbers(actual)
+        if bad:
+            print(f"BADNUM   {fixture.name}: {', '.join(json.dumps(number) for number in bad)}")
+            failures += 1
+            continue
+        if update:
+            fixture.expected_path.write_text(json.dumps(actual, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+            continue
+        expected = fixture.expected()
+        if expected is None:
+            print(f"MISSING  {fixture.name}: no {fixture.expected_path.name} (run --update-expected)")
+            failures += 1
+        elif actual != expected:
+            print(f"FAIL     {fixture.name}")
+            print(f"  expected {json.dumps(expected, sort_keys=True)}")
+            print(f"  actual   {json.dumps(actual, sort_keys=True)}")
+            failures += 1
+    if update:
+        print(f"wrote {len(fixtures) - failures} expected outputs")
+    else:
+        print(f"{len(fixtures) - failures}/{len(fixtures)} corpus emails match their expected output")
+    return failures
+
+
+def _run_parser(parser: Callable[..., Any], record: Any) -> Any:
+    try:
+        results = parser(email=record)
+        if isinstance(results, Iterator):
+            results = list(results)
+        return _plain(results)
+    except Exception as err:  # pylint: disable=broad-except
+        return f"error: {type(err).__name__}"
+
+
+def differential(fixtures: list[Fixture], parsers_list: Any, ingest: Any) -> int:
+    """Run every parser with and without the pre-pass; return the number of differences."""
+    differences = 0
+    before = after = 0
+    for fixture in fixtures:
+        for attr, _, parser in parsers_list.parsers:
+            stripped = fixture.record(ingest)
+            raw = fixture.record(ingest, strip=False)
+            expected, actual = _run_parser(parser, raw), _run_parser(parser, stripped)
+            if expected != actual:
+                print(f"DIFF     {fixture.name} [{attr}]")
+                print(f"  without pre-pass {json.dumps(expected, sort_keys=True)}")
+                print(f"  with pre-pass    {json.dumps(actual, sort_keys=True)}")
+                differences += 1
+        record = fixture.record(ingest)
+        record.get("body")
+        before += record.body_chars
+        after += record.body_chars - record.stripped_chars
+
+    runs = len(fixtures) * len(parsers_list.parsers)
+    print(f"{runs - differences}/{runs} parser runs unchanged by the boilerplate pre-pass")
+    if before:
+        print(f"pre-pass removed {before - after} of {before} body characters ({(before - after) / before:.1%})")
+    return differences
+
+
+def _percentile(samples: list[float], percent: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+# The snapshots' own objects aren't the measured call's allocations.
+_NOT_TRACEMALLOC = (tracemalloc.Filter(False, tracemalloc.__file__),)
+
+
+def _measure(call: Callable[[Any], Any], records: Callable[[], list[Any]], iterations: int) -> dict[str, float]:
+    """Time `call` on fresh records, then trace its peak memory in a second pass."""
+    for record in records():  # warm-up: lazy parser imports, regex caches
+        call(record)
+
+    latencies = []
+    for _ in range(iterations):
+        for record in records():
+            start = time.perf_counter()
+            call(record)
+            latencies.append(time.perf_counter() - start)
+
+    peaks = []
+    allocations = []
+    tracemalloc.start()
+    try:
+        for record in records():
+            before = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            result = call(record)
+            peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+            after = tracemalloc.take_snapshot().filter_traces(_NOT_TRACEMALLOC)
+            allocations.append(
+                sum(
+                    max(0, stat.count_diff)
+                    for stat in after.compare_to(before.filter_traces(_NOT_TRACEMALLOC), "traceback")
+                )
+            )
+            del result, before, after
+    finally:
+        tracemalloc.stop()
+
+    total = sum(latencies)
+    return {
+        "emails": len(latencies),
+        "emails_per_sec": len(latencies) / total if total else 0.0,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "peak_kib": statistics.mean(peaks) / 1024 if peaks else 0.0,
+        "allocs": statistics.mean(allocations) if allocations else 0.0,
+    }
+
+
+def benchmark(fixtures: list[Fixture], parsers_list: Any, ingest: Any, iterations: int) -> dict[str, dict[str, float]]:
+    parser_by_attr = {attr: parser for attr, _, parser in parsers_list.parsers}
+    by_parser: dict[str, list[Fixture]] = {}
+    for fixture in fixtures:
+        by_parser.setdefault(fixture.parser, []).append(fixture)
+
+    results = {}
+    for attr, group in sorted(by_parser.items()):
+        parser = parser_by_attr.get(attr)
+        if parser is None:
+            print(f"skipping {attr}: no registered parser")
+            continue
+        results[attr] = _measure(
+            lambda record, parser=parser: parser(email=record),
+            lambda group=group: [fixture.record(ingest) for fixture in group],
+            iterations,
+        )
+
+    dispatcher = parsers_list.build_dispatcher()
+    results[DISPATCH] = _measure(
+        dispatcher.dispatch,
+        lambda: [fixture.record(ingest) for fixture in fixtures],
+        iterations,
+    )
+    return results
+
+
+def report(results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]] | None, threshold: float) -> int:
+    """Print the table; return how many parsers regressed past `threshold` %."""
+    header = f"{'parser':<20} {'emails':>7} {'emails/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'peak KiB':>9} {'allocs':>8}"
+    if baseline:
+        header += f" {'p50 vs base':>12}"
+    print(header)
+    print("-" * len(header))
+
+    regressions = 0
+    for attr, stats in results.items():
+        line = (
+            f"{attr:<20} {stats['emails']:>7} {stats['emails_per_sec']:>10.0f} "
+            f"{stats['p50_ms']:>8.3f} {stats['p99_ms']:>8.3f} {stats['peak_kib']:>9.1f} "
+            f"{stats.get('allocs', 0.0):>8.0f}"
+        )
+        base = (baseline or {}).get(attr)
+        # Only comparable when the same emails were timed the same number of times.
+        if base and base.get("p50_ms") and base.get("emails") == stats["emails"]:
+            change = (stats["p50_ms"] - base["p50_ms"]) / base["p50_ms"] * 100
+            flag = ""
+            if change > threshold:
+                flag = "  REGRESSION"
+                regressions += 1
+            line += f" {change:>+11.1f}%{flag}"
+        print(line)
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--parser", action="append", help="only this parser ATTR (repeatable)")
+    parser.add_argument("--iterations", type=int, default=50, help="timed passes over each parser's emails")
+    parser.add_argument("--check", action="store_true", help="only compare dispatcher output with the expected JSON")
+    parser.add_argument("--update-expected", action="store_true", help="rewrite the expected JSON from current output")
+    parser.add_argument("--differential", action="store_true",
+                        help="compare every parser's output with and without the boilerplate pre-pass")
+    parser.add_argument("--save", nargs="?", const=DEFAULT_BASELINE, type=Path, metavar="PATH",
+                        help="save results as a baseline (default: %(const)s)")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, type=Path, metavar="PATH",
+                        help="compare against a saved baseline (default: %(const)s)")
+    parser.add_argument("--threshold", type=float, default=25.0,
+                        help="p50 slowdown in %% reported as a regression (default: %(default)s)")
+    args = parser.parse_args()
+
+    parsers_list, ingest = load_integration()
+    fixtures = load_corpus(set(args.parser) if args.parser else None)
+    if not fixtures:
+        print(f"no corpus emails found under {CORPUS_DIR}")
+        return 1
+
+    if args.differential:
+        return 1 if differential(fixtures, parsers_list, ingest) else 0
+
+    failures = check(fixtures, parsers_list.build_dispatcher(), ingest, args.update_expected)
+    if args.check or args.update_expected:
+        return 1 if failures else 0
+
+    results = benchmark(fixtures, parsers_list, ingest, args.iterations)
+    baseline = None
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))["results"]
+    regressions = report(results, baseline, args.threshold)
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"iterations": args.iterations, "python": sys.version.split()[0], "results": results}
+        args.save.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"baseline saved to {args.save}")
+
+    return 1 if failures or regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""Measure how long importing the integration takes.
+
+Runs ``python -X importtime -c "import <module>"`` in fresh interpreters and
+reports the cumulative import time of the module, how many of the
+integration's own modules were imported with it, and whether BeautifulSoup
+came along. Use ``--compare`` to measure a git ref (e.g. the commit before a
+change) side by side with the working tree:
+
+  python3 scripts/measure_import_time.py
+  python3 scripts/measure_import_time.py --compare HEAD~1 --runs 10
+  python3 scripts/measure_import_time.py --module custom_components.tracking_numbers
+
+Run from the repo root in an environment where the integration's
+requirements (and Home Assistant, for the package ``__init__``) are installed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_MODULE = "custom_components.tracking_numbers.parsers_list"
+PACKAGE = "custom_components.tracking_numbers"
+
+
+def _import_profile(root: Path, module: str) -> dict[str, tuple[int, int]]:
+    """Return {module: (self_us, cumulative_us)} for one fresh import."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=root,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"importing {module} from {root} failed:\n{result.stderr[-2000:]}")
+
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+def measure(root: Path, module: str, runs: int) -> dict[str, object]:
+    """Import `module` from `root` `runs` times and summarize."""
+    totals = []
+    profile: dict[str, tuple[int, int]] = {}
+    for _ in range(runs):
+        profile = _import_profile(root, module)
+        totals.append(profile.get(module, (0, 0))[1])
+
+    own = sorted(
+        ((name, times[0]) for name, times in profile.items() if name.startswith(PACKAGE)),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+    return {
+        "median_ms": statistics.median(totals) / 1000,
+        "min_ms": min(totals) / 1000,
+        "modules": len(profile),
+        "own_modules": len(own),
+        "bs4": "bs4" in profile,
+        "slowest": own[:5],
+    }
+
+
+def _checkout(ref: str, target: Path) -> Path:
+    """Extract `custom_components/` at `ref` into `target`."""
+    archive = subprocess.run(
+        ["git", "archive", ref, "custom_components"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        check=True,
+    ).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(target)
+    return target
+
+
+def _report(label: str, stats: dict[str, object]) -> None:
+    print(f"{label}")
+    print(f"  import time    median {stats['median_ms']:.1f} ms, min {stats['min_ms']:.1f} ms")
+    print(f"  modules        {stats['modules']} total, {stats['own_modules']} from the integration")
+    print(f"  BeautifulSoup  {'imported' if stats['bs4'] else 'not imported'}")
+    for name, self_us in stats["slowest"]:
+        print(f"    {self_us / 1000:7.1f} ms  {name}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default=DEFAULT_MODULE, help="module to import (default: %(default)s)")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per measurement")
+    parser.add_argument("--compare", metavar="REF", help="also measure this git ref")
+    args = parser.parse_args()
+
+    if args.compare:
+        with tempfile.TemporaryDirectory() as tmp:
+            before = measure(_checkout(args.compare, Path(tmp)), args.module, args.runs)
+        _report(args.compare, before)
+    after = measure(REPO_ROOT, args.module, args.runs)
+    _report("working tree", after)
+    if args.compare and before["median_ms"]:
+        change = (after["median_ms"] - before["median_ms"]) / before["median_ms"] * 100
+        print(f"change: {change:+.1f}% median import time")
+
+
+if __name__ == "__main__":
+    main()
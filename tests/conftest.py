@@ -0,0 +1,23 @@
+"""Import the integration's modules without Home Assistant.
+
+Like the scripts, the tests register ``custom_components.tracking_numbers``
+as a bare namespace so its submodules import without the package
+``__init__`` (which needs Home Assistant).
+"""
+
+from __future__ import annotations
+
+import sys
+import types
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+for name, path in (
+    ("custom_components", REPO_ROOT / "custom_components"),
+    ("custom_components.tracking_numbers", REPO_ROOT / "custom_components" / "tracking_numbers"),
+):
+    if name not in sys.modules:
+        module = types.ModuleType(name)
+        module.__path__ = [str(path)]
+        sys.modules[name] = module
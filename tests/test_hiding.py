@@ -0,0 +1,40 @@
+"""Tests for the hide rules."""
+
+from __future__ import annotations
+
+from custom_components.tracking_numbers.hiding import HideMatcher
+
+
+def test_single_pattern():
+    matcher = HideMatcher([], [{"pattern": r"^GP-"}])
+    assert matcher.hides_early("GP-1", None)
+    assert not matcher.hides_early("1Z999", None)
+
+
+def test_plain_patterns_are_combined():
+    matcher = HideMatcher([], [{"pattern": r"^GP-"}, {"pattern": r"^D\d+$"}])
+    assert matcher.hides_early("GP-1", None)
+    assert matcher.hides_early("D123", None)
+    assert not matcher.hides_early("1Z999", None)
+
+
+def test_backreference_next_to_grouped_rule():
+    rules = [{"pattern": r"^(GP)-"}, {"pattern": r"(\d)\1{3}"}]
+    matcher = HideMatcher([], rules)
+    assert matcher.hides_early("AB1111", None)
+    assert matcher.hides_early("GP-1", None)
+    assert not matcher.hides_early("AB1211", None)
+    # Same answer as with the backreference rule alone.
+    assert HideMatcher([], rules[1:]).hides_early("AB1111", None)
+
+
+def test_inline_flags_fall_back_to_one_by_one():
+    matcher = HideMatcher([], [{"pattern": r"(?i)^gp-"}, {"pattern": r"(?s)^D\d"}])
+    assert matcher.hides_early("GP-1", None)
+    assert matcher.hides_early("D1", None)
+
+
+def test_invalid_stored_pattern_is_skipped():
+    matcher = HideMatcher([], [{"pattern": "("}, {"pattern": r"^GP-"}])
+    assert matcher.hides_early("GP-1", None)
+    assert not matcher.hides_early("1Z999", None)
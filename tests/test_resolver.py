@@ -0,0 +1,107 @@
+"""Tests for the redirect-wrapper resolver, against a local stub server."""
+
+from __future__ import annotations
+
+import asyncio
+
+import aiohttp
+from aiohttp import web
+
+from custom_components.tracking_numbers.resolver import LinkResolver, is_public_url
+
+
+def _allow_all(url: str) -> bool:
+    return True
+
+
+async def _stub_server() -> tuple[web.AppRunner, str, list[tuple[str, str]]]:
+    """A server on 127.0.0.1 with two redirect chains; returns its requests too."""
+    requests: list[tuple[str, str]] = []
+
+    async def handler(request: web.Request) -> web.Response:
+        requests.append((request.method, request.path))
+        if request.path == "/wrapped":
+            raise web.HTTPMovedPermanently("/hop")
+        if request.path == "/hop":
+            raise web.HTTPFound("/final?tracknum=1Z999AA10123456784")
+        if request.path == "/no-head":
+            if request.method == "HEAD":
+                raise web.HTTPMethodNotAllowed("HEAD", ["GET"])
+            raise web.HTTPFound("/final")
+        return web.Response(text="tracking page")
+
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    port = runner.addresses[0][1]
+    return runner, f"http://127.0.0.1:{port}", requests
+
+
+def _run(scenario):
+    async def main():
+        runner, base, requests = await _stub_server()
+        try:
+            async with aiohttp.ClientSession() as session:
+                return await scenario(session, base, requests)
+        finally:
+            await runner.cleanup()
+
+    return asyncio.run(main())
+
+
+def test_follows_chain_and_caches():
+    async def scenario(session, base, requests):
+        resolver = LinkResolver(session, url_allowed=_allow_all)
+        cache: dict[str, str] = {}
+        url = f"{base}/wrapped"
+        final = f"{base}/final?tracknum=1Z999AA10123456784"
+
+        assert await resolver.resolve([url], cache) == {url: final}
+        assert requests == [
+            ("HEAD", "/wrapped"),
+            ("HEAD", "/hop"),
+            ("HEAD", "/final"),
+        ]
+        assert cache == {url: final}
+
+        # Answered from the cache: no new requests.
+        assert await resolver.resolve([url], cache) == {url: final}
+        assert len(requests) == 3
+
+    _run(scenario)
+
+
+def test_falls_back_to_get_when_head_is_refused():
+    async def scenario(session, base, requests):
+        resolver = LinkResolver(session, url_allowed=_allow_all)
+        url = f"{base}/no-head"
+
+        assert await resolver.resolve([url], {}) == {url: f"{base}/final"}
+        assert requests == [("HEAD", "/no-head"), ("GET", "/no-head"), ("HEAD", "/final")]
+
+    _run(scenario)
+
+
+def test_default_refuses_local_addresses():
+    async def scenario(session, base, requests):
+        resolver = LinkResolver(session)
+        cache: dict[str, str] = {}
+
+        assert await resolver.resolve([f"{base}/wrapped"], cache) == {}
+        assert requests == []
+        assert cache == {}
+
+    _run(scenario)
+
+
+def test_is_public_url():
+    assert is_public_url("https://www.ups.com/track?tracknum=1Z")
+    assert is_public_url("http://8.8.8.8/")
+    assert not is_public_url("http://127.0.0.1:8123/")
+    assert not is_public_url("http://192.168.1.10/")
+    assert not is_public_url("http://[::1]/")
+    assert not is_public_url("http://router.lan/")
+    assert not is_public_url("http://localhost/")
+    assert not is_public_url("ftp://example.com/")